@@ -7,12 +7,21 @@ This service provides:
 2. Event description generation
 3. RSVP message suggestions
 4. Guest segment insights
+
+Every LLM call goes through a managed client layer: per-call deadline,
+bounded concurrency, a retry budget and a circuit breaker that fails fast
+while the provider is degraded. Set AI_PROVIDER=stub to use a deterministic
+local provider (no network, no key) for offline load tests.
 """
 
 import os
-from typing import List, Dict, Optional, Literal
+import time
+import uuid
+from typing import List, Dict, Optional, Literal, Callable, Awaitable, Any
 from datetime import datetime, timedelta
 import asyncio
+import hashlib
+import json
 from dotenv import load_dotenv
 from emergentintegrations.llm.chat import LlmChat, UserMessage
 
@@ -27,17 +36,131 @@ SUPPORTED_LANGUAGES = {
     "ta": "Tamil"
 }
 
+# Managed client layer settings
+AI_PROVIDER = os.getenv("AI_PROVIDER", "emergent")  # emergent, stub
+AI_CALL_TIMEOUT_SECONDS = float(os.getenv("AI_CALL_TIMEOUT_SECONDS", "30"))
+AI_MAX_CONCURRENT_CALLS = int(os.getenv("AI_MAX_CONCURRENT_CALLS", "8"))
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "1"))
+AI_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("AI_CIRCUIT_FAILURE_THRESHOLD", "5"))
+AI_CIRCUIT_RESET_SECONDS = float(os.getenv("AI_CIRCUIT_RESET_SECONDS", "30"))
+AI_STUB_LATENCY_MS = int(os.getenv("AI_STUB_LATENCY_MS", "0"))
+
 # Rate limit tracking (in-memory for MVP, use Redis in production)
 translation_rate_limits = {}  # {ip: [timestamp1, timestamp2, ...]}
 admin_generation_limits = {}  # {admin_id: [timestamp1, timestamp2, ...]}
 
 
+class AIUnavailableError(Exception):
+    """Raised when the LLM provider is failing fast (circuit open)"""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+    
+    closed: calls flow; after failure_threshold consecutive failures -> open
+    open: calls fail immediately until reset_seconds have passed -> half_open
+    half_open: one trial call; success closes the circuit, failure reopens it
+    """
+    
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_progress = False
+        self.rejected_calls = 0
+    
+    def allow_request(self) -> bool:
+        if self.state == "closed":
+            return True
+        
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = "half_open"
+            self.trial_in_progress = False
+        
+        if self.state == "half_open" and not self.trial_in_progress:
+            self.trial_in_progress = True
+            return True
+        
+        self.rejected_calls += 1
+        return False
+    
+    def record_success(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.trial_in_progress = False
+    
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.trial_in_progress = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+    
+    def release_trial(self):
+        """An allowed call ended without an outcome (cancelled, no slot): let another trial run"""
+        self.trial_in_progress = False
+
+
+class StubLlmChat:
+    """
+    Deterministic local stand-in for LlmChat
+    
+    Responses depend only on the prompt, so load tests are repeatable and
+    the response shapes match what AIService parses (plain text, one
+    suggestion per line, JSON arrays for batch translation).
+    """
+    
+    def __init__(self, api_key: Optional[str], session_id: str, system_message: str):
+        self.session_id = session_id
+        self.system_message = system_message
+    
+    def with_model(self, provider: str, model: str):
+        return self
+    
+    async def send_message(self, message: UserMessage) -> str:
+        if AI_STUB_LATENCY_MS:
+            await asyncio.sleep(AI_STUB_LATENCY_MS / 1000)
+        
+        text = message.text
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:8]
+        
+        if self.system_message.startswith("You are a professional translator"):
+            header, content = text.split(":\n\n", 1)
+            language = header.rsplit(" to ", 1)[1]
+            if "JSON array" in self.system_message:
+                segments = json.loads(content)
+                return json.dumps([f"[{language}] {segment}" for segment in segments], ensure_ascii=False)
+            return f"[{language}] {content}"
+        
+        if "RSVP messages" in self.system_message:
+            templates = [
+                "Can't wait to celebrate with you! 🎉",
+                "Blessings to the beautiful couple ❤️",
+                "Honoured to be part of your special day 💐"
+            ]
+            count = int(text.split()[1]) if text.split()[1].isdigit() else 3
+            return "\n".join(
+                f"{templates[i % len(templates)]} ({digest}-{i})" if i >= len(templates) else templates[i]
+                for i in range(count)
+            )
+        
+        if "data analyst" in self.system_message:
+            return f"RSVP responses are coming in steadily. ({digest})"
+        
+        return f"Join us as we celebrate this joyous occasion with family and friends. ({digest})"
+
+
 class AIService:
     """Abstracted AI service using Emergent LLM Universal Key"""
     
     def __init__(self):
         self.api_key = os.getenv("EMERGENT_LLM_KEY")
-        self.enabled = bool(self.api_key)
+        self.use_stub = AI_PROVIDER == "stub"
+        self.enabled = bool(self.api_key) or self.use_stub
         
         if not self.enabled:
             print("⚠️  EMERGENT_LLM_KEY not found. AI features will be disabled.")
@@ -45,10 +168,57 @@ class AIService:
         # Default to GPT-5.1 (recommended by playbook)
         self.provider = "openai"
         self.model = "gpt-5.1"
+        
+        # Single-flight: identical concurrent requests share one LLM call
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.coalesced_requests = 0
+        
+        # Managed client layer
+        self.call_timeout = AI_CALL_TIMEOUT_SECONDS
+        self.max_retries = AI_MAX_RETRIES
+        self._call_slots = asyncio.Semaphore(AI_MAX_CONCURRENT_CALLS)
+        self.circuit_breaker = CircuitBreaker(AI_CIRCUIT_FAILURE_THRESHOLD, AI_CIRCUIT_RESET_SECONDS)
+        self._call_metrics = {
+            'calls': 0,
+            'failures': 0,
+            'timeouts': 0,
+            'slot_timeouts': 0,
+            'retries': 0
+        }
+    
+    @staticmethod
+    def _request_key(operation: str, *parts: Optional[str]) -> str:
+        """Build a coalescing key from the inputs that shape the prompt"""
+        raw = "\x1f".join(part or "" for part in parts)
+        return f"{operation}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+    
+    async def _coalesce(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run call() once for all concurrent callers with the same key
+        
+        Later callers await the in-flight task instead of issuing a duplicate
+        LLM request. The task is shielded so one caller disconnecting does not
+        cancel the shared call for everyone else.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            
+            def _forget(finished: asyncio.Task):
+                if self._in_flight.get(key) is finished:
+                    del self._in_flight[key]
+            
+            task.add_done_callback(_forget)
+        else:
+            self.coalesced_requests += 1
+        
+        return await asyncio.shield(task)
     
     def _create_chat_session(self, system_message: str, session_id: str) -> LlmChat:
-        """Create a new LLM chat session"""
-        chat = LlmChat(
+        """Create a new LLM chat session (stub session when AI_PROVIDER=stub)"""
+        chat_class = StubLlmChat if self.use_stub else LlmChat
+        chat = chat_class(
             api_key=self.api_key,
             session_id=session_id,
             system_message=system_message
@@ -56,6 +226,79 @@ class AIService:
         chat.with_model(self.provider, self.model)
         return chat
     
+    async def _send_message(self, system_message: str, session_prefix: str, text: str) -> str:
+        """
+        Send one prompt through the managed client layer
+        
+        Each attempt runs in its own short-lived session (sessions carry
+        conversation history, so they are not reused) and is bounded by the
+        per-call deadline, which covers waiting for one of the concurrency
+        slots as well as the call itself. Failed attempts are retried within
+        the retry budget; when the circuit is open this raises
+        AIUnavailableError immediately so callers fall back without waiting
+        on a degraded provider.
+        """
+        for attempt in range(self.max_retries + 1):
+            if not self.circuit_breaker.allow_request():
+                raise AIUnavailableError("AI provider temporarily unavailable")
+            
+            if attempt:
+                self._call_metrics['retries'] += 1
+            
+            chat = self._create_chat_session(system_message, f"{session_prefix}_{uuid.uuid4().hex}")
+            slot_acquired = False
+            
+            async def call():
+                nonlocal slot_acquired
+                async with self._call_slots:
+                    slot_acquired = True
+                    self._call_metrics['calls'] += 1
+                    return await chat.send_message(UserMessage(text=text))
+            
+            outcome_recorded = False
+            try:
+                response = await asyncio.wait_for(call(), timeout=self.call_timeout)
+            except asyncio.TimeoutError:
+                if not slot_acquired:
+                    # Local congestion, not a provider failure: no breaker update
+                    self._call_metrics['slot_timeouts'] += 1
+                    raise AIUnavailableError(f"No AI call slot free within {self.call_timeout}s")
+                self._call_metrics['timeouts'] += 1
+                self._call_metrics['failures'] += 1
+                self.circuit_breaker.record_failure()
+                outcome_recorded = True
+                error = AIUnavailableError(f"AI call timed out after {self.call_timeout}s")
+            except Exception as e:
+                self._call_metrics['failures'] += 1
+                self.circuit_breaker.record_failure()
+                outcome_recorded = True
+                error = e
+            else:
+                self.circuit_breaker.record_success()
+                outcome_recorded = True
+                return response
+            finally:
+                # Cancellation (BaseException) or a slot timeout must not leave
+                # a half-open trial marked as running forever
+                if not outcome_recorded:
+                    self.circuit_breaker.release_trial()
+        
+        raise error
+    
+    def stats(self) -> Dict[str, Any]:
+        """Client layer metrics for monitoring"""
+        return {
+            'provider': "stub" if self.use_stub else self.provider,
+            'model': self.model,
+            'enabled': self.enabled,
+            'circuit_state': self.circuit_breaker.state,
+            'consecutive_failures': self.circuit_breaker.consecutive_failures,
+            'rejected_calls': self.circuit_breaker.rejected_calls,
+            'coalesced_requests': self.coalesced_requests,
+            'in_flight': len(self._in_flight),
+            **self._call_metrics
+        }
+    
     async def translate_content(
         self, 
         content: str, 
@@ -65,6 +308,8 @@ class AIService:
         """
         Translate content to target language
         
+        Concurrent identical requests are coalesced into one LLM call.
+        
         Args:
             content: Text to translate
             target_language: Target language code (en, te, hi, ta)
@@ -72,9 +317,14 @@ class AIService:
         
         Returns:
             Translated text
+        
+        Raises:
+            AIUnavailableError: AI is disabled or the translation failed (the
+                source text is never returned as a translation, so callers
+                can't cache it as one)
         """
         if not self.enabled:
-            return content  # Return original content if AI is disabled
+            raise AIUnavailableError("AI is not configured")
         
         if target_language not in SUPPORTED_LANGUAGES:
             raise ValueError(f"Unsupported language: {target_language}")
@@ -83,6 +333,14 @@ class AIService:
         if target_language == "en":
             return content
         
+        key = self._request_key("translate", content, target_language, context)
+        return await self._coalesce(
+            key,
+            lambda: self._translate_content(content, target_language, context)
+        )
+    
+    async def _translate_content(self, content: str, target_language: str, context: str) -> str:
+        """Issue the translation LLM call"""
         language_name = SUPPORTED_LANGUAGES[target_language]
         
         system_message = f"""You are a professional translator specializing in Indian wedding invitations.
@@ -93,20 +351,94 @@ Translate the given text to {language_name} while:
 - Keeping names, dates, and places in original language when culturally appropriate
 - Only return the translated text, no explanations"""
         
-        session_id = f"translation_{target_language}_{datetime.now().timestamp()}"
-        chat = self._create_chat_session(system_message, session_id)
+        try:
+            response = await self._send_message(
+                system_message,
+                f"translation_{target_language}",
+                f"Translate this {context} text to {language_name}:\n\n{content}"
+            )
+        except AIUnavailableError:
+            raise
+        except Exception as e:
+            raise AIUnavailableError(f"Translation failed: {e}") from e
         
-        user_message = UserMessage(
-            text=f"Translate this {context} text to {language_name}:\n\n{content}"
-        )
+        translated = response.strip()
+        if not translated:
+            raise AIUnavailableError("Empty translation response")
+        return translated
+    
+    async def translate_batch(
+        self,
+        segments: List[str],
+        target_language: str,
+        context: str = "wedding invitation"
+    ) -> List[str]:
+        """
+        Translate several segments with a single LLM call
+        
+        Segments are sent and returned as a JSON array so they can be split
+        reliably. If the response cannot be parsed into the same number of
+        segments, each one is translated individually instead.
+        
+        Args:
+            segments: Texts to translate
+            target_language: Target language code (en, te, hi, ta)
+            context: Context for better translation (default: wedding invitation)
+        
+        Returns:
+            Translated texts, in the same order as segments. Segments that
+            could not be translated come back unchanged, so callers must not
+            cache results equal to their source.
+        """
+        if not segments:
+            return []
+        
+        if not self.enabled or target_language == "en":
+            return list(segments)
+        
+        if target_language not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"Unsupported language: {target_language}")
+        
+        if len(segments) == 1:
+            return await self._translate_each(segments, target_language, context)
+        
+        language_name = SUPPORTED_LANGUAGES[target_language]
+        
+        system_message = f"""You are a professional translator specializing in Indian wedding invitations.
+Translate every text in the given JSON array to {language_name} while:
+- Maintaining cultural sensitivity and respect
+- Preserving formatting (line breaks, punctuation, HTML tags)
+- Using appropriate formal language for weddings
+- Keeping names, dates, and places in original language when culturally appropriate
+Return ONLY a JSON array of translated strings with exactly the same number of items, in the same order."""
         
         try:
-            response = await chat.send_message(user_message)
-            return response.strip()
+            response = await self._send_message(
+                system_message,
+                f"translation_batch_{target_language}",
+                f"Translate these {len(segments)} {context} texts to {language_name}:\n\n"
+                f"{json.dumps(segments, ensure_ascii=False)}"
+            )
+            translations = _parse_json_array(response)
+            if len(translations) == len(segments) and all(isinstance(t, str) for t in translations):
+                return [t.strip() for t in translations]
+            print(f"Batch translation returned {len(translations)} items for {len(segments)} segments")
         except Exception as e:
-            # Fallback: return original content if translation fails
-            print(f"Translation error: {e}")
-            return content
+            print(f"Batch translation error: {e}")
+        
+        # Fallback: translate one by one
+        return await self._translate_each(segments, target_language, context)
+    
+    async def _translate_each(self, segments: List[str], target_language: str, context: str) -> List[str]:
+        """Translate segments individually; a failed segment comes back as its source"""
+        results = await asyncio.gather(*[
+            self.translate_content(segment, target_language, context)
+            for segment in segments
+        ], return_exceptions=True)
+        return [
+            segment if isinstance(result, Exception) else result
+            for segment, result in zip(segments, results)
+        ]
     
     async def generate_event_description(
         self,
@@ -124,6 +456,8 @@ Translate the given text to {language_name} while:
             date: Event date (optional)
             venue: Event venue (optional)
         
+        Concurrent identical requests are coalesced into one LLM call.
+        
         Returns:
             AI-generated event description
         """
@@ -131,6 +465,20 @@ Translate the given text to {language_name} while:
             # Return a default description if AI is disabled
             return f"Join us for a beautiful {event_type} celebration."
         
+        key = self._request_key("description", event_type, couple_names, date, venue)
+        return await self._coalesce(
+            key,
+            lambda: self._generate_event_description(event_type, couple_names, date, venue)
+        )
+    
+    async def _generate_event_description(
+        self,
+        event_type: str,
+        couple_names: Optional[str],
+        date: Optional[str],
+        venue: Optional[str]
+    ) -> str:
+        """Issue the event description LLM call"""
         system_message = """You are a creative wedding invitation content writer.
 Generate elegant, short, and heartfelt event descriptions for Indian weddings.
 Keep descriptions:
@@ -158,77 +506,76 @@ Only return the description text, no explanations."""
 
 Create a 2-3 sentence description that captures the essence and joy of this special occasion."""
         
-        session_id = f"description_{event_type}_{datetime.now().timestamp()}"
-        chat = self._create_chat_session(system_message, session_id)
-        
-        user_message = UserMessage(text=prompt)
-        
         try:
-            response = await chat.send_message(user_message)
+            response = await self._send_message(system_message, f"description_{event_type}", prompt)
             return response.strip()
         except Exception as e:
             # Fallback description
             print(f"Description generation error: {e}")
             return f"Join us to celebrate this beautiful {event_type} ceremony."
     
-    async def generate_rsvp_suggestions(
+    async def generate_rsvp_suggestion_pool(
         self,
-        event_type: str = "marriage",
-        guest_name: Optional[str] = None
+        event_type: str,
+        language: str = "en",
+        count: int = 20
     ) -> List[str]:
         """
-        Generate 3 RSVP message suggestions
+        Generate a pool of RSVP message suggestions in one LLM call
+        
+        Used by the background suggestion pool refresher, so errors are
+        raised rather than replaced with fallback messages. A scheduled and
+        an on-demand refresh of the same pool share one LLM call.
         
         Args:
             event_type: Type of event
-            guest_name: Name of guest (optional, for personalization)
+            language: Language code (en, te, hi, ta)
+            count: Number of suggestions to request
         
         Returns:
-            List of 3 suggested messages
+            Up to count distinct suggestions
         """
-        system_message = """You are an expert at generating warm, appropriate RSVP messages for Indian weddings.
-Generate exactly 3 short, heartfelt messages that guests can use when RSVPing.
+        if not self.enabled:
+            return []
+        
+        if language not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"Unsupported language: {language}")
+        
+        key = self._request_key("rsvp_pool", event_type, language, str(count))
+        suggestions = await self._coalesce(
+            key,
+            lambda: self._generate_rsvp_suggestion_pool(event_type, language, count)
+        )
+        # Each caller gets its own list
+        return list(suggestions)
+    
+    async def _generate_rsvp_suggestion_pool(self, event_type: str, language: str, count: int) -> List[str]:
+        """Issue the RSVP suggestion pool LLM call"""
+        language_name = SUPPORTED_LANGUAGES[language]
+        
+        system_message = f"""You are an expert at generating warm, appropriate RSVP messages for Indian weddings.
+Generate short, heartfelt messages in {language_name} that guests can use when RSVPing.
 Each message should be:
 - Maximum 15 words
 - Culturally appropriate
 - Include relevant emojis
 - Warm and genuine
-- Different in tone (excited, blessing, formal)
+- Varied in tone (excited, blessing, formal)
 
-Return ONLY the 3 messages, one per line, no numbering or extra text."""
+Return ONLY the messages, one per line, no numbering or extra text."""
         
-        prompt = f"""Generate 3 RSVP message suggestions for a {event_type} event.
+        prompt = f"""Generate {count} RSVP message suggestions in {language_name} for a {event_type} event.
 Each message should be unique in tone and sentiment.
 Include appropriate emojis."""
         
-        session_id = f"rsvp_{event_type}_{datetime.now().timestamp()}"
-        chat = self._create_chat_session(system_message, session_id)
-        
-        user_message = UserMessage(text=prompt)
+        response = await self._send_message(system_message, f"rsvp_pool_{event_type}_{language}", prompt)
         
-        try:
-            response = await chat.send_message(user_message)
-            suggestions = [line.strip() for line in response.split('\n') if line.strip()]
-            
-            # Ensure we have exactly 3 suggestions
-            if len(suggestions) < 3:
-                # Add fallback messages
-                fallback_messages = [
-                    "Can't wait to celebrate with you! 🎉",
-                    "Blessings to the beautiful couple ❤️",
-                    "Excited for your special day! 💐"
-                ]
-                suggestions.extend(fallback_messages[len(suggestions):3])
-            
-            return suggestions[:3]
-        except Exception as e:
-            # Fallback suggestions
-            print(f"RSVP suggestions error: {e}")
-            return [
-                "Can't wait to celebrate with you! 🎉",
-                "Blessings to the beautiful couple ❤️",
-                "Excited for your special day! 💐"
-            ]
+        suggestions = []
+        for line in response.split('\n'):
+            line = line.strip().lstrip('-•*').strip()
+            if line and line not in suggestions:
+                suggestions.append(line)
+        return suggestions[:count]
     
     async def generate_guest_insights(
         self,
@@ -251,6 +598,10 @@ Include appropriate emojis."""
         
         Returns:
             AI-generated insights text
+        
+        Raises:
+            Exception: The AI call failed (callers supply their own fallback,
+                which must not be cached as generated insights)
         """
         system_message = """You are a data analyst for wedding planning.
 Generate brief, actionable insights from RSVP data.
@@ -273,19 +624,31 @@ RSVPs with messages: {rsvp_data.get('with_messages', 0)}
 
 Generate a 2-3 sentence insight highlighting key patterns or trends."""
         
-        session_id = f"insights_{datetime.now().timestamp()}"
-        chat = self._create_chat_session(system_message, session_id)
-        
-        user_message = UserMessage(text=prompt)
+        if not self.enabled:
+            raise AIUnavailableError("AI is not configured")
         
-        try:
-            response = await chat.send_message(user_message)
-            return response.strip()
-        except Exception as e:
-            # Fallback insight
-            print(f"Insights generation error: {e}")
-            confirmed_rate = (rsvp_data.get('confirmed', 0) / max(rsvp_data.get('total', 1), 1)) * 100
-            return f"You have received {rsvp_data.get('total', 0)} RSVPs so far, with {confirmed_rate:.0f}% confirming attendance."
+        response = await self._send_message(system_message, "insights", prompt)
+        insights = response.strip()
+        if not insights:
+            raise AIUnavailableError("Empty insights response")
+        return insights
+
+
+def _parse_json_array(text: str) -> list:
+    """Parse a JSON array from an LLM response, tolerating code fences"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.lower().startswith("json"):
+            text = text[4:]
+    start = text.find("[")
+    end = text.rfind("]")
+    if start == -1 or end == -1:
+        raise ValueError("No JSON array in response")
+    parsed = json.loads(text[start:end + 1])
+    if not isinstance(parsed, list):
+        raise ValueError("Response is not a JSON array")
+    return parsed
 
 
 # Rate limiting functions
@@ -0,0 +1,272 @@
+"""
+Audit Log Pipeline
+Asynchronous, batched audit logging with TTL-based retention
+
+Request handlers enqueue audit documents without waiting for MongoDB. A
+background writer flushes the queue with insert_many every second, or as
+soon as a full batch is waiting. Retention is a TTL index on logged_at
+(a BSON date stamped at enqueue time), so MongoDB expires old entries
+itself and no trimming query runs per action.
+
+On shutdown the writer drains everything still queued before the MongoDB
+client is closed. If the queue fills up (database unreachable for a long
+time), new entries are dropped and counted rather than blocking requests.
+
+Entries are normalized on enqueue (string id, ISO timestamp, profile_id
+lifted out of details) so AuditLogQuery can filter and keyset-paginate
+on (timestamp, id) with compound indexes.
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from moderation_service import decode_cursor, encode_cursor
+
+
+AUDIT_LOG_RETENTION_DAYS = int(os.environ.get('AUDIT_LOG_RETENTION_DAYS', '90'))
+AUDIT_LOG_QUEUE_SIZE = 10000
+AUDIT_LOG_BATCH_SIZE = 200
+AUDIT_LOG_FLUSH_SECONDS = 1.0
+# Upper bound on how long shutdown waits for the queue to drain
+AUDIT_LOG_DRAIN_TIMEOUT_SECONDS = 10
+
+AUDIT_LOG_PAGE_SIZE = 100
+MAX_AUDIT_LOG_PAGE_SIZE = 1000
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Naive datetimes are taken as UTC"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def normalize_audit_doc(doc: dict) -> dict:
+    """Give an audit document the fields the query API filters and sorts on"""
+    now = datetime.now(timezone.utc)
+    if not doc.get('id'):
+        doc['id'] = doc.get('log_id') or str(uuid.uuid4())
+
+    timestamp = doc.get('timestamp')
+    if isinstance(timestamp, datetime):
+        doc['timestamp'] = _as_utc(timestamp).isoformat()
+    elif not timestamp:
+        doc['timestamp'] = now.isoformat()
+
+    details = doc.get('details')
+    if not doc.get('profile_id') and isinstance(details, dict) and details.get('profile_id'):
+        doc['profile_id'] = details['profile_id']
+
+    doc.setdefault('logged_at', now)
+    return doc
+
+
+class AuditLogPipeline:
+    """In-process queue of audit documents written in batches by one task"""
+
+    def __init__(self, db):
+        self.collection = db['audit_logs']
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=AUDIT_LOG_QUEUE_SIZE)
+        self._wakeup = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self._closed = False
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    async def ensure_indexes(self):
+        await self.collection.create_index(
+            "logged_at",
+            expireAfterSeconds=AUDIT_LOG_RETENTION_DAYS * 86400,
+            name="logged_at_ttl"
+        )
+        await self.collection.create_index(
+            [("timestamp", -1), ("id", -1)],
+            name="timestamp_id"
+        )
+        for field in ("admin_id", "profile_id", "action"):
+            await self.collection.create_index(
+                [(field, 1), ("timestamp", -1), ("id", -1)],
+                name=f"{field}_timestamp_id"
+            )
+
+    async def migrate_legacy_entries(self):
+        """
+        Bring entries written before normalization in line with new ones
+
+        Each step only matches documents still missing the normalized form,
+        so later runs are cheap no-ops.
+        """
+        # datetime timestamps -> the ISO format of every other entry
+        await self.collection.update_many(
+            {"timestamp": {"$type": "date"}},
+            [{"$set": {"timestamp": {"$dateToString": {
+                "format": "%Y-%m-%dT%H:%M:%S.%L000+00:00",
+                "date": "$timestamp"
+            }}}}]
+        )
+        await self.collection.update_many(
+            {"id": {"$exists": False}},
+            [{"$set": {"id": {"$ifNull": ["$log_id", {"$toString": "$_id"}]}}}]
+        )
+        await self.collection.update_many(
+            {"profile_id": {"$in": [None]}, "details.profile_id": {"$type": "string"}},
+            [{"$set": {"profile_id": "$details.profile_id"}}]
+        )
+        # Expire old entries relative to when they were written, not to now
+        await self.collection.update_many(
+            {"logged_at": {"$exists": False}},
+            [{"$set": {"logged_at": {"$convert": {
+                "input": "$timestamp",
+                "to": "date",
+                "onError": "$$NOW",
+                "onNull": "$$NOW"
+            }}}}]
+        )
+
+    def enqueue(self, doc: dict):
+        """Queue an audit document for writing (never blocks, never raises)"""
+        if self._closed:
+            self.dropped += 1
+            logging.warning(f"Audit log dropped after shutdown: {doc.get('action')}")
+            return
+
+        normalize_audit_doc(doc)
+        try:
+            self._queue.put_nowait(doc)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logging.error(f"Audit log queue full, dropped: {doc.get('action')}")
+            return
+
+        if self._queue.qsize() >= AUDIT_LOG_BATCH_SIZE:
+            self._wakeup.set()
+
+    def _take_batch(self) -> List[dict]:
+        batch = []
+        while len(batch) < AUDIT_LOG_BATCH_SIZE and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _flush(self):
+        """Write everything currently queued, one insert_many per batch"""
+        while not self._queue.empty():
+            batch = self._take_batch()
+            try:
+                await self.collection.insert_many(batch, ordered=False)
+                self.written += len(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logging.error(f"Failed to write {len(batch)} audit logs: {e}")
+
+    async def _run(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=AUDIT_LOG_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._flush()
+        await self._flush()
+
+    async def _migrate(self):
+        try:
+            await self.migrate_legacy_entries()
+        except Exception as e:
+            logging.error(f"Audit log migration failed: {e}")
+
+    def start(self):
+        """Start the background writer (and the legacy entry migration)"""
+        if self._writer is None:
+            self._closed = False
+            self._writer = asyncio.ensure_future(self._run())
+            asyncio.ensure_future(self._migrate())
+
+    async def stop(self):
+        """Stop accepting entries and drain the queue"""
+        self._closed = True
+        self._wakeup.set()
+        if self._writer is None:
+            await self._flush()
+            return
+
+        try:
+            await asyncio.wait_for(self._writer, timeout=AUDIT_LOG_DRAIN_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logging.error(f"Audit log drain timed out with {self._queue.qsize()} entries queued")
+        finally:
+            self._writer = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "retention_days": AUDIT_LOG_RETENTION_DAYS
+        }
+
+
+class AuditLogQuery:
+    """Filtered, keyset-paginated reads of audit_logs, newest first"""
+
+    def __init__(self, db):
+        self.collection = db['audit_logs']
+
+    async def find_page(
+        self,
+        admin_id: Optional[str] = None,
+        profile_id: Optional[str] = None,
+        action: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = AUDIT_LOG_PAGE_SIZE
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        One page of audit logs matching every given filter
+
+        Returns:
+            (logs, next_cursor) - next_cursor is None on the last page
+        Raises:
+            ValueError: Malformed cursor
+        """
+        limit = max(1, min(limit, MAX_AUDIT_LOG_PAGE_SIZE))
+        query: Dict = {}
+        if admin_id:
+            query["admin_id"] = admin_id
+        if profile_id:
+            query["profile_id"] = profile_id
+        if action:
+            query["action"] = action
+
+        # timestamp is a UTC ISO string, which sorts chronologically
+        timestamp_range = {}
+        if date_from:
+            timestamp_range["$gte"] = _as_utc(date_from).isoformat()
+        if date_to:
+            timestamp_range["$lte"] = _as_utc(date_to).isoformat()
+        if timestamp_range:
+            query["timestamp"] = timestamp_range
+
+        if cursor:
+            timestamp, log_id = decode_cursor(cursor)
+            query["$or"] = [
+                {"timestamp": {"$lt": timestamp}},
+                {"timestamp": timestamp, "id": {"$lt": log_id}}
+            ]
+
+        logs = await self.collection.find(
+            query,
+            {"_id": 0, "logged_at": 0}
+        ).sort([("timestamp", -1), ("id", -1)]).limit(limit + 1).to_list(limit + 1)
+
+        next_cursor = None
+        if len(logs) > limit:
+            logs = logs[:limit]
+            next_cursor = encode_cursor(logs[-1], sort_field='timestamp')
+        return logs, next_cursor
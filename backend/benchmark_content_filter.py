@@ -0,0 +1,108 @@
+"""
+Content Filter Benchmark
+Measures profanity checks and HTML stripping per second, comparing the
+Aho-Corasick content filter with the old substring loop and per-call
+bleach.clean. Word-boundary cases are checked first; a wrong result
+exits with status 1.
+
+Usage:
+    python benchmark_content_filter.py [iterations]
+"""
+
+import sys
+import time
+
+import bleach
+
+from content_filter import PROFANITY_TERMS, content_filter
+
+
+SAMPLE_MESSAGES = [
+    "Wishing you both a lifetime of love, laughter and happiness!",
+    "Hello from the Sharma family, congratulations and many blessings 🙏",
+    "Bahut bahut badhai ho! Shaadi mubarak, hamesha khush raho.",
+    "Meeru iddaru kalakalam santhoshanga undali, subhakankshalu!",
+    "Iniya thirumana vazhthukkal, neengal iruvarum needoodi vaazhga!",
+    "Shell out the <b>dance</b> moves at the sangeet, see you there & cheers",
+    "What the h3ll, I can't believe you're finally getting married!!",
+    "Classic couple, pass the sweets and let's assemble for the baraat"
+] * 4
+
+# (message, should be flagged)
+BOUNDARY_CASES = [
+    ("Hello and welcome", False),
+    ("What the hell", True),
+    ("What the h3ll!", True),
+    ("Flying in from Assam", False),
+    ("Classic couple", False),
+    ("Fucking awesome party", True),
+    ("Othappam for breakfast", False),
+    ("otha", True),
+    ("Greetings from Chodavaram", False),
+    ("chod!", True),
+    ("Pundarikaksha bless you", False),
+    ("punda", True),
+    ("A laudable match", False),
+    ("Visiting the pukur at dawn", False),
+    ("Gaandeevam recital at the sangeet", False),
+    ("Lanjakodaka", True),
+    ("madarchod", True),
+    ("thevidiyaa", True),
+    ("d\u200bamn", True),
+]
+
+OLD_PROFANITY_WORDS = [term.rstrip('*') for term in PROFANITY_TERMS]
+
+
+def old_contains_profanity(text: str) -> bool:
+    """The previous substring loop (flags 'hello' for 'hell')"""
+    text_lower = text.lower()
+    for word in OLD_PROFANITY_WORDS:
+        if word in text_lower:
+            return True
+    return False
+
+
+def check_boundary_cases() -> int:
+    """Print every boundary case the filter gets wrong; returns how many"""
+    failures = 0
+    for message, expected in BOUNDARY_CASES:
+        if content_filter.contains_profanity(message) != expected:
+            failures += 1
+            print(f"FAIL: {message!r} should {'' if expected else 'not '}be flagged")
+    return failures
+
+
+def rate(function, iterations: int) -> float:
+    """Messages processed per second"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for message in SAMPLE_MESSAGES:
+            function(message)
+    elapsed = time.perf_counter() - start
+    return iterations * len(SAMPLE_MESSAGES) / elapsed
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    failures = check_boundary_cases()
+    print(f"Boundary cases: {len(BOUNDARY_CASES) - failures}/{len(BOUNDARY_CASES)} passed")
+    if failures:
+        sys.exit(1)
+
+    old_flagged = sum(old_contains_profanity(m) for m in SAMPLE_MESSAGES)
+    new_flagged = sum(content_filter.contains_profanity(m) for m in SAMPLE_MESSAGES)
+
+    substring_rate = rate(old_contains_profanity, iterations)
+    automaton_rate = rate(content_filter.contains_profanity, iterations)
+    bleach_rate = rate(lambda m: bleach.clean(m, tags=[], strip=True), iterations // 10 or 1)
+    cleaner_rate = rate(content_filter.clean_text, iterations // 10 or 1)
+
+    print(f"Messages: {len(SAMPLE_MESSAGES)}, terms: {len(PROFANITY_TERMS)}")
+    print(f"Flagged (substring loop): {old_flagged}, flagged (content filter): {new_flagged}")
+    print(f"Substring loop:         {substring_rate:10.0f} checks/sec")
+    print(f"Aho-Corasick filter:    {automaton_rate:10.0f} checks/sec")
+    print(f"bleach.clean per call:  {bleach_rate:10.0f} cleans/sec")
+    print(f"Shared Cleaner:         {cleaner_rate:10.0f} cleans/sec")
+    print(f"Sanitize speedup: {cleaner_rate / bleach_rate:.2f}x")
@@ -0,0 +1,71 @@
+"""
+PDF Render Benchmark
+Measures invitation PDF renders per second per core, with and without
+the shared render context registry.
+
+Usage:
+    python benchmark_pdf_render.py [renders_per_language]
+"""
+
+import sys
+import time
+
+from pdf_service import (
+    LANGUAGE_TEMPLATES,
+    render_invitation_pdf,
+    warm_render_contexts,
+    clear_render_contexts
+)
+
+
+SAMPLE_PROFILE = {
+    'id': 'benchmark',
+    'slug': 'ravi-sita-bench1',
+    'groom_name': 'Ravi Kumar',
+    'bride_name': 'Sita Lakshmi',
+    'design_id': 'temple_divine',
+    'deity_id': 'ganesha',
+    'whatsapp_groom': '+919876543210',
+    'whatsapp_bride': '+919876543211',
+    'events': [
+        {
+            'name': name,
+            'date': f'2026-12-0{day}',
+            'start_time': '10:00',
+            'end_time': '13:00',
+            'venue_name': 'Sri Venkateswara Kalyana Mandapam',
+            'venue_address': 'Road No. 12, Banjara Hills, Hyderabad',
+            'description': 'Join us with your family for blessings and celebrations.',
+            'visible': True
+        }
+        for day, name in enumerate(['Haldi', 'Mehendi', 'Sangeet', 'Wedding', 'Reception'], start=1)
+    ]
+}
+
+
+def run(renders_per_language: int, cold: bool) -> float:
+    """Render every language N times on this core and return renders per second"""
+    total = 0
+    start = time.perf_counter()
+    for _ in range(renders_per_language):
+        for language in LANGUAGE_TEMPLATES:
+            if cold:
+                clear_render_contexts()
+            render_invitation_pdf(SAMPLE_PROFILE, language)
+            total += 1
+    elapsed = time.perf_counter() - start
+    return total / elapsed
+
+
+if __name__ == "__main__":
+    renders = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    cold_rate = run(renders, cold=True)
+
+    warm_render_contexts()
+    warm_rate = run(renders, cold=False)
+
+    print(f"Renders per language: {renders} ({renders * len(LANGUAGE_TEMPLATES)} total)")
+    print(f"Cold (context rebuilt per render): {cold_rate:8.1f} renders/sec/core")
+    print(f"Warm (shared render context):      {warm_rate:8.1f} renders/sec/core")
+    print(f"Speedup: {warm_rate / cold_rate:.2f}x")
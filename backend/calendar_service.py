@@ -0,0 +1,169 @@
+"""
+Invitation Calendar Service
+Builds .ics calendars for wedding events with icalendar and caches them
+
+Calendars are cached by a fingerprint of the fields they are built from,
+so any event edit produces a new fingerprint (and ETag) automatically and
+unchanged schedules are served without rebuilding.
+"""
+
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from icalendar import Calendar, Event as ICalEvent, vDuration
+
+
+CALENDAR_CACHE_SIZE = 256
+
+# Guests' calendar apps should re-poll the subscription feed at most this often
+CALENDAR_REFRESH_INTERVAL = timedelta(hours=6)
+
+# Only the fields needed for the calendar (and the expiry check) are loaded
+CALENDAR_PROFILE_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "slug": 1,
+    "groom_name": 1,
+    "bride_name": 1,
+    "event_type": 1,
+    "event_date": 1,
+    "venue": 1,
+    "city": 1,
+    "is_active": 1,
+    "link_expiry_date": 1,
+    "updated_at": 1,
+    "events.event_id": 1,
+    "events.name": 1,
+    "events.date": 1,
+    "events.start_time": 1,
+    "events.end_time": 1,
+    "events.venue_name": 1,
+    "events.venue_address": 1,
+    "events.description": 1,
+    "events.visible": 1
+}
+
+_calendar_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_calendar_cache_lock = threading.Lock()
+
+
+def _parse_datetime(value) -> Optional[datetime]:
+    """Accept datetimes or ISO strings as stored in MongoDB"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def calendar_last_modified(profile: dict) -> Optional[datetime]:
+    """Profile updated_at, which every event edit bumps"""
+    return _parse_datetime(profile.get('updated_at'))
+
+
+def calendar_fingerprint(profile: dict) -> str:
+    """Hash of every field that ends up in the calendar"""
+    relevant = {
+        key: profile.get(key)
+        for key in ('id', 'groom_name', 'bride_name', 'event_type', 'event_date', 'venue', 'city', 'events')
+    }
+    raw = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+
+def build_invitation_calendar(profile: dict) -> bytes:
+    """
+    Build .ics content for a profile's visible events
+
+    Event times are written as floating local times, matching how they are
+    entered. Falls back to the profile's main event_date when no events exist.
+    """
+    couple = f"{profile['groom_name']} & {profile['bride_name']}"
+    dtstamp = calendar_last_modified(profile) or datetime.now(timezone.utc)
+
+    cal = Calendar()
+    cal.add('prodid', '-//Wedding Invitation//EN')
+    cal.add('version', '2.0')
+    cal.add('calscale', 'GREGORIAN')
+    cal.add('method', 'PUBLISH')
+    cal.add('x-wr-calname', f"Wedding - {couple}")
+    # Subscription hints for calendar apps polling the feed
+    cal.add('refresh-interval', CALENDAR_REFRESH_INTERVAL, parameters={'VALUE': 'DURATION'})
+    cal.add('x-published-ttl', vDuration(CALENDAR_REFRESH_INTERVAL))
+
+    events = profile.get('events', [])
+
+    # If events exist, use those; otherwise use main event_date
+    if events:
+        for event in events:
+            if not event.get('visible', True):
+                continue
+
+            # Parse event date and time
+            event_date = datetime.strptime(event['date'], '%Y-%m-%d')
+            start_hour, start_minute = event['start_time'].split(':')[:2]
+            event_datetime = event_date.replace(hour=int(start_hour), minute=int(start_minute))
+
+            # End time (default to 2 hours later if not specified)
+            if event.get('end_time'):
+                end_hour, end_minute = event['end_time'].split(':')[:2]
+                end_datetime = event_date.replace(hour=int(end_hour), minute=int(end_minute))
+            else:
+                end_datetime = event_datetime + timedelta(hours=2)
+
+            ical_event = ICalEvent()
+            ical_event.add('uid', f"{event.get('event_id') or uuid.uuid4()}@wedding-invitation")
+            ical_event.add('dtstamp', dtstamp)
+            ical_event.add('dtstart', event_datetime)
+            ical_event.add('dtend', end_datetime)
+            ical_event.add('summary', f"{event['name']} - {couple}")
+            ical_event.add('location', f"{event['venue_name']}, {event['venue_address']}")
+            ical_event.add('description', event.get('description') or '')
+            ical_event.add('status', 'CONFIRMED')
+            cal.add_component(ical_event)
+    else:
+        # Use main event_date
+        event_datetime = _parse_datetime(profile['event_date']).replace(tzinfo=None)
+        end_datetime = event_datetime + timedelta(hours=4)
+
+        ical_event = ICalEvent()
+        ical_event.add('uid', f"{profile['id']}@wedding-invitation")
+        ical_event.add('dtstamp', dtstamp)
+        ical_event.add('dtstart', event_datetime)
+        ical_event.add('dtend', end_datetime)
+        ical_event.add('summary', f"{profile['event_type'].title()} - {couple}")
+        ical_event.add('location', f"{profile['venue']}, {profile.get('city') or ''}")
+        ical_event.add('description', f"Join us for our {profile['event_type']}")
+        ical_event.add('status', 'CONFIRMED')
+        cal.add_component(ical_event)
+
+    return cal.to_ical()
+
+
+def get_invitation_calendar(profile: dict) -> Tuple[bytes, str]:
+    """
+    Get cached .ics content for a profile, building it on first request
+
+    Returns:
+        (ics bytes, etag)
+    """
+    fingerprint = calendar_fingerprint(profile)
+
+    with _calendar_cache_lock:
+        ics_content = _calendar_cache.get(fingerprint)
+        if ics_content is not None:
+            _calendar_cache.move_to_end(fingerprint)
+
+    if ics_content is None:
+        ics_content = build_invitation_calendar(profile)
+        with _calendar_cache_lock:
+            _calendar_cache[fingerprint] = ics_content
+            while len(_calendar_cache) > CALENDAR_CACHE_SIZE:
+                _calendar_cache.popitem(last=False)
+
+    return ics_content, f'"{fingerprint}"'
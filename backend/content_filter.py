@@ -0,0 +1,181 @@
+"""
+Content Filter Engine
+Profanity detection and plain-text sanitizing for guest-submitted content
+
+The word list (English plus transliterated Hindi, Telugu and Tamil) is
+compiled once into an Aho-Corasick automaton, so a message is scanned in a
+single pass however many terms are listed. Matches must sit on word
+boundaries ("hello" no longer trips on "hell"); terms ending in "*" are
+stems that also match longer words ("fucking" for "fuck*"), used only
+where no innocent word starts the same way.
+
+Text is normalized with one str.translate pass before scanning: ASCII is
+lower-cased, common leetspeak substitutions become letters and zero-width
+characters used to split words are removed.
+
+Guest names and messages on greetings, wishes and RSVPs are stripped of
+HTML by one shared bleach Cleaner instead of building a new one per call.
+"""
+
+import unicodedata
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from bleach.sanitizer import Cleaner
+
+
+PROFANITY_TERMS = [
+    # English
+    'damn', 'hell', 'shit*', 'fuck*', 'ass', 'asshole*', 'bitch*', 'bastard*',
+    'crap', 'dick', 'dickhead*', 'piss*', 'slut*', 'whore*', 'idiot*', 'stupid',
+    'dumb', 'motherfuck*', 'cunt*', 'wanker*', 'bullshit*',
+    # Short transliterations are also the start of names, places and dishes
+    # ("Othappam", "Chodavaram", "Pundarik", "laudable"), so they only match
+    # as whole words; "*" is kept for stems nothing innocent starts with.
+    # Hindi (transliterated)
+    'chutiy*', 'chod', 'madarchod*', 'behenchod*', 'bhenchod*', 'bhosdi*',
+    'bhosda*', 'gaand', 'gandu', 'harami*', 'haramkhor*', 'kamina', 'kamine',
+    'randi', 'lund', 'lavda', 'lauda',
+    # Telugu (transliterated)
+    'dengu', 'dengey', 'dengutha*', 'lanja', 'lanjakodaka*', 'nakodaka*',
+    'modda', 'puku', 'dobbey',
+    # Tamil (transliterated)
+    'punda', 'pundai*', 'thevidiya*', 'thevdiya*', 'oombu*', 'koothi',
+    'baadu', 'otha', 'ommala*'
+]
+
+# Characters people substitute for letters to dodge filters. Punctuation
+# that commonly ends a word ("damn!") is left alone so it stays a boundary.
+LEETSPEAK = {
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '8': 'b',
+    '@': 'a', '$': 's'
+}
+
+# Zero-width and invisible joiners used to split words
+ZERO_WIDTH = '\u00ad\u180e\u200b\u200c\u200d\u200e\u200f\u2060\u2061\u2062\u2063\u2064\ufeff'
+
+
+def _build_normalize_table() -> Dict[int, Optional[str]]:
+    table: Dict[int, Optional[str]] = {ord(c): c.lower() for c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'}
+    table.update({ord(k): v for k, v in LEETSPEAK.items()})
+    table.update({ord(c): None for c in ZERO_WIDTH})
+    return table
+
+
+NORMALIZE_TABLE = _build_normalize_table()
+
+
+def normalize_text(text: str) -> str:
+    """Lower-case, undo leetspeak and drop zero-width characters"""
+    if not text.isascii():
+        # Non-ASCII upper case (e.g. accented Latin) isn't in the table
+        text = text.lower()
+    return text.translate(NORMALIZE_TABLE)
+
+
+def _is_word_char(ch: str) -> bool:
+    # Combining marks (Indic vowel signs) are part of a word but not alnum
+    return ch.isalnum() or unicodedata.category(ch).startswith('M')
+
+
+class ProfanityMatcher:
+    """Aho-Corasick automaton over a word list with word-boundary checks"""
+
+    def __init__(self, terms: List[str]):
+        # Trie as parallel arrays: goto transitions, failure links and, per
+        # state, the (term, length, is_stem) entries that end there
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[str, int, bool]]] = [[]]
+
+        for term in terms:
+            is_stem = term.endswith('*')
+            word = normalize_text(term.rstrip('*'))
+            if word:
+                self._add(word, is_stem)
+        self._link()
+
+    def _add(self, word: str, is_stem: bool):
+        state = 0
+        for ch in word:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((word, len(word), is_stem))
+
+    def _link(self):
+        """
+        Breadth-first failure links, folded into a full transition table
+
+        Each state's table also holds its failure state's transitions, so a
+        scan is one dict lookup per character with no fallback loop.
+        """
+        self._delta: List[Dict[str, int]] = [dict(self._goto[0])] + [{} for _ in self._goto[1:]]
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fail = self._fail[state]
+            self._outputs[state] = self._outputs[state] + self._outputs[fail]
+            self._delta[state] = {**self._delta[fail], **self._goto[state]}
+            for ch, next_state in self._goto[state].items():
+                self._fail[next_state] = self._delta[fail].get(ch, 0)
+                queue.append(next_state)
+
+    def _scan(self, text: str, first_only: bool) -> List[str]:
+        delta, outputs = self._delta, self._outputs
+        length = len(text)
+        found = []
+        state = 0
+        for index, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if not outputs[state]:
+                continue
+            for word, word_length, is_stem in outputs[state]:
+                start = index - word_length + 1
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if not is_stem and index + 1 < length and _is_word_char(text[index + 1]):
+                    continue
+                found.append(word)
+                if first_only:
+                    return found
+        return found
+
+    def contains(self, normalized_text: str) -> bool:
+        return bool(self._scan(normalized_text, first_only=True))
+
+    def find_all(self, normalized_text: str) -> List[str]:
+        return self._scan(normalized_text, first_only=False)
+
+
+class ContentFilter:
+    """Shared profanity matcher and plain-text sanitizer"""
+
+    def __init__(self, terms: List[str] = PROFANITY_TERMS):
+        self.matcher = ProfanityMatcher(terms)
+        self._cleaner = Cleaner(tags=[], attributes={}, strip=True)
+
+    def contains_profanity(self, text: Optional[str]) -> bool:
+        if not text:
+            return False
+        return self.matcher.contains(normalize_text(text))
+
+    def find_profanity(self, text: Optional[str]) -> List[str]:
+        """Every listed term found in the text (normalized spelling)"""
+        if not text:
+            return []
+        return self.matcher.find_all(normalize_text(text))
+
+    def clean_text(self, text: Optional[str]) -> Optional[str]:
+        """Strip all HTML from guest input, same output as bleach.clean(tags=[], strip=True)"""
+        if not text:
+            return text
+        return self._cleaner.clean(text)
+
+
+content_filter = ContentFilter()
@@ -1,13 +1,33 @@
 """
 PHASE 35: Credit Management Service
 Handles all credit operations with immutable ledger tracking
+
+Every balance change is one find_one_and_update: $inc with the balance
+check expressed as a guard in the filter, so concurrent operations on one
+admin can neither lose updates nor overdraw. When MongoDB runs as a
+replica set (or behind mongos) the balance update and its ledger entry are
+written in one multi-document transaction; on a standalone server the
+ledger entry follows the atomic update.
 """
 
+import logging
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from pymongo import ReturnDocument
+
 from models import CreditLedger, CreditActionType
 
 
+BALANCE_PROJECTION = {'_id': 0, 'total_credits': 1, 'used_credits': 1}
+
+# Available credits (total - used) as an aggregation expression for $expr guards
+AVAILABLE_CREDITS_EXPR = {'$subtract': [
+    {'$ifNull': ['$total_credits', 0]},
+    {'$ifNull': ['$used_credits', 0]}
+]}
+
+
 class CreditService:
     """Service for managing credits with immutable ledger"""
     
@@ -15,6 +35,79 @@ class CreditService:
         self.db = db
         self.admins_collection = db['admins']
         self.ledger_collection = db['credit_ledger']
+        self._transactions_supported: Optional[bool] = None
+    
+    async def _supports_transactions(self) -> bool:
+        """Whether the deployment is a replica set or sharded cluster (checked once)"""
+        if self._transactions_supported is None:
+            try:
+                hello = await self.db.client.admin.command('hello')
+                self._transactions_supported = bool(hello.get('setName')) or hello.get('msg') == 'isdbgrid'
+            except Exception as e:
+                logging.warning(f"Could not detect MongoDB topology, credit ledger writes are not transactional: {e}")
+                self._transactions_supported = False
+        return self._transactions_supported
+    
+    async def _apply(
+        self,
+        admin_id: str,
+        guard: Dict[str, Any],
+        increments: Dict[str, int],
+        build_entry: Callable[[Dict[str, int]], CreditLedger]
+    ) -> Tuple[Optional[Dict[str, int]], Optional[CreditLedger]]:
+        """
+        Apply a guarded $inc to an admin's credits and record the ledger entry
+        
+        Returns:
+            (balance after, ledger entry), or (None, None) if the admin doesn't
+            exist or the guard rejected the change
+        """
+        async def run(session=None):
+            after = await self.admins_collection.find_one_and_update(
+                {'id': admin_id, **guard},
+                {'$inc': increments},
+                projection=BALANCE_PROJECTION,
+                return_document=ReturnDocument.AFTER,
+                session=session
+            )
+            if after is None:
+                return None, None
+            
+            after = {
+                'total_credits': after.get('total_credits', 0),
+                'used_credits': after.get('used_credits', 0)
+            }
+            entry = build_entry(after)
+            await self.ledger_collection.insert_one(entry.model_dump(), session=session)
+            return after, entry
+        
+        if await self._supports_transactions():
+            async with await self.db.client.start_session() as session:
+                # Retries the whole callback on transient transaction errors
+                return await session.with_transaction(run)
+        
+        return await run()
+    
+    async def _rejection(self, admin_id: str) -> Dict[str, int]:
+        """Current balance after a guarded update matched nothing (raises if no such admin)"""
+        admin = await self.admins_collection.find_one({'id': admin_id}, BALANCE_PROJECTION)
+        if not admin:
+            raise ValueError(f"Admin with id {admin_id} not found")
+        return {
+            'total_credits': admin.get('total_credits', 0),
+            'used_credits': admin.get('used_credits', 0)
+        }
+    
+    @staticmethod
+    def _result(admin_id: str, after: Dict[str, int], entry: CreditLedger) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'admin_id': admin_id,
+            'total_credits': after['total_credits'],
+            'used_credits': after['used_credits'],
+            'available_credits': after['total_credits'] - after['used_credits'],
+            'ledger_id': entry.credit_id
+        }
     
     async def add_credits(
         self,
@@ -28,43 +121,26 @@ class CreditService:
         Add credits to an admin account
         Returns: Updated credit balance and ledger entry
         """
-        # Get current admin data
-        admin = await self.admins_collection.find_one({'id': admin_id})
-        if not admin:
-            raise ValueError(f"Admin with id {admin_id} not found")
-        
-        # Calculate new balance
-        current_total = admin.get('total_credits', 0)
-        new_total = current_total + amount
-        
-        # Update admin credits
-        await self.admins_collection.update_one(
-            {'id': admin_id},
-            {'$set': {'total_credits': new_total}}
+        after, entry = await self._apply(
+            admin_id,
+            {},
+            {'total_credits': amount},
+            lambda after: CreditLedger(
+                admin_id=admin_id,
+                action_type=CreditActionType.ADD,
+                amount=amount,
+                balance_before=after['total_credits'] - amount,
+                balance_after=after['total_credits'],
+                reason=reason,
+                performed_by=performed_by,
+                metadata=metadata
+            )
         )
+        if after is None:
+            await self._rejection(admin_id)
+            raise ValueError(f"Could not add credits to admin {admin_id}")
         
-        # Create ledger entry
-        ledger_entry = CreditLedger(
-            admin_id=admin_id,
-            action_type=CreditActionType.ADD,
-            amount=amount,
-            balance_before=current_total,
-            balance_after=new_total,
-            reason=reason,
-            performed_by=performed_by,
-            metadata=metadata
-        )
-        
-        await self.ledger_collection.insert_one(ledger_entry.model_dump())
-        
-        return {
-            'success': True,
-            'admin_id': admin_id,
-            'total_credits': new_total,
-            'used_credits': admin.get('used_credits', 0),
-            'available_credits': new_total - admin.get('used_credits', 0),
-            'ledger_id': ledger_entry.credit_id
-        }
+        return self._result(admin_id, after, entry)
     
     async def deduct_credits(
         self,
@@ -79,48 +155,28 @@ class CreditService:
         Deduct credits from an admin account (manual deduction)
         Returns: Updated credit balance and ledger entry
         """
-        # Get current admin data
-        admin = await self.admins_collection.find_one({'id': admin_id})
-        if not admin:
-            raise ValueError(f"Admin with id {admin_id} not found")
-        
-        # Calculate new balance
-        current_total = admin.get('total_credits', 0)
-        new_total = current_total - amount
-        
-        # Prevent negative balance
-        if new_total < 0:
-            raise ValueError(f"Insufficient credits. Current: {current_total}, Attempting to deduct: {amount}")
-        
-        # Update admin credits
-        await self.admins_collection.update_one(
-            {'id': admin_id},
-            {'$set': {'total_credits': new_total}}
-        )
-        
-        # Create ledger entry
-        ledger_entry = CreditLedger(
-            admin_id=admin_id,
-            action_type=CreditActionType.DEDUCT,
-            amount=-amount,  # Negative for deduction
-            balance_before=current_total,
-            balance_after=new_total,
-            reason=reason,
-            related_wedding_id=related_wedding_id,
-            performed_by=performed_by,
-            metadata=metadata
+        # Prevent negative balance: only matches while total_credits >= amount
+        after, entry = await self._apply(
+            admin_id,
+            {'$expr': {'$gte': [{'$ifNull': ['$total_credits', 0]}, amount]}},
+            {'total_credits': -amount},
+            lambda after: CreditLedger(
+                admin_id=admin_id,
+                action_type=CreditActionType.DEDUCT,
+                amount=-amount,  # Negative for deduction
+                balance_before=after['total_credits'] + amount,
+                balance_after=after['total_credits'],
+                reason=reason,
+                related_wedding_id=related_wedding_id,
+                performed_by=performed_by,
+                metadata=metadata
+            )
         )
+        if after is None:
+            current = await self._rejection(admin_id)
+            raise ValueError(f"Insufficient credits. Current: {current['total_credits']}, Attempting to deduct: {amount}")
         
-        await self.ledger_collection.insert_one(ledger_entry.model_dump())
-        
-        return {
-            'success': True,
-            'admin_id': admin_id,
-            'total_credits': new_total,
-            'used_credits': admin.get('used_credits', 0),
-            'available_credits': new_total - admin.get('used_credits', 0),
-            'ledger_id': ledger_entry.credit_id
-        }
+        return self._result(admin_id, after, entry)
     
     async def use_credits(
         self,
@@ -135,50 +191,29 @@ class CreditService:
         This increments used_credits, not deducting from total_credits
         Returns: Updated credit balance and ledger entry
         """
-        # Get current admin data
-        admin = await self.admins_collection.find_one({'id': admin_id})
-        if not admin:
-            raise ValueError(f"Admin with id {admin_id} not found")
-        
-        # Check available credits
-        current_total = admin.get('total_credits', 0)
-        current_used = admin.get('used_credits', 0)
-        available = current_total - current_used
-        
-        if available < amount:
-            raise ValueError(f"Insufficient credits. Available: {available}, Required: {amount}")
-        
-        # Update used credits
-        new_used = current_used + amount
-        
-        await self.admins_collection.update_one(
-            {'id': admin_id},
-            {'$set': {'used_credits': new_used}}
+        # Only matches while total_credits - used_credits >= amount
+        after, entry = await self._apply(
+            admin_id,
+            {'$expr': {'$gte': [AVAILABLE_CREDITS_EXPR, amount]}},
+            {'used_credits': amount},
+            lambda after: CreditLedger(
+                admin_id=admin_id,
+                action_type=CreditActionType.USED,
+                amount=-amount,  # Negative for usage
+                balance_before=after['total_credits'] - after['used_credits'] + amount,
+                balance_after=after['total_credits'] - after['used_credits'],
+                reason=reason,
+                related_wedding_id=related_wedding_id,
+                performed_by=admin_id,  # Admin themselves
+                metadata=metadata
+            )
         )
+        if after is None:
+            current = await self._rejection(admin_id)
+            available = current['total_credits'] - current['used_credits']
+            raise ValueError(f"Insufficient credits. Available: {available}, Required: {amount}")
         
-        # Create ledger entry
-        ledger_entry = CreditLedger(
-            admin_id=admin_id,
-            action_type=CreditActionType.USED,
-            amount=-amount,  # Negative for usage
-            balance_before=available,
-            balance_after=available - amount,
-            reason=reason,
-            related_wedding_id=related_wedding_id,
-            performed_by=admin_id,  # Admin themselves
-            metadata=metadata
-        )
-        
-        await self.ledger_collection.insert_one(ledger_entry.model_dump())
-        
-        return {
-            'success': True,
-            'admin_id': admin_id,
-            'total_credits': current_total,
-            'used_credits': new_used,
-            'available_credits': current_total - new_used,
-            'ledger_id': ledger_entry.credit_id
-        }
+        return self._result(admin_id, after, entry)
     
     async def get_credit_balance(self, admin_id: str) -> Dict[str, int]:
         """Get current credit balance for an admin"""
@@ -233,44 +268,28 @@ class CreditService:
         Manual credit adjustment (can be positive or negative)
         Used for corrections or special cases
         """
-        # Get current admin data
-        admin = await self.admins_collection.find_one({'id': admin_id})
-        if not admin:
-            raise ValueError(f"Admin with id {admin_id} not found")
+        # Prevent negative balance (only a negative adjustment can cause one)
+        guard = {}
+        if amount < 0:
+            guard = {'$expr': {'$gte': [{'$ifNull': ['$total_credits', 0]}, -amount]}}
         
-        # Calculate new balance
-        current_total = admin.get('total_credits', 0)
-        new_total = current_total + amount  # amount can be negative
-        
-        # Prevent negative balance
-        if new_total < 0:
-            raise ValueError(f"Adjustment would result in negative balance. Current: {current_total}, Adjustment: {amount}")
-        
-        # Update admin credits
-        await self.admins_collection.update_one(
-            {'id': admin_id},
-            {'$set': {'total_credits': new_total}}
+        after, entry = await self._apply(
+            admin_id,
+            guard,
+            {'total_credits': amount},  # amount can be negative
+            lambda after: CreditLedger(
+                admin_id=admin_id,
+                action_type=CreditActionType.ADJUST,
+                amount=amount,
+                balance_before=after['total_credits'] - amount,
+                balance_after=after['total_credits'],
+                reason=reason,
+                performed_by=performed_by,
+                metadata=metadata
+            )
         )
+        if after is None:
+            current = await self._rejection(admin_id)
+            raise ValueError(f"Adjustment would result in negative balance. Current: {current['total_credits']}, Adjustment: {amount}")
         
-        # Create ledger entry
-        ledger_entry = CreditLedger(
-            admin_id=admin_id,
-            action_type=CreditActionType.ADJUST,
-            amount=amount,
-            balance_before=current_total,
-            balance_after=new_total,
-            reason=reason,
-            performed_by=performed_by,
-            metadata=metadata
-        )
-        
-        await self.ledger_collection.insert_one(ledger_entry.model_dump())
-        
-        return {
-            'success': True,
-            'admin_id': admin_id,
-            'total_credits': new_total,
-            'used_credits': admin.get('used_credits', 0),
-            'available_credits': new_total - admin.get('used_credits', 0),
-            'ledger_id': ledger_entry.credit_id
-        }
+        return self._result(admin_id, after, entry)
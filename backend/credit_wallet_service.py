@@ -0,0 +1,318 @@
+"""
+PHASE 35: Profile Credit Wallets
+Atomic wallet updates with a batched, ordered transaction log
+
+Every wallet change is one find_one_and_update with $inc that returns the
+wallet after the change, so balance_after in the transaction log is exact
+even when rewards and spends for one profile arrive together. Crediting
+upserts the wallet; the unique index on profile_id guarantees one wallet
+per profile, and a concurrent first write that loses the upsert race is
+retried as a plain update. Debits carry the balance check in the filter,
+so a wallet can't be overdrawn.
+
+Transaction records are queued and written by one background task with
+ordered insert_many batches, in the order the wallet updates completed.
+A batch that fails transiently (lost connection, timeout) is retried with
+backoff before anything after it is written, so order is kept and nothing
+is dropped while MongoDB is away. The wallet document is the source of
+truth for balances; the log is the history. Without a running writer
+(scripts, tests) records are written immediately.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+
+from models import CreditTransaction, CreditTransactionType
+
+
+CREDIT_TRANSACTION_BATCH_SIZE = 100
+CREDIT_TRANSACTION_FLUSH_SECONDS = 0.25
+CREDIT_TRANSACTION_RETRY_BASE_SECONDS = 0.5
+CREDIT_TRANSACTION_RETRY_MAX_SECONDS = 30
+# Upper bound on how long shutdown waits for the log to drain
+CREDIT_TRANSACTION_DRAIN_TIMEOUT_SECONDS = 10
+
+WALLET_TOTAL_FIELDS = ("balance", "earned_total", "spent_total", "expired_total")
+
+
+class CreditWalletService:
+    """Per-profile credit wallets and their transaction history"""
+
+    def __init__(self, db):
+        self.wallets = db['credit_wallets']
+        self.transactions = db['credit_transactions']
+        # Unbounded: transaction records are never dropped
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self._closed = False
+        self.written = 0
+        self.failed = 0
+        self.retries = 0
+
+    async def ensure_indexes(self):
+        try:
+            await self._create_wallet_index()
+        except (DuplicateKeyError, OperationFailure) as e:
+            # Older find-then-insert writes could race into duplicate wallets
+            logging.warning(f"Merging duplicate credit wallets before indexing: {e}")
+            await self._merge_duplicate_wallets()
+            await self._create_wallet_index()
+
+        await self.transactions.create_index(
+            [("profile_id", 1), ("created_at", -1)],
+            name="profile_id_created_at"
+        )
+
+    async def _create_wallet_index(self):
+        await self.wallets.create_index("profile_id", unique=True, name="profile_id_unique")
+
+    async def _merge_duplicate_wallets(self):
+        """Fold every profile's duplicate wallets into one, summing the totals"""
+        pipeline = [
+            {"$group": {
+                "_id": "$profile_id",
+                "ids": {"$push": "$_id"},
+                "count": {"$sum": 1},
+                **{field: {"$sum": {"$ifNull": [f"${field}", 0]}} for field in WALLET_TOTAL_FIELDS}
+            }},
+            {"$match": {"count": {"$gt": 1}}}
+        ]
+        async for group in self.wallets.aggregate(pipeline, allowDiskUse=True):
+            await self.wallets.update_one(
+                {"_id": group['ids'][0]},
+                {"$set": {
+                    **{field: group[field] for field in WALLET_TOTAL_FIELDS},
+                    "last_updated": datetime.now(timezone.utc)
+                }}
+            )
+            await self.wallets.delete_many({"_id": {"$in": group['ids'][1:]}})
+
+    async def _update_wallet(self, wallet_filter: Dict[str, Any], update: Dict[str, Any], upsert: bool) -> Optional[dict]:
+        try:
+            return await self.wallets.find_one_and_update(
+                wallet_filter,
+                update,
+                projection={"_id": 0},
+                upsert=upsert,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            if not upsert:
+                raise
+            # A concurrent first write for the same profile created the wallet
+            return await self.wallets.find_one_and_update(
+                wallet_filter,
+                update,
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER
+            )
+
+    async def get_wallet(self, profile_id: str) -> dict:
+        """The profile's wallet, created empty if it doesn't exist yet"""
+        return await self._update_wallet(
+            {"profile_id": profile_id},
+            {"$setOnInsert": {
+                **{field: 0 for field in WALLET_TOTAL_FIELDS},
+                "last_updated": datetime.now(timezone.utc)
+            }},
+            upsert=True
+        )
+
+    async def get_balance(self, profile_id: str) -> int:
+        """Current balance (0 without a wallet)"""
+        wallet = await self.wallets.find_one({"profile_id": profile_id}, {"_id": 0, "balance": 1})
+        return wallet.get("balance", 0) if wallet else 0
+
+    async def credit(
+        self,
+        profile_id: str,
+        amount: int,
+        transaction_type: CreditTransactionType,
+        description: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> dict:
+        """
+        Add earned credits, creating the wallet if needed
+
+        Returns:
+            The wallet after the change
+        """
+        wallet = await self._update_wallet(
+            {"profile_id": profile_id},
+            {
+                "$inc": {"balance": amount, "earned_total": amount},
+                "$set": {"last_updated": datetime.now(timezone.utc)},
+                "$setOnInsert": {"spent_total": 0, "expired_total": 0}
+            },
+            upsert=True
+        )
+        await self._record(profile_id, transaction_type, amount, wallet['balance'], description, metadata)
+        return wallet
+
+    async def debit(
+        self,
+        profile_id: str,
+        amount: int,
+        transaction_type: CreditTransactionType,
+        description: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        allow_negative: bool = False
+    ) -> Optional[dict]:
+        """
+        Spend or revoke credits
+
+        Args:
+            allow_negative: Skip the balance check (admin revocations)
+
+        Returns:
+            The wallet after the change, or None if the profile has no wallet
+            or not enough credits
+        """
+        wallet_filter: Dict[str, Any] = {"profile_id": profile_id}
+        if not allow_negative:
+            wallet_filter["balance"] = {"$gte": amount}
+
+        wallet = await self._update_wallet(
+            wallet_filter,
+            {
+                "$inc": {"balance": -amount, "spent_total": amount},
+                "$set": {"last_updated": datetime.now(timezone.utc)}
+            },
+            upsert=False
+        )
+        if wallet is None:
+            return None
+
+        await self._record(profile_id, transaction_type, -amount, wallet['balance'], description, metadata)
+        return wallet
+
+    async def _record(
+        self,
+        profile_id: str,
+        transaction_type: CreditTransactionType,
+        amount: int,
+        balance_after: int,
+        description: str,
+        metadata: Optional[Dict[str, Any]]
+    ):
+        transaction = CreditTransaction(
+            profile_id=profile_id,
+            type=transaction_type,
+            amount=amount,
+            balance_after=balance_after,
+            description=description,
+            metadata=metadata or {}
+        )
+        doc = transaction.model_dump()
+        doc['type'] = transaction.type.value
+
+        if self._writer is None or self._closed:
+            await self.transactions.insert_one(doc)
+            return
+
+        self._queue.put_nowait(doc)
+        if self._queue.qsize() >= CREDIT_TRANSACTION_BATCH_SIZE:
+            self._wakeup.set()
+
+    def _take_batch(self) -> List[dict]:
+        batch = []
+        while len(batch) < CREDIT_TRANSACTION_BATCH_SIZE and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _write_batch(self, batch: List[dict]):
+        """
+        Ordered insert_many of one batch
+
+        Transient failures are retried with backoff until the batch is
+        written; a record MongoDB itself rejects is logged and skipped.
+        """
+        delay = CREDIT_TRANSACTION_RETRY_BASE_SECONDS
+        try:
+            while batch:
+                try:
+                    await self.transactions.insert_many(batch, ordered=True)
+                    self.written += len(batch)
+                    return
+                except BulkWriteError as e:
+                    write_errors = e.details.get('writeErrors') or []
+                    if not write_errors:
+                        # Only the write concern failed; every record was inserted
+                        self.written += len(batch)
+                        logging.warning(f"Credit transactions written without write concern: {e}")
+                        return
+                    inserted = write_errors[0]['index']
+                    self.written += inserted
+                    self.failed += 1
+                    logging.error(f"Failed to write credit transaction {batch[inserted].get('transaction_id')}: {e}")
+                    batch = batch[inserted + 1:]
+                except Exception as e:
+                    self.retries += 1
+                    logging.error(f"Failed to write {len(batch)} credit transactions, retrying in {delay}s: {e}")
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, CREDIT_TRANSACTION_RETRY_MAX_SECONDS)
+        except asyncio.CancelledError:
+            # Shutdown gave up waiting: leave the ids for manual replay
+            self._log_unwritten(batch)
+            raise
+
+    def _log_unwritten(self, batch: List[dict]):
+        ids = [doc.get('transaction_id') for doc in batch]
+        if ids:
+            logging.critical(f"{len(ids)} credit transactions not written: {ids}")
+
+    def _take_all(self) -> List[dict]:
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        return pending
+
+    async def _flush(self):
+        while not self._queue.empty():
+            await self._write_batch(self._take_batch())
+
+    async def _run(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=CREDIT_TRANSACTION_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._flush()
+        await self._flush()
+
+    def start(self):
+        """Start the background transaction log writer"""
+        if self._writer is None:
+            self._closed = False
+            self._writer = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Write everything still queued; later records are written directly"""
+        self._closed = True
+        self._wakeup.set()
+        if self._writer is None:
+            await self._flush()
+            return
+
+        try:
+            await asyncio.wait_for(self._writer, timeout=CREDIT_TRANSACTION_DRAIN_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logging.error(f"Credit transaction drain timed out with {self._queue.qsize()} records queued")
+            self._log_unwritten(self._take_all())
+        finally:
+            self._writer = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "failed": self.failed,
+            "retries": self.retries
+        }
@@ -0,0 +1,305 @@
+"""
+Guest List Import Service
+Bulk import of guest spreadsheets (CSV or XLSX) into the guests collection
+
+Rows are read lazily and processed in chunks: each chunk is validated and
+phone numbers are normalized to E.164, then checked against existing RSVPs
+with one query and written with one unordered bulk_write of upserts on the
+unique (profile_id, guest_phone) index. Guests already on the list are
+reported instead of overwritten. Every rejected row is returned with its
+spreadsheet row number so families can fix and re-upload the file.
+"""
+
+import csv
+import io
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from openpyxl import load_workbook
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from models import Guest, GuestImportRowError
+
+
+GUEST_IMPORT_CHUNK_SIZE = 500
+MAX_GUEST_IMPORT_ROWS = 5000
+MAX_GUEST_IMPORT_BYTES = 5 * 1024 * 1024
+MAX_GUEST_COUNT_PER_ROW = 10
+
+# Local numbers without a country code are assumed to be Indian
+DEFAULT_COUNTRY_CODE = "91"
+
+# Accepted header names (lower-cased, stripped) for each field
+GUEST_IMPORT_COLUMNS = {
+    'guest_name': ('guest_name', 'name', 'guest name', 'full name'),
+    'guest_phone': ('guest_phone', 'phone', 'phone number', 'mobile', 'whatsapp', 'contact'),
+    'guest_count': ('guest_count', 'count', 'guests', 'members', 'pax'),
+    'group': ('group', 'side', 'category', 'relation')
+}
+
+# E.164 with a realistic minimum length (country code + subscriber number)
+E164_PATTERN = re.compile(r'^\+[1-9]\d{7,14}$')
+PHONE_SEPARATORS = re.compile(r'[\s\-().]')
+
+
+def normalize_phone(raw) -> Optional[str]:
+    """
+    Normalize a spreadsheet phone number to E.164, or None if it can't be
+
+    Handles separators, 00 international prefixes, local numbers with or
+    without a trunk 0, and numbers that spreadsheets turned into floats.
+    """
+    if raw is None:
+        return None
+    if isinstance(raw, float) and raw.is_integer():
+        raw = int(raw)
+
+    phone = PHONE_SEPARATORS.sub('', str(raw).strip())
+    if phone.startswith('00'):
+        phone = '+' + phone[2:]
+
+    if not phone.startswith('+'):
+        # Drop a trunk 0 from local numbers (09876543210)
+        if len(phone) == 11 and phone.startswith('0'):
+            phone = phone[1:]
+        if len(phone) == 10:
+            phone = DEFAULT_COUNTRY_CODE + phone
+        phone = '+' + phone
+
+    return phone if E164_PATTERN.match(phone) else None
+
+
+def _map_header(header: List) -> Dict[str, int]:
+    """Column index for each known field"""
+    normalized = [str(h).strip().lower() if h is not None else '' for h in header]
+    mapping = {}
+    for field, aliases in GUEST_IMPORT_COLUMNS.items():
+        for index, name in enumerate(normalized):
+            if name in aliases:
+                mapping[field] = index
+                break
+    return mapping
+
+
+def iter_spreadsheet_rows(content: bytes, filename: str) -> Iterator[Tuple[int, Dict]]:
+    """
+    Yield (row_number, {field: value}) for each non-empty data row
+
+    Raises ValueError for unsupported files or missing required columns.
+    """
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+
+    if extension == 'csv':
+        text = io.StringIO(content.decode('utf-8-sig'))
+        rows = csv.reader(text)
+        workbook = None
+    elif extension == 'xlsx':
+        workbook = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+    else:
+        raise ValueError("Upload a .csv or .xlsx file")
+
+    try:
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("The file is empty")
+
+        mapping = _map_header(list(header))
+        if 'guest_name' not in mapping or 'guest_phone' not in mapping:
+            raise ValueError("The file needs a name column and a phone column")
+
+        for row_number, row in enumerate(rows, start=2):
+            if not row or all(cell in (None, '') for cell in row):
+                continue
+            yield row_number, {
+                field: row[index] if index < len(row) else None
+                for field, index in mapping.items()
+            }
+    finally:
+        if workbook is not None:
+            workbook.close()
+
+
+def _validate_row(profile_id: str, row_number: int, values: Dict) -> Tuple[Optional[dict], Optional[GuestImportRowError]]:
+    """Build a guest document from a row, or the error explaining why not"""
+    name = str(values.get('guest_name') or '').strip()
+    raw_phone = values.get('guest_phone')
+    phone = normalize_phone(raw_phone)
+
+    def error(detail: str) -> GuestImportRowError:
+        return GuestImportRowError(
+            row=row_number,
+            guest_name=name or None,
+            guest_phone=str(raw_phone).strip() if raw_phone not in (None, '') else None,
+            reason="invalid",
+            detail=detail
+        )
+
+    if not name:
+        return None, error("Name is required")
+    if len(name) > 100:
+        return None, error("Name must be 100 characters or less")
+    if not phone:
+        return None, error("Phone number is missing or not a valid number")
+
+    guest_count = values.get('guest_count')
+    if guest_count in (None, ''):
+        guest_count = 1
+    else:
+        try:
+            guest_count = int(float(guest_count))
+        except (TypeError, ValueError):
+            return None, error("Guest count must be a number")
+        if guest_count < 1 or guest_count > MAX_GUEST_COUNT_PER_ROW:
+            return None, error(f"Guest count must be between 1 and {MAX_GUEST_COUNT_PER_ROW}")
+
+    group = values.get('group')
+    group = (str(group).strip() or None) if group is not None else None
+
+    guest = Guest(
+        profile_id=profile_id,
+        guest_name=name,
+        guest_phone=phone,
+        guest_count=guest_count,
+        group=group
+    )
+    doc = guest.model_dump()
+    doc['created_at'] = doc['created_at'].isoformat()
+    return doc, None
+
+
+class GuestImportService:
+    """Chunked, validated guest list import"""
+
+    def __init__(self, db):
+        self.guests_collection = db['guests']
+        self.rsvps_collection = db['rsvps']
+
+    async def ensure_indexes(self):
+        await self.guests_collection.create_index(
+            [("profile_id", 1), ("guest_phone", 1)],
+            unique=True,
+            name="profile_id_guest_phone_unique"
+        )
+
+    async def _write_chunk(
+        self,
+        profile_id: str,
+        chunk: List[Tuple[int, dict]],
+        errors: List[GuestImportRowError]
+    ) -> int:
+        """Dedupe one chunk against RSVPs and upsert it; returns rows imported"""
+        phones = [doc['guest_phone'] for _, doc in chunk]
+        rsvped = {
+            rsvp['guest_phone']
+            async for rsvp in self.rsvps_collection.find(
+                {"profile_id": profile_id, "guest_phone": {"$in": phones}},
+                {"_id": 0, "guest_phone": 1}
+            )
+        }
+
+        pending = []
+        for row_number, doc in chunk:
+            if doc['guest_phone'] in rsvped:
+                errors.append(GuestImportRowError(
+                    row=row_number,
+                    guest_name=doc['guest_name'],
+                    guest_phone=doc['guest_phone'],
+                    reason="already_rsvped",
+                    detail="This guest has already responded to the invitation"
+                ))
+            else:
+                pending.append((row_number, doc))
+
+        if not pending:
+            return 0
+
+        # $setOnInsert keeps existing guests untouched; upserted_ids tells which rows were new
+        operations = [
+            UpdateOne(
+                {"profile_id": profile_id, "guest_phone": doc['guest_phone']},
+                {"$setOnInsert": doc},
+                upsert=True
+            )
+            for _, doc in pending
+        ]
+        try:
+            result = await self.guests_collection.bulk_write(operations, ordered=False)
+            upserted = set(result.upserted_ids)
+        except BulkWriteError as e:
+            # A concurrent import inserted the same phone between the upsert's
+            # match and insert; every other operation still ran (unordered)
+            non_duplicate = [error for error in e.details.get('writeErrors', []) if error.get('code') != 11000]
+            if non_duplicate:
+                raise
+            upserted = {item['index'] for item in e.details.get('upserted', [])}
+
+        for index, (row_number, doc) in enumerate(pending):
+            if index not in upserted:
+                errors.append(GuestImportRowError(
+                    row=row_number,
+                    guest_name=doc['guest_name'],
+                    guest_phone=doc['guest_phone'],
+                    reason="already_invited",
+                    detail="This phone number is already on the guest list"
+                ))
+
+        return len(upserted)
+
+    async def import_guests(self, profile_id: str, content: bytes, filename: str) -> dict:
+        """
+        Import a guest spreadsheet
+
+        Returns:
+            {total_rows, imported, skipped, errors}
+        Raises:
+            ValueError: Unsupported or empty file, or missing columns
+        """
+        errors: List[GuestImportRowError] = []
+        seen_phones = set()
+        chunk: List[Tuple[int, dict]] = []
+        total_rows = 0
+        imported = 0
+
+        for row_number, values in iter_spreadsheet_rows(content, filename):
+            if total_rows >= MAX_GUEST_IMPORT_ROWS:
+                errors.append(GuestImportRowError(
+                    row=row_number,
+                    reason="invalid",
+                    detail=f"Row limit of {MAX_GUEST_IMPORT_ROWS} reached; this and later rows were not imported"
+                ))
+                break
+            total_rows += 1
+
+            doc, error = _validate_row(profile_id, row_number, values)
+            if error:
+                errors.append(error)
+                continue
+
+            if doc['guest_phone'] in seen_phones:
+                errors.append(GuestImportRowError(
+                    row=row_number,
+                    guest_name=doc['guest_name'],
+                    guest_phone=doc['guest_phone'],
+                    reason="duplicate_in_file",
+                    detail="This phone number appears earlier in the file"
+                ))
+                continue
+            seen_phones.add(doc['guest_phone'])
+
+            chunk.append((row_number, doc))
+            if len(chunk) >= GUEST_IMPORT_CHUNK_SIZE:
+                imported += await self._write_chunk(profile_id, chunk, errors)
+                chunk = []
+
+        if chunk:
+            imported += await self._write_chunk(profile_id, chunk, errors)
+
+        errors.sort(key=lambda e: e.row)
+        return {
+            'total_rows': total_rows,
+            'imported': imported,
+            'skipped': total_rows - imported,
+            'errors': errors
+        }
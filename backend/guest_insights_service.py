@@ -0,0 +1,160 @@
+"""
+PHASE 26: Guest Insights Service
+RSVP statistics via a MongoDB aggregation pipeline, with AI insight text
+cached against a fingerprint of those statistics
+
+The insight prompt depends only on the statistics, so while they are
+unchanged the stored insights_text is returned without an LLM call.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Tuple
+
+
+# Response timing buckets, in hours after the profile was created
+EARLY_RESPONSE_HOURS = 24
+LATE_RESPONSE_HOURS = 72
+
+# Insight counters and the RSVP status each one counts (RSVPs store yes/no/maybe)
+STATUS_COUNTERS = {
+    'confirmed': 'yes',
+    'declined': 'no',
+    'pending': 'maybe'
+}
+
+
+def _parse_datetime(value) -> datetime:
+    """Accept datetimes or ISO strings as stored in MongoDB"""
+    if value is None:
+        return datetime.now(timezone.utc)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _created_at_compare(operator: str, cutoff: datetime) -> dict:
+    """
+    Compare RSVP created_at against a cutoff in the aggregation pipeline
+
+    created_at is normally an ISO string in UTC (which sorts chronologically),
+    but native dates are handled too.
+    """
+    return {"$cond": [
+        {"$eq": [{"$type": "$created_at"}, "date"]},
+        {operator: ["$created_at", cutoff]},
+        {operator: ["$created_at", cutoff.isoformat()]}
+    ]}
+
+
+def _count_if(condition: dict) -> dict:
+    return {"$sum": {"$cond": [condition, 1, 0]}}
+
+
+def build_rsvp_stats_pipeline(profile_id: str, profile_created: datetime) -> list:
+    """Aggregation pipeline producing the insight statistics for one profile"""
+    early_cutoff = profile_created + timedelta(hours=EARLY_RESPONSE_HOURS)
+    late_cutoff = profile_created + timedelta(hours=LATE_RESPONSE_HOURS)
+
+    return [
+        {"$match": {"profile_id": profile_id}},
+        {"$group": {
+            "_id": None,
+            "total": {"$sum": 1},
+            **{
+                counter: _count_if({"$eq": ["$status", status]})
+                for counter, status in STATUS_COUNTERS.items()
+            },
+            "with_messages": _count_if({"$gt": [
+                {"$strLenCP": {"$trim": {"input": {"$ifNull": ["$message", ""]}}}},
+                0
+            ]}),
+            "early_responses": _count_if(_created_at_compare("$lte", early_cutoff)),
+            "late_responses": _count_if(_created_at_compare("$gt", late_cutoff))
+        }},
+        {"$project": {"_id": 0}}
+    ]
+
+
+def stats_fingerprint(stats: Dict[str, int]) -> str:
+    """Hash of the statistics the insight prompt is built from"""
+    raw = json.dumps(stats, sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+
+class GuestInsightsService:
+    """Aggregated RSVP statistics and fingerprint-cached AI insights"""
+
+    def __init__(self, db, ai_service):
+        self.db = db
+        self.cache_collection = db['guest_insights_cache']
+        self.ai_service = ai_service
+
+    async def ensure_indexes(self):
+        await self.cache_collection.create_index("profile_id", unique=True, name="profile_id_unique")
+
+    async def compute_stats(self, profile_id: str, profile_created_at) -> Dict[str, int]:
+        """Run the statistics pipeline; all counts are zero when there are no RSVPs"""
+        pipeline = build_rsvp_stats_pipeline(profile_id, _parse_datetime(profile_created_at))
+        results = await self.db.rsvps.aggregate(pipeline).to_list(length=1)
+
+        stats = {
+            'total': 0,
+            'confirmed': 0,
+            'declined': 0,
+            'pending': 0,
+            'early_responses': 0,
+            'late_responses': 0,
+            'with_messages': 0
+        }
+        if results:
+            stats.update(results[0])
+        return stats
+
+    async def get_insights(
+        self,
+        profile_id: str,
+        profile_created_at
+    ) -> Tuple[Dict[str, int], str, datetime, bool]:
+        """
+        Get statistics and insight text, calling the LLM only when stats changed
+
+        Returns:
+            (stats, insights_text, generated_at, cached)
+        """
+        stats = await self.compute_stats(profile_id, profile_created_at)
+        fingerprint = stats_fingerprint(stats)
+
+        cached = await self.cache_collection.find_one(
+            {"profile_id": profile_id, "fingerprint": fingerprint},
+            {"_id": 0, "insights_text": 1, "generated_at": 1}
+        )
+        if cached:
+            return stats, cached['insights_text'], _parse_datetime(cached['generated_at']), True
+
+        generated_at = datetime.now(timezone.utc)
+        try:
+            insights_text = await self.ai_service.generate_guest_insights(stats)
+        except Exception as e:
+            # Fallback insights are not cached, so the next request retries the LLM
+            logging.error(f"Guest insights generation error: {e}")
+            confirmed_rate = (stats['confirmed'] / max(stats['total'], 1)) * 100
+            insights_text = f"You have received {stats['total']} RSVPs so far, with {confirmed_rate:.0f}% confirming attendance."
+            return stats, insights_text, generated_at, False
+
+        await self.cache_collection.update_one(
+            {"profile_id": profile_id},
+            {"$set": {
+                "fingerprint": fingerprint,
+                "stats": stats,
+                "insights_text": insights_text,
+                "generated_at": generated_at.isoformat()
+            }},
+            upsert=True
+        )
+
+        return stats, insights_text, generated_at, False
@@ -0,0 +1,127 @@
+"""
+Live Feed Hub
+In-process pub/sub for pushing RSVP, greeting, wish and reaction changes
+to dashboards over Server-Sent Events
+
+Write paths publish small delta events to a topic (one per profile). Each
+event is serialized once and fanned out to every subscriber queue, so any
+number of viewers of a profile share the same published stream instead of
+each polling the database.
+
+The hub lives in one process: with several workers, a viewer only sees
+writes handled by its own worker, and reconnecting clients should refetch
+the full lists once before following the feed.
+"""
+
+import asyncio
+import itertools
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional, Set
+
+
+# Events buffered per subscriber before it is considered too slow
+LIVE_FEED_QUEUE_SIZE = 256
+# Comment line sent when idle so proxies keep the connection open
+LIVE_FEED_KEEPALIVE_SECONDS = 15
+
+
+def profile_topic(profile_id: str) -> str:
+    return f"profile:{profile_id}"
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class LiveFeedHub:
+    """Topic-based fan-out of pre-serialized SSE messages to asyncio queues"""
+
+    def __init__(self, queue_size: int = LIVE_FEED_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._sequence = itertools.count(1)
+        self.published = 0
+        self.dropped = 0
+
+    @asynccontextmanager
+    async def subscribe(self, topic: str) -> AsyncIterator[asyncio.Queue]:
+        """Register a subscriber queue for the duration of the context"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(topic, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    def publish(self, topic: str, event: str, data: dict):
+        """
+        Send an event to every subscriber of a topic (never blocks)
+
+        A subscriber whose queue is full has fallen behind: its backlog is
+        replaced by a single resync event telling the client to refetch.
+        """
+        subscribers = self._subscribers.get(topic)
+        if not subscribers:
+            return
+
+        message = self._format(event, data)
+        self.published += 1
+
+        for queue in subscribers:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self.dropped += queue.qsize()
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._format("resync", {}))
+
+    def _format(self, event: str, data: dict) -> str:
+        payload = json.dumps(data, default=_json_default, ensure_ascii=False)
+        return f"id: {next(self._sequence)}\nevent: {event}\ndata: {payload}\n\n"
+
+    async def stream(self, topic: str, is_disconnected) -> AsyncIterator[str]:
+        """
+        SSE body for one client: a ready event, then messages as published
+
+        Args:
+            topic: Topic to follow
+            is_disconnected: Awaitable callable (Request.is_disconnected)
+        """
+        async with self.subscribe(topic) as queue:
+            yield self._format("ready", {"topic": topic})
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=LIVE_FEED_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield message
+
+    def stats(self, topic: Optional[str] = None) -> dict:
+        if topic is not None:
+            return {"topic": topic, "subscribers": len(self._subscribers.get(topic, ()))}
+        return {
+            "topics": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self.published,
+            "dropped": self.dropped
+        }
+
+
+live_feed_hub = LiveFeedHub()
+
+
+def publish_profile_event(profile_id: str, event: str, data: dict):
+    """Publish a change on a profile's live feed"""
+    live_feed_hub.publish(profile_topic(profile_id), event, data)
@@ -764,6 +764,7 @@ class Profile(BaseModel):
     whatsapp_bride: Optional[str] = None  # Bride WhatsApp number in E.164 format
     enabled_languages: List[str] = Field(default=["english"])  # Languages enabled for this invitation
     custom_text: Dict[str, Dict[str, str]] = Field(default_factory=dict)  # Custom text overrides {language: {section: text}}
+    translations: Dict[str, Dict[str, str]] = Field(default_factory=dict)  # PHASE 26: Pre-translated content {language_code: {field_path: text}}
     about_couple: Optional[str] = None  # Rich text HTML for about couple section
     family_details: Optional[str] = None  # Rich text HTML for family details
     love_story: Optional[str] = None  # Rich text HTML for love story
@@ -1093,6 +1094,7 @@ class ProfileResponse(BaseModel):
     whatsapp_bride: Optional[str]
     enabled_languages: List[str]
     custom_text: Dict[str, Dict[str, str]]
+    translations: Dict[str, Dict[str, str]] = Field(default_factory=dict)  # PHASE 26: Pre-translated content
     about_couple: Optional[str]
     family_details: Optional[str]
     love_story: Optional[str]
@@ -1510,10 +1512,18 @@ class AuditLogResponse(BaseModel):
     admin_id: str
     profile_id: Optional[str] = None
     profile_slug: Optional[str] = None
+    resource_type: Optional[str] = None
+    resource_id: Optional[str] = None
     details: Optional[Dict] = None
     timestamp: datetime
 
 
+class AuditLogPage(BaseModel):
+    """One keyset page of audit logs (newest first)"""
+    items: List[AuditLogResponse]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page
+
+
 
 # ==================== PHASE 25: GUEST ENGAGEMENT ENGINE ====================
 
@@ -1528,6 +1538,7 @@ class GuestWish(BaseModel):
     message: str  # Wish message (max 200 characters)
     emoji: Optional[str] = None  # Optional emoji reaction (❤️, 🙏, 🎉)
     ip_address: str  # For spam protection
+    approval_status: Literal["pending", "approved", "rejected"] = "pending"
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     
     @field_validator('message')
@@ -1600,6 +1611,7 @@ class GuestWishResponse(BaseModel):
     guest_name: str
     message: str
     emoji: Optional[str]
+    approval_status: str = "pending"
     created_at: datetime
 
 
@@ -1760,6 +1772,7 @@ class GuestInsightsResponse(BaseModel):
     with_messages: int  # RSVPs with personal messages
     insights_text: str  # AI-generated insights
     generated_at: datetime
+    cached: bool = False  # True when served from the fingerprint cache
 
 
 class AIRateLimitStatus(BaseModel):
@@ -1948,9 +1961,10 @@ class QRCodeRequest(BaseModel):
 
 class QRCodeResponse(BaseModel):
     """PHASE 28: Response with QR code data"""
-    qr_code_base64: str  # Base64 encoded PNG image
+    qr_code_base64: str  # Base64 encoded PNG (or SVG) image
     download_filename: str  # Suggested filename for download
     url: str  # The URL encoded in the QR code
+    media_type: str = "image/png"  # image/png or image/svg+xml
 
 
 # ==================== PHASE 29E: ADMIN SAFETY NETS & RECOVERY ====================
@@ -1958,15 +1972,21 @@ class QRCodeResponse(BaseModel):
 class ProfileVersion(BaseModel):
     """PHASE 29E: Profile version history for rollback capability
     
-    Stores snapshots of profile data at key save points.
-    Maintains last 5 versions per profile for admin recovery.
+    Stores snapshots of profile data at key save points, as zlib-compressed
+    keyframes or diffs against a parent version (see profile_version_service).
+    Maintains the last 50 versions per profile for admin recovery.
     """
     model_config = ConfigDict(extra="ignore")
     
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     profile_id: str  # Reference to Profile
     version_number: int  # Sequential version number (1, 2, 3...)
-    snapshot_data: Dict[str, Any]  # Full profile data snapshot
+    snapshot_data: Optional[Dict[str, Any]] = None  # Full snapshot (versions saved before delta storage)
+    keyframe: int  # Version number of the keyframe this version's chain starts at
+    depth: int = 0  # Diffs to replay after the keyframe (0 = this is the keyframe)
+    parent_version: Optional[int] = None  # Version this diff applies to
+    legacy: bool = False  # Full snapshot renumbered from count-based numbering
+    stored_bytes: int = 0  # Compressed payload size
     admin_id: str  # Admin who created this version
     version_type: Literal["manual_save", "publish", "auto_save"]  # Type of save
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -2325,6 +2345,7 @@ class CreditTransactionType(str, Enum):
     ADMIN_GRANT = "admin_grant"
     ADMIN_DEDUCT = "admin_deduct"
     EXPIRED = "expired"
+    TEMPLATE_PURCHASE = "template_purchase"
 
 
 class CreditTransaction(BaseModel):
@@ -3116,3 +3137,92 @@ class CreditPricingConfiguration(BaseModel):
     features: List[FeaturePricing]
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+
+
+# ==========================================
+# BULK EXPORTS
+# ==========================================
+
+class BulkPDFExportRequest(BaseModel):
+    """Request to export invitation PDFs for several profiles/languages as a ZIP"""
+    profile_ids: List[str] = Field(..., min_length=1)
+    languages: Optional[List[str]] = None  # Defaults to every PDF language template
+
+
+# ==========================================
+# GUEST LIST IMPORT
+# ==========================================
+
+class Guest(BaseModel):
+    """Invited guest on a profile's guest list (imported from a spreadsheet)"""
+    model_config = ConfigDict(extra="ignore")
+    
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    profile_id: str
+    guest_name: str
+    guest_phone: str  # E.164, unique per profile
+    guest_count: int = 1
+    group: Optional[str] = None  # e.g. Bride's family, Office friends
+    source: str = "import"
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class GuestImportRowError(BaseModel):
+    """A spreadsheet row that was not imported"""
+    row: int  # 1-based spreadsheet row number (header is row 1)
+    guest_name: Optional[str] = None
+    guest_phone: Optional[str] = None
+    reason: str  # invalid, duplicate_in_file, already_invited, already_rsvped
+    detail: str
+
+
+class GuestImportResponse(BaseModel):
+    """Summary and per-row report of a guest list import"""
+    profile_id: str
+    total_rows: int
+    imported: int
+    skipped: int
+    errors: List[GuestImportRowError]
+
+
+# ==========================================
+# BULK MODERATION
+# ==========================================
+
+MAX_BULK_MODERATION_IDS = 500
+
+
+class GreetingPage(BaseModel):
+    """One keyset page of greetings (newest first)"""
+    items: List[GreetingResponse]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page
+
+
+class GuestWishPage(BaseModel):
+    """One keyset page of guest wishes (newest first)"""
+    items: List[GuestWishResponse]
+    next_cursor: Optional[str] = None
+
+
+class BulkModerationRequest(BaseModel):
+    """Approve, reject or delete many greetings/wishes of one profile"""
+    action: Literal["approve", "reject", "delete"]
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_MODERATION_IDS)
+    
+    @field_validator('ids')
+    def dedupe_ids(cls, v):
+        """Drop repeated IDs, keeping request order"""
+        return list(dict.fromkeys(v))
+
+
+class BulkModerationItemResult(BaseModel):
+    """Outcome for one ID of a bulk moderation request"""
+    id: str
+    result: Literal["updated", "deleted", "unchanged", "not_found"]
+
+
+class BulkModerationResponse(BaseModel):
+    action: str
+    requested: int
+    changed: int
+    results: List[BulkModerationItemResult]
@@ -0,0 +1,183 @@
+"""
+Greeting & Wish Moderation Service
+Keyset-paginated moderation queues and bulk approve/reject/delete
+
+Lists are ordered newest first by (created_at, id) and paged with an opaque
+cursor holding the last item's sort key, so every page is one index range
+scan no matter how deep the couple scrolls. Bulk actions read the current
+status of all requested IDs with one query, then apply every change with
+one unordered bulk_write and report a result per ID.
+"""
+
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import DeleteOne, UpdateOne
+
+
+MODERATION_PAGE_SIZE = 50
+MAX_MODERATION_PAGE_SIZE = 200
+
+ACTION_STATUSES = {"approve": "approved", "reject": "rejected"}
+
+# Status assumed for documents written before approval_status existed:
+# old greetings and wishes were all shown, so both count as approved
+MODERATION_KINDS = {
+    "greetings": {"collection": "greetings", "legacy_status": "approved"},
+    "wishes": {"collection": "guest_wishes", "legacy_status": "approved"}
+}
+
+
+def encode_cursor(item: dict, sort_field: str = 'created_at') -> str:
+    """Opaque keyset cursor from an item's (sort_field, id)"""
+    sort_value = item[sort_field]
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, item['id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """(sort value, id) of the last item of the previous page; ValueError if malformed"""
+    try:
+        sort_value, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(sort_value, str) or not isinstance(item_id, str):
+        raise ValueError("Invalid cursor")
+    return sort_value, item_id
+
+
+class ModerationService:
+    """Paged listing and bulk moderation of greetings and guest wishes"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def _collection(self, kind: str):
+        return self.db[MODERATION_KINDS[kind]["collection"]]
+
+    async def ensure_indexes(self):
+        for kind in MODERATION_KINDS:
+            collection = self._collection(kind)
+            await collection.create_index(
+                [("profile_id", 1), ("created_at", -1), ("id", -1)],
+                name="profile_id_created_at_id"
+            )
+            await collection.create_index(
+                [("profile_id", 1), ("approval_status", 1), ("created_at", -1), ("id", -1)],
+                name="profile_id_approval_status_created_at_id"
+            )
+
+    def _status_filter(self, kind: str, status: str):
+        if status == MODERATION_KINDS[kind]["legacy_status"]:
+            return {"$in": [status, None]}
+        return status
+
+    async def list_page(
+        self,
+        kind: str,
+        profile_id: str,
+        status: Optional[str] = None,
+        event_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = MODERATION_PAGE_SIZE
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        One page of items, newest first
+
+        Returns:
+            (items, next_cursor) - next_cursor is None on the last page
+        Raises:
+            ValueError: Malformed cursor
+        """
+        limit = max(1, min(limit, MAX_MODERATION_PAGE_SIZE))
+        query: Dict = {"profile_id": profile_id}
+        if status:
+            query["approval_status"] = self._status_filter(kind, status)
+        if event_id:
+            query["event_id"] = event_id
+        if cursor:
+            created_at, item_id = decode_cursor(cursor)
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "id": {"$lt": item_id}}
+            ]
+
+        # One extra item tells whether another page exists
+        items = await self._collection(kind).find(
+            query,
+            {"_id": 0, "ip_address": 0}
+        ).sort([("created_at", -1), ("id", -1)]).limit(limit + 1).to_list(limit + 1)
+
+        legacy_status = MODERATION_KINDS[kind]["legacy_status"]
+        for item in items:
+            item.setdefault('approval_status', legacy_status)
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1])
+        return items, next_cursor
+
+    async def bulk_moderate(
+        self,
+        kind: str,
+        profile_id: str,
+        ids: List[str],
+        action: str
+    ) -> Tuple[List[dict], List[dict]]:
+        """
+        Approve, reject or delete many items of one profile
+
+        IDs that don't belong to the profile are reported as not_found.
+        An item deleted by someone else between the status read and the
+        write is still reported as changed.
+
+        Returns:
+            (results, changed) - one {id, result} per requested ID, and the
+            changed items ({id, event_id}) for notifying viewers
+        """
+        collection = self._collection(kind)
+        legacy_status = MODERATION_KINDS[kind]["legacy_status"]
+        current = {
+            item['id']: item
+            async for item in collection.find(
+                {"profile_id": profile_id, "id": {"$in": ids}},
+                {"_id": 0, "id": 1, "event_id": 1, "approval_status": 1}
+            )
+        }
+
+        target_status = ACTION_STATUSES.get(action)
+        moderated_at = datetime.now(timezone.utc).isoformat()
+        operations = []
+        results = []
+        changed = []
+
+        for item_id in ids:
+            item = current.get(item_id)
+            if item is None:
+                results.append({"id": item_id, "result": "not_found"})
+                continue
+
+            item_filter = {"profile_id": profile_id, "id": item_id}
+            if action == "delete":
+                operations.append(DeleteOne(item_filter))
+                results.append({"id": item_id, "result": "deleted"})
+            elif item.get('approval_status', legacy_status) == target_status:
+                results.append({"id": item_id, "result": "unchanged"})
+                continue
+            else:
+                operations.append(UpdateOne(
+                    item_filter,
+                    {"$set": {"approval_status": target_status, "moderated_at": moderated_at}}
+                ))
+                results.append({"id": item_id, "result": "updated"})
+            changed.append({"id": item_id, "event_id": item.get('event_id')})
+
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+
+        return results, changed
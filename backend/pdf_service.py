@@ -0,0 +1,745 @@
+"""
+PDF Invitation Rendering Service
+Renders invitation PDFs with ReportLab, streams multi-language bundles as ZIP
+and lays out printable guest QR sheets
+
+This module is intentionally free of database and FastAPI imports so that
+render functions can run inside worker processes (ProcessPoolExecutor).
+"""
+
+import os
+import io
+import re
+import asyncio
+import logging
+import zipfile
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.lib import colors as rl_colors
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from PIL import Image as PILImage
+
+from qr_service import render_qr_batch
+
+
+# Design theme color mappings for PDF
+THEME_COLORS = {
+    'temple_divine': {'primary': (139, 115, 85), 'secondary': (212, 175, 55), 'text': (74, 55, 40), 'bg': (255, 248, 231)},
+    'royal_classic': {'primary': (139, 0, 0), 'secondary': (255, 215, 0), 'text': (74, 26, 26), 'bg': (255, 245, 230)},
+    'floral_soft': {'primary': (255, 182, 193), 'secondary': (255, 218, 185), 'text': (107, 78, 113), 'bg': (255, 240, 245)},
+    'cinematic_luxury': {'primary': (26, 26, 26), 'secondary': (212, 175, 55), 'text': (245, 245, 245), 'bg': (44, 44, 44)},
+    'heritage_scroll': {'primary': (139, 90, 43), 'secondary': (205, 133, 63), 'text': (74, 48, 23), 'bg': (250, 240, 230)},
+    'minimal_elegant': {'primary': (128, 128, 128), 'secondary': (169, 169, 169), 'text': (64, 64, 64), 'bg': (255, 255, 255)},
+    'modern_premium': {'primary': (47, 79, 79), 'secondary': (72, 209, 204), 'text': (245, 245, 245), 'bg': (32, 32, 32)},
+    'artistic_handcrafted': {'primary': (160, 82, 45), 'secondary': (210, 180, 140), 'text': (101, 67, 33), 'bg': (255, 250, 240)}
+}
+
+# Language templates for PDF
+LANGUAGE_TEMPLATES = {
+    'english': {
+        'opening_title': 'Wedding Invitation',
+        'couple_label': 'Join us in celebrating the union of',
+        'events_title': 'Event Schedule',
+        'date_label': 'Date',
+        'time_label': 'Time',
+        'venue_label': 'Venue',
+        'contact_title': 'Contact Information',
+        'groom_label': 'Groom',
+        'bride_label': 'Bride'
+    },
+    'telugu': {
+        'opening_title': 'వివాహ ఆహ్వానం',
+        'couple_label': 'మా వివాహ వేడుకలో పాల్గొనండి',
+        'events_title': 'కార్యక్రమ షెడ్యూల్',
+        'date_label': 'తేదీ',
+        'time_label': 'సమయం',
+        'venue_label': 'స్థలం',
+        'contact_title': 'సంప్రదించండి',
+        'groom_label': 'వరుడు',
+        'bride_label': 'వధువు'
+    },
+    'hindi': {
+        'opening_title': 'विवाह निमंत्रण',
+        'couple_label': 'हमारे विवाह समारोह में शामिल हों',
+        'events_title': 'कार्यक्रम कार्यक्रम',
+        'date_label': 'तारीख',
+        'time_label': 'समय',
+        'venue_label': 'स्थान',
+        'contact_title': 'संपर्क जानकारी',
+        'groom_label': 'वर',
+        'bride_label': 'वधू'
+    },
+    'tamil': {
+        'opening_title': 'திருமண அழைப்பிதழ்',
+        'couple_label': 'எங்கள் திருமண நிகழ்வில் சேரவும்',
+        'events_title': 'நிகழ்வு அட்டவணை',
+        'date_label': 'தேதி',
+        'time_label': 'நேரம்',
+        'venue_label': 'இடம்',
+        'contact_title': 'தொடர்பு தகவல்',
+        'groom_label': 'மணமகன்',
+        'bride_label': 'மணமகள்'
+    },
+    'kannada': {
+        'opening_title': 'ಮದುವೆ ಆಮಂತ್ರಣ',
+        'couple_label': 'ನಮ್ಮ ಮದುವೆ ಸಮಾರಂಭದಲ್ಲಿ ಸೇರಿ',
+        'events_title': 'ಕಾರ್ಯಕ್ರಮದ ವೇಳಾಪಟ್ಟಿ',
+        'date_label': 'ದಿನಾಂಕ',
+        'time_label': 'ಸಮಯ',
+        'venue_label': 'ಸ್ಥಳ',
+        'contact_title': 'ಸಂಪರ್ಕ ಮಾಹಿತಿ',
+        'groom_label': 'ವರ',
+        'bride_label': 'ವಧು'
+    },
+    'malayalam': {
+        'opening_title': 'വിവാഹ ക്ഷണം',
+        'couple_label': 'ഞങ്ങളുടെ വിവാഹ ചടങ്ങിൽ പങ്കെടുക്കൂ',
+        'events_title': 'പരിപാടി ഷെഡ്യൂൾ',
+        'date_label': 'തീയതി',
+        'time_label': 'സമയം',
+        'venue_label': 'സ്ഥലം',
+        'contact_title': 'ബന്ധപ്പെടുക',
+        'groom_label': 'വരൻ',
+        'bride_label': 'വധു'
+    }
+}
+
+# Map deity IDs to local file paths
+DEITY_BACKGROUND_PATHS = {
+    'ganesha': '/app/frontend/public/assets/deities/ganesha_desktop.jpg',
+    'venkateswara_padmavati': '/app/frontend/public/assets/deities/venkateswara_padmavati_desktop.jpg',
+    'shiva_parvati': '/app/frontend/public/assets/deities/shiva_parvati_desktop.jpg',
+    'lakshmi_vishnu': '/app/frontend/public/assets/deities/lakshmi_vishnu_desktop.jpg'
+}
+
+# Bulk export limits
+PDF_RENDER_WORKERS = int(os.environ.get('PDF_RENDER_WORKERS', os.cpu_count() or 2))
+MAX_BULK_PDF_PROFILES = 50
+
+_pdf_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_theme_colors(design_id: str):
+    """Get theme colors for PDF generation"""
+    return THEME_COLORS.get(design_id, THEME_COLORS['royal_classic'])
+
+
+def get_language_text(language: str):
+    """Get language-specific text for PDF"""
+    return LANGUAGE_TEMPLATES.get(language, LANGUAGE_TEMPLATES['english'])
+
+
+def rgb_to_reportlab_color(rgb_tuple):
+    """Convert RGB tuple to ReportLab color"""
+    r, g, b = rgb_tuple
+    return rl_colors.Color(r/255.0, g/255.0, b/255.0)
+
+
+def build_pdf_filename(profile: dict, language: Optional[str] = None) -> str:
+    """Build download filename from couple's first names"""
+    groom_name = re.sub(r'[^a-zA-Z]', '', profile['groom_name'].split()[0].lower())
+    bride_name = re.sub(r'[^a-zA-Z]', '', profile['bride_name'].split()[0].lower())
+    if language:
+        return f"wedding-invitation-{groom_name}-{bride_name}-{language}.pdf"
+    return f"wedding-invitation-{groom_name}-{bride_name}.pdf"
+
+
+# ==================== RENDER CONTEXT REGISTRY ====================
+
+# Noto font files for Indic scripts, looked up in PDF_FONT_DIRS
+INDIC_FONT_FILES = {
+    'telugu': ('NotoSansTelugu-Regular.ttf', 'NotoSansTelugu-Bold.ttf'),
+    'hindi': ('NotoSansDevanagari-Regular.ttf', 'NotoSansDevanagari-Bold.ttf'),
+    'tamil': ('NotoSansTamil-Regular.ttf', 'NotoSansTamil-Bold.ttf'),
+    'kannada': ('NotoSansKannada-Regular.ttf', 'NotoSansKannada-Bold.ttf'),
+    'malayalam': ('NotoSansMalayalam-Regular.ttf', 'NotoSansMalayalam-Bold.ttf')
+}
+
+PDF_FONT_DIRS = [
+    os.environ.get('PDF_FONT_DIR', '/app/backend/fonts'),
+    '/usr/share/fonts/truetype/noto',
+    '/usr/share/fonts/opentype/noto'
+]
+
+# Deity backgrounds are downscaled to this width once and reused
+DEITY_BACKGROUND_MAX_WIDTH = 800
+
+_render_contexts: Dict[Tuple[str, str], 'PDFRenderContext'] = {}
+_script_fonts: Dict[str, Optional[str]] = {}
+_deity_backgrounds: Dict[str, Optional[Tuple[ImageReader, int, int]]] = {}
+
+
+def _find_font_file(filename: str) -> Optional[str]:
+    """Return the first existing path for a font file in PDF_FONT_DIRS"""
+    for font_dir in PDF_FONT_DIRS:
+        path = os.path.join(font_dir, filename)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def get_script_font(language: str) -> Optional[str]:
+    """
+    Register (once) and return the font family name for a language's script
+
+    Returns None when the language uses Latin script or no font file is installed,
+    in which case the built-in Helvetica fonts are used.
+    """
+    if language in _script_fonts:
+        return _script_fonts[language]
+
+    font_name = None
+    font_files = INDIC_FONT_FILES.get(language)
+    if font_files:
+        regular_path = _find_font_file(font_files[0])
+        if regular_path:
+            try:
+                font_name = f"Indic-{language}"
+                pdfmetrics.registerFont(TTFont(font_name, regular_path))
+
+                bold_name = font_name
+                bold_path = _find_font_file(font_files[1])
+                if bold_path:
+                    bold_name = f"{font_name}-Bold"
+                    pdfmetrics.registerFont(TTFont(bold_name, bold_path))
+
+                pdfmetrics.registerFontFamily(
+                    font_name,
+                    normal=font_name,
+                    bold=bold_name,
+                    italic=font_name,
+                    boldItalic=bold_name
+                )
+            except Exception as e:
+                logging.warning(f"Failed to register PDF font for {language}: {e}")
+                font_name = None
+        else:
+            logging.warning(f"No PDF font installed for {language}, falling back to Helvetica")
+
+    _script_fonts[language] = font_name
+    return font_name
+
+
+def get_deity_background(deity_id: str) -> Optional[Tuple[ImageReader, int, int]]:
+    """
+    Load, downscale and JPEG-compress a deity background once
+
+    Returns:
+        (ImageReader, width, height) or None if the image is unavailable
+    """
+    if deity_id in _deity_backgrounds:
+        return _deity_backgrounds[deity_id]
+
+    background = None
+    deity_bg_path = DEITY_BACKGROUND_PATHS.get(deity_id)
+    if deity_bg_path and os.path.exists(deity_bg_path):
+        try:
+            img = PILImage.open(deity_bg_path)
+
+            # Resize to optimize file size
+            if img.width > DEITY_BACKGROUND_MAX_WIDTH:
+                ratio = DEITY_BACKGROUND_MAX_WIDTH / img.width
+                new_height = int(img.height * ratio)
+                img = img.resize((DEITY_BACKGROUND_MAX_WIDTH, new_height), PILImage.Resampling.LANCZOS)
+
+            # Convert to RGB if needed
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+
+            # Keep the compressed JPEG so every PDF embeds the small version
+            img_buffer = io.BytesIO()
+            img.save(img_buffer, format='JPEG', quality=70, optimize=True)
+            img_buffer.seek(0)
+
+            background = (ImageReader(img_buffer), img.width, img.height)
+        except Exception as e:
+            # If deity image fails, render without it
+            logging.warning(f"Failed to load deity background {deity_id}: {e}")
+
+    _deity_backgrounds[deity_id] = background
+    return background
+
+
+class PDFRenderContext:
+    """
+    Pre-built colors, paragraph styles and labels for one design/language pair
+
+    Contexts are immutable once built and shared by every render in the process.
+    """
+
+    def __init__(self, design_id: str, language: str):
+        self.design_id = design_id
+        self.language = language
+
+        theme = get_theme_colors(design_id)
+        self.primary_color = rgb_to_reportlab_color(theme['primary'])
+        self.secondary_color = rgb_to_reportlab_color(theme['secondary'])
+        self.text_color = rgb_to_reportlab_color(theme['text'])
+
+        # Localized labels use the script font; couple/venue content stays in Helvetica
+        script_font = get_script_font(language)
+        self.labels = {}
+        for key, text in get_language_text(language).items():
+            self.labels[key] = f'<font name="{script_font}">{text}</font>' if script_font else text
+
+        styles = getSampleStyleSheet()
+
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=28,
+            textColor=self.primary_color,
+            spaceAfter=20,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        )
+
+        self.heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=18,
+            textColor=self.secondary_color,
+            spaceAfter=12,
+            spaceBefore=20,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        )
+
+        subheading_style = ParagraphStyle(
+            'CustomSubHeading',
+            parent=styles['Heading3'],
+            fontSize=14,
+            textColor=self.primary_color,
+            spaceAfter=8,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        )
+
+        self.event_name_style = ParagraphStyle(
+            'EventName',
+            parent=subheading_style,
+            fontSize=14,
+            textColor=self.primary_color,
+            alignment=TA_LEFT
+        )
+
+        self.body_style = ParagraphStyle(
+            'CustomBody',
+            parent=styles['Normal'],
+            fontSize=11,
+            textColor=self.text_color,
+            spaceAfter=6,
+            alignment=TA_LEFT,
+            fontName='Helvetica'
+        )
+
+        self.center_body_style = ParagraphStyle(
+            'CustomCenterBody',
+            parent=self.body_style,
+            alignment=TA_CENTER
+        )
+
+
+def get_render_context(design_id: str, language: str) -> PDFRenderContext:
+    """Get (building on first use) the render context for a design/language pair"""
+    if design_id not in THEME_COLORS:
+        design_id = 'royal_classic'
+    if language not in LANGUAGE_TEMPLATES:
+        language = 'english'
+
+    key = (design_id, language)
+    context = _render_contexts.get(key)
+    if context is None:
+        context = PDFRenderContext(design_id, language)
+        _render_contexts[key] = context
+    return context
+
+
+def warm_render_contexts():
+    """Build every render context and decode every deity background up front"""
+    for design_id in THEME_COLORS:
+        for language in LANGUAGE_TEMPLATES:
+            get_render_context(design_id, language)
+    for deity_id in DEITY_BACKGROUND_PATHS:
+        get_deity_background(deity_id)
+
+
+def clear_render_contexts():
+    """Drop cached contexts and images (used by the render benchmark)"""
+    _render_contexts.clear()
+    _deity_backgrounds.clear()
+
+
+def render_invitation_pdf(profile: dict, language: str = 'english') -> bytes:
+    """
+    Render PDF invitation from profile data
+
+    Synchronous and picklable so it can be dispatched to worker processes.
+    Styles, fonts and deity images come from the shared render context,
+    so each call only lays out the profile's text.
+
+    Returns:
+        PDF file content as bytes
+    """
+    buffer = io.BytesIO()
+
+    context = get_render_context(profile.get('design_id', 'royal_classic'), language)
+    labels = context.labels
+    body_style = context.body_style
+    heading_style = context.heading_style
+
+    # Get deity background if present
+    deity_id = profile.get('deity_id')
+    deity_background = None
+    if deity_id and deity_id != 'none':
+        deity_background = get_deity_background(deity_id)
+
+    # Create PDF document
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=0.75*inch,
+        leftMargin=0.75*inch,
+        topMargin=0.75*inch,
+        bottomMargin=0.75*inch
+    )
+
+    # Container for PDF elements
+    story = []
+
+    # Add title
+    story.append(Paragraph(labels['opening_title'], context.title_style))
+    story.append(Spacer(1, 0.3*inch))
+
+    # Add couple names
+    story.append(Paragraph(labels['couple_label'], context.center_body_style))
+    story.append(Spacer(1, 0.2*inch))
+
+    couple_text = f"<b>{profile['groom_name']}</b> & <b>{profile['bride_name']}</b>"
+    story.append(Paragraph(couple_text, heading_style))
+    story.append(Spacer(1, 0.4*inch))
+
+    # Add events section
+    events = profile.get('events', [])
+    visible_events = [e for e in events if e.get('visible', True)]
+
+    if visible_events:
+        story.append(Paragraph(labels['events_title'], heading_style))
+        story.append(Spacer(1, 0.2*inch))
+
+        # Sort events by date
+        sorted_events = sorted(visible_events, key=lambda x: x.get('date', ''))
+
+        for event in sorted_events:
+            # Event name
+            story.append(Paragraph(f"<b>{event['name']}</b>", context.event_name_style))
+            story.append(Spacer(1, 0.1*inch))
+
+            # Event details
+            date_str = event.get('date', '')
+            time_str = event.get('start_time', '')
+            if event.get('end_time'):
+                time_str += f" - {event['end_time']}"
+
+            story.append(Paragraph(f"<b>{labels['date_label']}:</b> {date_str}", body_style))
+            story.append(Paragraph(f"<b>{labels['time_label']}:</b> {time_str}", body_style))
+            story.append(Paragraph(f"<b>{labels['venue_label']}:</b> {event.get('venue_name', '')}", body_style))
+            story.append(Paragraph(f"{event.get('venue_address', '')}", body_style))
+
+            if event.get('description'):
+                story.append(Spacer(1, 0.05*inch))
+                story.append(Paragraph(event['description'], body_style))
+
+            story.append(Spacer(1, 0.25*inch))
+
+    # Add contact information
+    if profile.get('whatsapp_groom') or profile.get('whatsapp_bride'):
+        story.append(Spacer(1, 0.3*inch))
+        story.append(Paragraph(labels['contact_title'], heading_style))
+        story.append(Spacer(1, 0.15*inch))
+
+        if profile.get('whatsapp_groom'):
+            story.append(Paragraph(
+                f"<b>{labels['groom_label']}:</b> {profile['whatsapp_groom']}",
+                body_style
+            ))
+
+        if profile.get('whatsapp_bride'):
+            story.append(Paragraph(
+                f"<b>{labels['bride_label']}:</b> {profile['whatsapp_bride']}",
+                body_style
+            ))
+
+    # Build PDF with deity background if present
+    if deity_background:
+        img_reader, img_width, img_height = deity_background
+
+        # Scale to fit page while maintaining aspect ratio, centered
+        page_width, page_height = A4
+        scale = min(page_width / img_width, page_height / img_height)
+        scaled_width = img_width * scale
+        scaled_height = img_height * scale
+        x = (page_width - scaled_width) / 2
+        y = (page_height - scaled_height) / 2
+
+        def add_deity_background(canvas_obj, doc_obj):
+            """Add deity background with very light opacity"""
+            canvas_obj.saveState()
+            try:
+                # Draw with very light opacity (0.12)
+                canvas_obj.setFillAlpha(0.12)
+                canvas_obj.drawImage(
+                    img_reader,
+                    x, y,
+                    width=scaled_width,
+                    height=scaled_height,
+                    preserveAspectRatio=True,
+                    mask='auto'
+                )
+            except Exception as e:
+                # If deity image fails, continue without it
+                logging.warning(f"Failed to add deity background: {e}")
+            finally:
+                canvas_obj.restoreState()
+
+        doc.build(story, onFirstPage=add_deity_background, onLaterPages=add_deity_background)
+    else:
+        doc.build(story)
+
+    return buffer.getvalue()
+
+
+# ==================== BULK EXPORT (STREAMED ZIP) ====================
+
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """
+    Get shared process pool for PDF rendering
+
+    Uses the 'spawn' start method so workers never inherit the server's
+    event loop or MongoDB client sockets. Each worker warms its render
+    contexts once on start-up.
+    """
+    global _pdf_executor
+    if _pdf_executor is None:
+        _pdf_executor = ProcessPoolExecutor(
+            max_workers=PDF_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=warm_render_contexts
+        )
+    return _pdf_executor
+
+
+def shutdown_pdf_executor():
+    """Shut down PDF worker processes (called on app shutdown)"""
+    global _pdf_executor
+    if _pdf_executor is not None:
+        _pdf_executor.shutdown(wait=False, cancel_futures=True)
+        _pdf_executor = None
+
+
+class _ZipChunkBuffer(io.RawIOBase):
+    """
+    Write-only, non-seekable sink for zipfile
+
+    zipfile falls back to data descriptors when the target cannot seek,
+    so each finished entry can be drained and sent to the client immediately.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        """Return and clear everything written since the last drain"""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+async def stream_invitation_pdf_zip(
+    jobs: List[Tuple[str, dict, str]]
+) -> AsyncIterator[bytes]:
+    """
+    Render PDFs in parallel worker processes and stream them as a ZIP archive
+
+    At most 2 x PDF_RENDER_WORKERS renders are in flight, so memory stays
+    bounded regardless of how many profile/language combinations are requested.
+    Entries are written in completion order.
+
+    Args:
+        jobs: List of (archive_path, profile, language) tuples
+
+    Yields:
+        ZIP archive byte chunks
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_pdf_executor()
+    max_in_flight = PDF_RENDER_WORKERS * 2
+
+    sink = _ZipChunkBuffer()
+    archive = zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_STORED)
+
+    pending: Dict[asyncio.Future, str] = {}
+    job_iter = iter(jobs)
+    failed = []
+
+    def submit_next() -> bool:
+        job = next(job_iter, None)
+        if job is None:
+            return False
+        arcname, profile, language = job
+        future = loop.run_in_executor(executor, render_invitation_pdf, profile, language)
+        pending[future] = arcname
+        return True
+
+    try:
+        while len(pending) < max_in_flight and submit_next():
+            pass
+
+        while pending:
+            done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                arcname = pending.pop(future)
+                try:
+                    pdf_bytes = future.result()
+                except Exception as e:
+                    logging.error(f"Bulk PDF render failed for {arcname}: {e}")
+                    failed.append(arcname)
+                    continue
+
+                info = zipfile.ZipInfo(arcname, date_time=datetime.now().timetuple()[:6])
+                archive.writestr(info, pdf_bytes)
+                yield sink.drain()
+
+            while len(pending) < max_in_flight and submit_next():
+                pass
+
+        if failed:
+            info = zipfile.ZipInfo('errors.txt', date_time=datetime.now().timetuple()[:6])
+            archive.writestr(info, "Failed to render:\n" + "\n".join(failed) + "\n")
+
+        archive.close()
+        yield sink.drain()
+    finally:
+        # Client disconnected or error: don't keep rendering for nobody
+        for future in pending:
+            future.cancel()
+
+
+# ==================== GUEST QR SHEETS ====================
+
+# 3 x 4 grid of cards per A4 page
+GUEST_QR_COLUMNS = 3
+GUEST_QR_ROWS = 4
+GUEST_QR_PER_PAGE = GUEST_QR_COLUMNS * GUEST_QR_ROWS
+# Guests per worker task (several pages, to amortise process hand-off)
+GUEST_QR_CHUNK_SIZE = GUEST_QR_PER_PAGE * 4
+MAX_GUEST_QR_SHEET_GUESTS = 3000
+
+
+def build_guest_qr_sheet_pdf(title: str, guests: List[Tuple[str, bytes]]) -> bytes:
+    """
+    Lay out pre-rendered guest QR codes into a print-ready multi-page PDF
+
+    Args:
+        title: Header printed at the top of every page (couple names)
+        guests: List of (guest_name, qr_png_bytes)
+
+    Returns:
+        PDF file content as bytes
+    """
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    pdf.setTitle(title)
+
+    page_width, page_height = A4
+    margin = 0.5*inch
+    header_height = 0.5*inch
+    cell_width = (page_width - 2*margin) / GUEST_QR_COLUMNS
+    cell_height = (page_height - 2*margin - header_height) / GUEST_QR_ROWS
+    qr_size = min(cell_width, cell_height) - 0.55*inch
+
+    for page_start in range(0, len(guests), GUEST_QR_PER_PAGE):
+        page_guests = guests[page_start:page_start + GUEST_QR_PER_PAGE]
+
+        pdf.setFont('Helvetica-Bold', 14)
+        pdf.drawCentredString(page_width / 2, page_height - margin - 0.3*inch, title)
+
+        for index, (guest_name, qr_png) in enumerate(page_guests):
+            row, column = divmod(index, GUEST_QR_COLUMNS)
+            cell_x = margin + column * cell_width
+            cell_top = page_height - margin - header_height - row * cell_height
+
+            # Light cut guide around each card
+            pdf.setStrokeColor(rl_colors.lightgrey)
+            pdf.setDash(2, 3)
+            pdf.rect(cell_x, cell_top - cell_height, cell_width, cell_height)
+            pdf.setDash()
+
+            qr_x = cell_x + (cell_width - qr_size) / 2
+            qr_y = cell_top - 0.15*inch - qr_size
+            pdf.drawImage(ImageReader(io.BytesIO(qr_png)), qr_x, qr_y, width=qr_size, height=qr_size)
+
+            pdf.setFont('Helvetica', 10)
+            pdf.drawCentredString(cell_x + cell_width / 2, qr_y - 0.2*inch, guest_name[:40])
+
+        pdf.showPage()
+
+    pdf.save()
+    return buffer.getvalue()
+
+
+async def generate_guest_qr_sheet(title: str, guests: List[Tuple[str, str]]) -> bytes:
+    """
+    Render per-guest QR codes in worker processes and assemble them into one PDF
+
+    Args:
+        title: Header printed on every page
+        guests: List of (guest_name, guest_url)
+
+    Returns:
+        PDF file content as bytes
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_pdf_executor()
+
+    chunks = [
+        guests[start:start + GUEST_QR_CHUNK_SIZE]
+        for start in range(0, len(guests), GUEST_QR_CHUNK_SIZE)
+    ]
+    rendered_chunks = await asyncio.gather(*[
+        loop.run_in_executor(executor, render_qr_batch, [url for _, url in chunk])
+        for chunk in chunks
+    ])
+
+    rendered_guests = []
+    for chunk, images in zip(chunks, rendered_chunks):
+        rendered_guests.extend((name, image) for (name, _), image in zip(chunk, images))
+
+    # Page layout is cheap relative to QR encoding; keep it off the event loop
+    return await loop.run_in_executor(None, build_guest_qr_sheet_pdf, title, rendered_guests)
@@ -0,0 +1,191 @@
+"""
+PHASE 26: Publish-Time Pre-Translation Service
+Translates every translatable profile field into each enabled language once,
+so guests never wait on the LLM when switching languages.
+
+Segments already in the translation cache are reused; the rest are sent in
+batched prompts (several segments per call) with bounded concurrency.
+Results are stored on the profile under `translations`:
+    {language_code: {field_path: translated_text}}
+Segments that come back unchanged (AI unavailable or the call failed) are
+left out of both, so a later run translates them.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from ai_service import SUPPORTED_LANGUAGES
+
+
+# Profile languages use names, the AI service uses codes
+PROFILE_LANGUAGE_CODES = {
+    "english": "en",
+    "telugu": "te",
+    "hindi": "hi",
+    "tamil": "ta"
+}
+
+# Segments per LLM prompt and total characters per prompt
+PRETRANSLATION_BATCH_SIZE = 8
+PRETRANSLATION_BATCH_CHARS = 4000
+# Concurrent LLM calls per profile
+PRETRANSLATION_CONCURRENCY = 3
+
+PROFILE_TRANSLATABLE_FIELDS = ("invitation_message", "about_couple", "love_story")
+
+
+def collect_translatable_segments(profile: dict) -> Dict[str, str]:
+    """
+    Collect every translatable field of a profile
+
+    Returns:
+        {field_path: text}, e.g. "about_couple", "events.<event_id>.description",
+        "custom_text.<section>" (English custom text is the source)
+    """
+    segments = {}
+
+    for field in PROFILE_TRANSLATABLE_FIELDS:
+        text = profile.get(field)
+        if text and text.strip():
+            segments[field] = text
+
+    for event in profile.get('events', []):
+        description = event.get('description')
+        if event.get('event_id') and description and description.strip():
+            segments[f"events.{event['event_id']}.description"] = description
+
+    for section, text in (profile.get('custom_text') or {}).get('english', {}).items():
+        if text and text.strip():
+            segments[f"custom_text.{section}"] = text
+
+    return segments
+
+
+def _build_batches(items: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+    """Group (field_path, text) pairs into prompts bounded by count and size"""
+    batches = []
+    current = []
+    current_chars = 0
+
+    for item in items:
+        text_length = len(item[1])
+        if current and (len(current) >= PRETRANSLATION_BATCH_SIZE or current_chars + text_length > PRETRANSLATION_BATCH_CHARS):
+            batches.append(current)
+            current = []
+            current_chars = 0
+        current.append(item)
+        current_chars += text_length
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+class PretranslationService:
+    """Batched, bounded-concurrency translation of whole profiles"""
+
+    def __init__(self, db, ai_service, translation_cache):
+        self.profiles_collection = db['profiles']
+        self.ai_service = ai_service
+        self.translation_cache = translation_cache
+
+    async def _translate_language(
+        self,
+        segments: Dict[str, str],
+        language_code: str,
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, str]:
+        """Translate all segments into one language, reusing cached translations"""
+        translated = {}
+        missing = []
+
+        for field_path, text in segments.items():
+            cached = await self.translation_cache.get(text, language_code)
+            if cached is not None:
+                translated[field_path] = cached
+            else:
+                missing.append((field_path, text))
+
+        async def run_batch(batch: List[Tuple[str, str]]):
+            async with semaphore:
+                results = await self.ai_service.translate_batch(
+                    [text for _, text in batch],
+                    language_code
+                )
+            for (field_path, text), result in zip(batch, results):
+                # translate_batch hands the source back when AI is disabled,
+                # the circuit is open or the call failed: neither cache nor
+                # store that, so the next run retries the segment
+                if not result or result.strip() == text.strip():
+                    untranslated.append(field_path)
+                    continue
+                translated[field_path] = result
+                await self.translation_cache.set(text, language_code, result)
+
+        untranslated = []
+        await asyncio.gather(*[run_batch(batch) for batch in _build_batches(missing)])
+        if untranslated:
+            logging.warning(f"{len(untranslated)} segments left untranslated into {language_code}: {untranslated}")
+        return translated
+
+    async def pretranslate_profile(self, profile_id: str) -> Dict[str, int]:
+        """
+        Pre-translate a profile into all of its enabled languages
+
+        Returns:
+            {language_code: number of translated segments}
+        """
+        profile = await self.profiles_collection.find_one(
+            {"id": profile_id},
+            {
+                "_id": 0,
+                "enabled_languages": 1,
+                "invitation_message": 1,
+                "about_couple": 1,
+                "love_story": 1,
+                "custom_text": 1,
+                "events.event_id": 1,
+                "events.description": 1
+            }
+        )
+        if not profile:
+            raise ValueError(f"Profile {profile_id} not found")
+
+        language_codes = [
+            PROFILE_LANGUAGE_CODES[language]
+            for language in profile.get('enabled_languages', [])
+            if PROFILE_LANGUAGE_CODES.get(language) not in (None, "en")
+            and PROFILE_LANGUAGE_CODES[language] in SUPPORTED_LANGUAGES
+        ]
+
+        segments = collect_translatable_segments(profile)
+        if not segments or not language_codes:
+            return {}
+
+        # One semaphore across languages bounds total in-flight LLM calls
+        semaphore = asyncio.Semaphore(PRETRANSLATION_CONCURRENCY)
+        results = await asyncio.gather(*[
+            self._translate_language(segments, code, semaphore)
+            for code in language_codes
+        ])
+        translations = dict(zip(language_codes, results))
+
+        await self.profiles_collection.update_one(
+            {"id": profile_id},
+            {"$set": {
+                "translations": translations,
+                "translations_updated_at": datetime.now(timezone.utc).isoformat()
+            }}
+        )
+
+        return {code: len(fields) for code, fields in translations.items()}
+
+    async def pretranslate_profile_safely(self, profile_id: str):
+        """Background-task entry point: never raises"""
+        try:
+            counts = await self.pretranslate_profile(profile_id)
+            logging.info(f"Pre-translated profile {profile_id}: {counts}")
+        except Exception as e:
+            logging.error(f"Pre-translation failed for profile {profile_id}: {e}")
@@ -0,0 +1,286 @@
+"""
+Profile Version History
+Delta-compressed profile snapshots with periodic keyframes
+
+Each saved version stores either a full snapshot (a keyframe) or a
+structural diff against its parent version, zlib-compressed. Versions are
+grouped in chains: a keyframe followed by up to PROFILE_VERSION_KEYFRAME_INTERVAL
+- 1 deltas. Restoring any version reads its chain with one query and replays
+the diffs from the keyframe, so restore cost is bounded by the interval no
+matter how long the history is.
+
+Version numbers come from an atomic $inc on the profile's version_counter,
+which also returns the snapshot being saved in the same operation. Each
+delta names its parent, so concurrent saves still replay correctly.
+
+Payloads are BSON-encoded before compression so dates and other BSON
+types round-trip exactly. Versions saved before this format existed
+(with a plain snapshot_data field) are renumbered 1..n by creation time,
+since the old count-based numbering repeated numbers, and read as
+keyframes. The first save after them starts a new chain.
+"""
+
+import logging
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import bson
+from bson.binary import Binary
+from pymongo import ReturnDocument, UpdateOne
+
+from models import ProfileVersion
+
+
+PROFILE_VERSION_KEYFRAME_INTERVAL = 10
+# Versions kept per profile (older chains are pruned whole)
+MAX_PROFILE_VERSIONS = 50
+PROFILE_VERSION_COMPRESSION_LEVEL = 6
+
+# Profile bookkeeping that is not part of a snapshot
+VERSION_COUNTER_FIELD = "version_counter"
+
+
+def diff_values(old: Any, new: Any) -> Dict:
+    """
+    Structural diff turning old into new
+
+    Dicts diff per key, lists per index (plus appended items and the new
+    length); anything else is replaced whole.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        patch: Dict[str, Any] = {"t": "d"}
+        replaced = {k: v for k, v in new.items() if k not in old}
+        nested = {k: diff_values(old[k], v) for k, v in new.items() if k in old and old[k] != v}
+        removed = [k for k in old if k not in new]
+        if replaced:
+            patch["s"] = replaced
+        if nested:
+            patch["c"] = nested
+        if removed:
+            patch["r"] = removed
+        return patch
+
+    if isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        patch = {"t": "l", "n": len(new)}
+        changed = {str(i): diff_values(old[i], new[i]) for i in range(common) if old[i] != new[i]}
+        if changed:
+            patch["c"] = changed
+        if len(new) > common:
+            patch["a"] = new[common:]
+        return patch
+
+    return {"t": "v", "v": new}
+
+
+def apply_diff(old: Any, patch: Dict) -> Any:
+    """Rebuild the new value from the old one and its diff"""
+    kind = patch["t"]
+    if kind == "v":
+        return patch["v"]
+
+    if kind == "d":
+        result = {k: v for k, v in old.items() if k not in patch.get("r", ())}
+        for key, child in patch.get("c", {}).items():
+            result[key] = apply_diff(old[key], child)
+        result.update(patch.get("s", {}))
+        return result
+
+    result = old[:patch["n"]]
+    for index, child in patch.get("c", {}).items():
+        result[int(index)] = apply_diff(old[int(index)], child)
+    result.extend(patch.get("a", []))
+    return result
+
+
+def _pack(value: Dict) -> Binary:
+    return Binary(zlib.compress(bson.encode(value), PROFILE_VERSION_COMPRESSION_LEVEL))
+
+
+def _unpack(payload: bytes) -> Dict:
+    return bson.decode(zlib.decompress(payload))
+
+
+class ProfileVersionService:
+    """Saves, lists, reconstructs and prunes delta-compressed profile versions"""
+
+    def __init__(self, db):
+        self.profiles = db['profiles']
+        self.collection = db['profile_versions']
+
+    async def ensure_indexes(self):
+        # Not unique: legacy versions (count-based numbering could repeat
+        # numbers) are only renumbered by the migration below
+        await self.collection.create_index(
+            [("profile_id", 1), ("version_number", -1)],
+            name="profile_id_version_number"
+        )
+        await self.collection.create_index(
+            [("profile_id", 1), ("keyframe", 1)],
+            name="profile_id_keyframe"
+        )
+        await self._migrate_legacy_versions()
+
+    async def _migrate_legacy_versions(self):
+        """
+        Renumber full-snapshot versions from before delta storage 1..n per
+        profile in creation order, make each a keyframe, and start the
+        profile's counter after them
+        """
+        legacy = defaultdict(list)
+        async for version in self.collection.find(
+            {"snapshot_data": {"$exists": True}, "legacy": {"$ne": True}},
+            {"_id": 1, "profile_id": 1, "created_at": 1}
+        ):
+            legacy[version['profile_id']].append(version)
+
+        if not legacy:
+            return
+
+        renumber = []
+        for versions in legacy.values():
+            # created_at may be an ISO string or a datetime; _id breaks ties
+            versions.sort(key=lambda version: (str(version.get('created_at')), version['_id']))
+            for number, version in enumerate(versions, start=1):
+                renumber.append(UpdateOne({"_id": version['_id']}, {"$set": {
+                    "version_number": number,
+                    "keyframe": number,
+                    "depth": 0,
+                    "parent_version": None,
+                    "legacy": True
+                }}))
+        await self.collection.bulk_write(renumber, ordered=False)
+
+        await self.profiles.bulk_write([
+            UpdateOne({"id": profile_id}, {"$max": {VERSION_COUNTER_FIELD: len(versions)}})
+            for profile_id, versions in legacy.items()
+        ], ordered=False)
+
+    async def _load_state(self, version: dict) -> Dict:
+        """Full profile state of a version (one query for its chain)"""
+        if 'snapshot_data' in version:
+            return version['snapshot_data']
+        if version['depth'] == 0:
+            return _unpack(version['payload'])
+
+        chain = {
+            member['version_number']: member
+            async for member in self.collection.find(
+                {
+                    "profile_id": version['profile_id'],
+                    "keyframe": version['keyframe'],
+                    "version_number": {"$lte": version['version_number']}
+                },
+                {"_id": 0, "version_number": 1, "parent_version": 1, "depth": 1, "payload": 1, "snapshot_data": 1}
+            )
+        }
+
+        # Walk parents back to the keyframe, then replay diffs forwards
+        path = []
+        member = chain[version['version_number']]
+        while member['depth'] > 0:
+            path.append(member)
+            member = chain[member['parent_version']]
+        state = member['snapshot_data'] if 'snapshot_data' in member else _unpack(member['payload'])
+        for delta in reversed(path):
+            state = apply_diff(state, _unpack(delta['payload']))
+        return state
+
+    async def save(self, profile_id: str, admin_id: str, version_type: str = "manual_save") -> Optional[dict]:
+        """
+        Save the profile's current state as a new version
+
+        Returns:
+            The stored version metadata, or None if the profile doesn't exist
+        """
+        # Allocating the number and reading the snapshot is one atomic step
+        profile = await self.profiles.find_one_and_update(
+            {"id": profile_id},
+            {"$inc": {VERSION_COUNTER_FIELD: 1}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+        if not profile:
+            return None
+        version_number = profile.pop(VERSION_COUNTER_FIELD)
+
+        parent = await self.collection.find_one(
+            {"profile_id": profile_id, "version_number": {"$lt": version_number}},
+            {"_id": 0},
+            sort=[("version_number", -1)]
+        )
+
+        # Legacy parents start a fresh chain rather than being diffed against
+        if parent is None or parent.get('legacy') or parent['depth'] + 1 >= PROFILE_VERSION_KEYFRAME_INTERVAL:
+            payload = _pack(profile)
+            chain = {"keyframe": version_number, "depth": 0, "parent_version": None}
+        else:
+            payload = _pack(diff_values(await self._load_state(parent), profile))
+            chain = {
+                "keyframe": parent['keyframe'],
+                "depth": parent['depth'] + 1,
+                "parent_version": parent['version_number']
+            }
+
+        version = ProfileVersion(
+            profile_id=profile_id,
+            version_number=version_number,
+            admin_id=admin_id,
+            version_type=version_type,
+            stored_bytes=len(payload),
+            **chain
+        )
+        doc = version.model_dump(exclude={'snapshot_data'})
+        doc['created_at'] = doc['created_at'].isoformat()
+        doc['payload'] = payload
+        await self.collection.insert_one(doc)
+
+        if doc['depth'] == 0:
+            await self._prune(profile_id, version_number)
+
+        doc.pop('_id', None)
+        doc.pop('payload')
+        return doc
+
+    async def _prune(self, profile_id: str, version_number: int):
+        """Drop whole chains once MAX_PROFILE_VERSIONS newer versions exist"""
+        try:
+            oldest_kept = await self.collection.find_one(
+                {"profile_id": profile_id, "version_number": {"$lte": version_number - MAX_PROFILE_VERSIONS + 1}},
+                {"_id": 0, "keyframe": 1},
+                sort=[("version_number", -1)]
+            )
+            if oldest_kept:
+                await self.collection.delete_many({
+                    "profile_id": profile_id,
+                    "keyframe": {"$lt": oldest_kept['keyframe']}
+                })
+        except Exception as e:
+            logging.error(f"Failed to prune versions of profile {profile_id}: {e}")
+
+    async def list_versions(self, profile_id: str, limit: int = MAX_PROFILE_VERSIONS) -> List[dict]:
+        """Version metadata, newest first (no payloads)"""
+        return await self.collection.find(
+            {"profile_id": profile_id},
+            {"_id": 0, "payload": 0, "snapshot_data": 0}
+        ).sort("version_number", -1).limit(limit).to_list(limit)
+
+    async def get_snapshot(self, profile_id: str, version_id: str) -> Optional[tuple]:
+        """
+        Rebuild a version's full profile state
+
+        Returns:
+            (version metadata, snapshot) or None if the version doesn't exist
+        """
+        version = await self.collection.find_one(
+            {"id": version_id, "profile_id": profile_id},
+            {"_id": 0}
+        )
+        if not version:
+            return None
+        snapshot = await self._load_state(version)
+        snapshot.pop(VERSION_COUNTER_FIELD, None)
+        version.pop('payload', None)
+        version.pop('snapshot_data', None)
+        return version, snapshot
@@ -0,0 +1,298 @@
+"""
+QR Code Generation Service
+Generates invitation QR codes as PNG or SVG with an in-memory LRU and disk cache
+
+QR images only depend on the encoded URL, error correction level, size and
+output format, so they are cached by a hash of those inputs. The same hash
+doubles as a strong ETag for conditional GET.
+
+The disk cache is bounded by entry count and total bytes. Hits refresh a
+file's mtime and the least recently used files are evicted first, so
+sweeping URLs or sizes can't fill the disk. Each worker tracks the
+directory itself and rescans it periodically to pick up other workers'
+files.
+"""
+
+import os
+import io
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import qrcode
+import qrcode.image.svg
+from PIL import Image as PILImage
+
+
+QR_CACHE_DIR = Path(os.environ.get('QR_CACHE_DIR', '/app/uploads/qr_cache'))
+QR_MEMORY_CACHE_SIZE = 512
+QR_DISK_CACHE_MAX_ENTRIES = int(os.environ.get('QR_DISK_CACHE_MAX_ENTRIES', '5000'))
+QR_DISK_CACHE_MAX_BYTES = int(os.environ.get('QR_DISK_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+# Writes between rescans of the directory (other workers add files too)
+QR_DISK_RESCAN_WRITES = 256
+
+QR_FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml'
+}
+
+ERROR_CORRECTION_LEVELS = {
+    'L': qrcode.constants.ERROR_CORRECT_L,
+    'M': qrcode.constants.ERROR_CORRECT_M,
+    'Q': qrcode.constants.ERROR_CORRECT_Q,
+    'H': qrcode.constants.ERROR_CORRECT_H
+}
+
+
+class QRCodeCache:
+    """Thread-safe LRU of rendered QR images backed by a disk directory"""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_entries: int = QR_MEMORY_CACHE_SIZE,
+        max_disk_entries: int = QR_DISK_CACHE_MAX_ENTRIES,
+        max_disk_bytes: int = QR_DISK_CACHE_MAX_BYTES
+    ):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        # File name -> size, least recently used first
+        self._disk_files: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._writes_since_scan = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.disk_enabled = True
+        except OSError as e:
+            logging.warning(f"QR disk cache disabled: {e}")
+            self.disk_enabled = False
+
+        if self.disk_enabled:
+            with self._lock:
+                self._scan_disk()
+                self._evict_disk()
+
+    def _scan_disk(self):
+        """Rebuild the disk index from the directory, oldest mtime first"""
+        files = []
+        try:
+            for path in self.cache_dir.iterdir():
+                if path.suffix.lstrip('.') not in QR_FORMATS:
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, path.name, stat.st_size))
+        except OSError as e:
+            logging.warning(f"QR disk cache scan failed: {e}")
+            return
+
+        files.sort()
+        self._disk_files = OrderedDict((name, size) for _, name, size in files)
+        self._disk_bytes = sum(self._disk_files.values())
+        self._writes_since_scan = 0
+
+    def _evict_disk(self):
+        """Delete least recently used files until within both limits"""
+        while self._disk_files and (
+            len(self._disk_files) > self.max_disk_entries
+            or self._disk_bytes > self.max_disk_bytes
+        ):
+            name, size = self._disk_files.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                (self.cache_dir / name).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.warning(f"QR disk cache eviction failed: {e}")
+            self.disk_evictions += 1
+
+    def _touch_disk(self, path: Path):
+        """Mark a disk entry as recently used (mtime survives restarts)"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            if path.name in self._disk_files:
+                self._disk_files.move_to_end(path.name)
+
+    def _path(self, key: str, fmt: str) -> Path:
+        return self.cache_dir / f"{key}.{fmt}"
+
+    def get(self, key: str, fmt: str) -> Optional[bytes]:
+        """Return cached image bytes from memory, then disk"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        if self.disk_enabled:
+            path = self._path(key, fmt)
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                data = None
+            except OSError as e:
+                logging.warning(f"QR disk cache read failed: {e}")
+                data = None
+
+            if data is not None:
+                self._remember(key, data)
+                self._touch_disk(path)
+                with self._lock:
+                    self.disk_hits += 1
+                return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, fmt: str, data: bytes):
+        """Store image bytes in memory and on disk"""
+        self._remember(key, data)
+
+        if self.disk_enabled:
+            path = self._path(key, fmt)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logging.warning(f"QR disk cache write failed: {e}")
+                return
+
+            with self._lock:
+                self._disk_bytes -= self._disk_files.pop(path.name, 0)
+                self._disk_files[path.name] = len(data)
+                self._disk_bytes += len(data)
+                self._writes_since_scan += 1
+                if self._writes_since_scan >= QR_DISK_RESCAN_WRITES:
+                    self._scan_disk()
+                self._evict_disk()
+
+    def _remember(self, key: str, data: bytes):
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'disk_entries': len(self._disk_files),
+                'disk_bytes': self._disk_bytes,
+                'disk_evictions': self.disk_evictions
+            }
+
+
+qr_cache = QRCodeCache(QR_CACHE_DIR)
+
+
+def qr_cache_key(url: str, error_correction: str, size: Optional[int], fmt: str) -> str:
+    """Stable cache key (and ETag value) for a QR rendering"""
+    raw = f"{url}|{error_correction}|{size or 'native'}|{fmt}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+
+def qr_response_etag(image_etag: str, *fields: str) -> str:
+    """ETag for a response that carries a QR image plus other fields (e.g. a download filename)"""
+    raw = "|".join((image_etag,) + fields)
+    digest = hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _render_qr(url: str, error_correction: str, size: Optional[int], fmt: str, box_size: int = 10) -> bytes:
+    """Render QR code image bytes (no caching)"""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=ERROR_CORRECTION_LEVELS[error_correction],
+        box_size=box_size,
+        border=4,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+
+    output = io.BytesIO()
+
+    if fmt == 'svg':
+        # Vector output scales to any print size, so size is not applied
+        img = qr.make_image(image_factory=qrcode.image.svg.SvgPathImage)
+        img.save(output)
+        return output.getvalue()
+
+    img = qr.make_image(fill_color="black", back_color="white")
+
+    # Resize to requested size
+    if size:
+        img = img.resize((size, size), PILImage.Resampling.LANCZOS)
+
+    img.save(output, format='PNG')
+    return output.getvalue()
+
+
+def get_qr_code(
+    url: str,
+    error_correction: str = 'L',
+    size: Optional[int] = None,
+    fmt: str = 'png'
+) -> Tuple[bytes, str, str]:
+    """
+    Get a QR code image for a URL, rendering it only on cache miss
+
+    Args:
+        url: URL to encode
+        error_correction: One of L, M, Q, H
+        size: Output size in pixels for PNG (None keeps native box size)
+        fmt: 'png' or 'svg'
+
+    Returns:
+        (image bytes, etag, media type)
+    """
+    if fmt not in QR_FORMATS:
+        raise ValueError(f"Unsupported QR format: {fmt}")
+
+    # SVG ignores size, so don't fragment the cache on it
+    if fmt == 'svg':
+        size = None
+
+    key = qr_cache_key(url, error_correction, size, fmt)
+    data = qr_cache.get(key, fmt)
+    if data is None:
+        data = _render_qr(url, error_correction, size, fmt)
+        qr_cache.put(key, fmt, data)
+
+    return data, f'"{key}"', QR_FORMATS[fmt]
+
+
+def render_qr_batch(urls: List[str], error_correction: str = 'M') -> List[bytes]:
+    """
+    Render PNG QR codes for many URLs, bypassing the cache
+
+    Used for per-guest links that are printed once, so caching them would
+    only evict shared invitation QR codes. Modules are 4px, which is plenty
+    once scaled onto a printed card and keeps multi-page sheets small.
+    Picklable for worker processes.
+    """
+    return [_render_qr(url, error_correction, None, 'png', box_size=4) for url in urls]
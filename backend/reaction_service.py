@@ -0,0 +1,190 @@
+"""
+Guest Reaction Counters
+One reaction per device per event, with per-event counters kept by $inc
+
+A reaction is written with one atomic upsert on the unique
+(event_id, ip_address) index that also returns the device's previous
+reaction. The event's counter document is then moved by the difference:
++1 for a new reaction, -1 old / +1 new for a changed one, nothing when the
+reaction is unchanged. Because each upsert returns exactly the state it
+replaced, concurrent taps from the same device still add up. Reading stats
+is a single document fetch however many guests react.
+
+Counters are rebuilt from guest_reactions at startup, which also creates
+them for events that had reactions before the counters existed.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from pymongo import ReplaceOne, ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from models import GuestReaction
+
+
+REACTION_TYPES = ("love", "blessings", "excited")
+
+
+def _empty_counts() -> Dict[str, int]:
+    return {reaction_type: 0 for reaction_type in REACTION_TYPES}
+
+
+class ReactionService:
+    """Idempotent per-device reactions with O(1) per-event stats"""
+
+    def __init__(self, db):
+        self.collection = db['guest_reactions']
+        self.counts_collection = db['guest_reaction_counts']
+
+    async def ensure_indexes(self):
+        await self.counts_collection.create_index("event_id", unique=True, name="event_id_unique")
+        try:
+            await self._create_device_index()
+        except (DuplicateKeyError, OperationFailure) as e:
+            # Older find-then-insert writes could race into duplicates
+            logging.warning(f"Removing duplicate guest reactions before indexing: {e}")
+            await self._remove_duplicate_reactions()
+            await self._create_device_index()
+
+    async def _create_device_index(self):
+        await self.collection.create_index(
+            [("event_id", 1), ("ip_address", 1)],
+            unique=True,
+            name="event_id_ip_address_unique"
+        )
+
+    async def _remove_duplicate_reactions(self):
+        """Keep only the latest reaction per (event_id, ip_address)"""
+        pipeline = [
+            {"$sort": {"created_at": -1}},
+            {"$group": {
+                "_id": {"event_id": "$event_id", "ip_address": "$ip_address"},
+                "ids": {"$push": "$_id"},
+                "count": {"$sum": 1}
+            }},
+            {"$match": {"count": {"$gt": 1}}}
+        ]
+        async for group in self.collection.aggregate(pipeline, allowDiskUse=True):
+            await self.collection.delete_many({"_id": {"$in": group['ids'][1:]}})
+
+    async def react(self, event_id: str, profile_id: str, ip_address: str, reaction_type: str) -> Optional[str]:
+        """
+        Set a device's reaction for an event
+
+        Returns:
+            The device's previous reaction type, or None if this is its first
+        """
+        reaction = GuestReaction(
+            event_id=event_id,
+            profile_id=profile_id,
+            reaction_type=reaction_type,
+            ip_address=ip_address
+        )
+        doc = reaction.model_dump()
+        doc['created_at'] = doc['created_at'].isoformat()
+
+        device_filter = {"event_id": event_id, "ip_address": ip_address}
+        changes = {"reaction_type": reaction_type, "created_at": doc['created_at']}
+        try:
+            previous = await self.collection.find_one_and_update(
+                device_filter,
+                {
+                    "$set": changes,
+                    "$setOnInsert": {"id": doc['id'], "profile_id": profile_id}
+                },
+                projection={"_id": 0, "reaction_type": 1},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            # A concurrent first reaction from the same device inserted first
+            previous = await self.collection.find_one_and_update(
+                device_filter,
+                {"$set": changes},
+                projection={"_id": 0, "reaction_type": 1},
+                return_document=ReturnDocument.BEFORE
+            )
+
+        previous_type = previous.get('reaction_type') if previous else None
+        await self._move_counts(event_id, profile_id, previous_type, reaction_type)
+        return previous_type
+
+    async def _move_counts(self, event_id: str, profile_id: str, previous_type: Optional[str], reaction_type: str):
+        if previous_type == reaction_type:
+            return
+
+        delta = {f"counts.{reaction_type}": 1}
+        if previous_type:
+            delta[f"counts.{previous_type}"] = -1
+        else:
+            delta["total"] = 1
+
+        try:
+            await self.counts_collection.update_one(
+                {"event_id": event_id},
+                {
+                    "$inc": delta,
+                    "$set": {"updated_at": datetime.now(timezone.utc).isoformat()},
+                    "$setOnInsert": {"profile_id": profile_id}
+                },
+                upsert=True
+            )
+        except Exception as e:
+            # The reaction itself is stored; the next rebuild repairs the counter
+            logging.error(f"Failed to update reaction counts for event {event_id}: {e}")
+
+    async def get_stats(self, event_id: str) -> dict:
+        """Reaction counts for an event (zeros when nobody has reacted)"""
+        doc = await self.counts_collection.find_one(
+            {"event_id": event_id},
+            {"_id": 0, "counts": 1, "total": 1}
+        )
+        counts = _empty_counts()
+        if doc:
+            counts.update(doc.get('counts', {}))
+        return {
+            "event_id": event_id,
+            "love_count": counts['love'],
+            "blessings_count": counts['blessings'],
+            "excited_count": counts['excited'],
+            "total_reactions": doc.get('total', 0) if doc else 0
+        }
+
+    async def rebuild(self) -> int:
+        """
+        Recompute every event's counters from guest_reactions
+
+        Increments that land while the aggregation runs can be overwritten;
+        the next rebuild corrects them. Returns the number of events written.
+        """
+        pipeline = [
+            {"$group": {
+                "_id": {"event_id": "$event_id", "reaction_type": "$reaction_type"},
+                "profile_id": {"$first": "$profile_id"},
+                "count": {"$sum": 1}
+            }}
+        ]
+
+        events: Dict[str, dict] = {}
+        async for group in self.collection.aggregate(pipeline, allowDiskUse=True):
+            key = group['_id']
+            event = events.setdefault(key['event_id'], {
+                "event_id": key['event_id'],
+                "profile_id": group.get('profile_id'),
+                "counts": _empty_counts(),
+                "total": 0
+            })
+            if key.get('reaction_type') in REACTION_TYPES:
+                event["counts"][key['reaction_type']] += group['count']
+                event["total"] += group['count']
+
+        now = datetime.now(timezone.utc).isoformat()
+        operations = [
+            ReplaceOne({"event_id": event_id}, {**event, "updated_at": now}, upsert=True)
+            for event_id, event in events.items()
+        ]
+        if operations:
+            await self.counts_collection.bulk_write(operations, ordered=False)
+        return len(operations)
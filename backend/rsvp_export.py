@@ -0,0 +1,210 @@
+"""
+RSVP Export Service
+Streams RSVP exports from a MongoDB cursor as CSV, XLSX or Parquet
+
+Rows are consumed from the cursor in batches, so memory stays constant
+regardless of guest count. CSV is streamed to the client as it is written.
+XLSX and Parquet need a complete file before it can be read, so they are
+written incrementally to a spooled temporary file (spilling to disk past a
+few MB) and then streamed out in chunks.
+"""
+
+import asyncio
+import csv
+import io
+import tempfile
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+EXPORT_HEADERS = ['Guest Name', 'Phone', 'Status', 'Guest Count', 'Message', 'Submitted At']
+
+# Rows fetched per cursor batch and written per chunk / row group
+EXPORT_BATCH_SIZE = 1000
+# In-memory size before spooled XLSX/Parquet output moves to disk
+EXPORT_SPOOL_BYTES = 8 * 1024 * 1024
+EXPORT_READ_CHUNK = 64 * 1024
+
+EXPORT_PROJECTION = {
+    "_id": 0,
+    "guest_name": 1,
+    "guest_phone": 1,
+    "status": 1,
+    "guest_count": 1,
+    "message": 1,
+    "created_at": 1
+}
+
+PARQUET_SCHEMA = pa.schema([
+    ('guest_name', pa.string()),
+    ('guest_phone', pa.string()),
+    ('status', pa.string()),
+    ('guest_count', pa.int64()),
+    ('message', pa.string()),
+    ('submitted_at', pa.timestamp('us', tz='UTC'))
+])
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Naive datetimes are taken as UTC"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def build_rsvp_export_query(
+    profile_id: str,
+    statuses: Optional[List[str]] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> Dict:
+    """
+    MongoDB filter for an export
+
+    created_at is stored as a UTC ISO string, which sorts chronologically,
+    so the date range is compared as strings.
+    """
+    query = {"profile_id": profile_id}
+
+    if statuses:
+        query["status"] = {"$in": statuses}
+
+    created_range = {}
+    if date_from:
+        created_range["$gte"] = _as_utc(date_from).isoformat()
+    if date_to:
+        created_range["$lte"] = _as_utc(date_to).isoformat()
+    if created_range:
+        query["created_at"] = created_range
+
+    return query
+
+
+def _submitted_at(rsvp: dict) -> Optional[datetime]:
+    created_at = rsvp.get('created_at')
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    if isinstance(created_at, datetime) and created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at
+
+
+def _export_row(rsvp: dict) -> list:
+    """One spreadsheet row, matching EXPORT_HEADERS"""
+    created_at = _submitted_at(rsvp)
+    return [
+        rsvp.get('guest_name', ''),
+        rsvp.get('guest_phone', ''),
+        rsvp.get('status', ''),
+        rsvp.get('guest_count', 1),
+        rsvp.get('message') or '',
+        created_at.strftime('%Y-%m-%d %H:%M:%S') if created_at else ''
+    ]
+
+
+async def _batches(cursor) -> AsyncIterator[List[dict]]:
+    """Group cursor documents into lists of EXPORT_BATCH_SIZE"""
+    batch = []
+    async for rsvp in cursor:
+        batch.append(rsvp)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def stream_rsvps_csv(cursor) -> AsyncIterator[bytes]:
+    """Stream CSV bytes, one chunk per cursor batch"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(EXPORT_HEADERS)
+    yield output.getvalue().encode('utf-8')
+
+    async for batch in _batches(cursor):
+        output.seek(0)
+        output.truncate()
+        writer.writerows(_export_row(rsvp) for rsvp in batch)
+        yield output.getvalue().encode('utf-8')
+
+
+async def _stream_spooled_file(spool) -> AsyncIterator[bytes]:
+    """Stream a finished spooled file in chunks, then close it"""
+    try:
+        spool.seek(0)
+        while True:
+            chunk = spool.read(EXPORT_READ_CHUNK)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        spool.close()
+
+
+async def stream_rsvps_xlsx(cursor) -> AsyncIterator[bytes]:
+    """Stream an XLSX workbook built with openpyxl's write-only mode"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("RSVPs")
+    sheet.append(EXPORT_HEADERS)
+
+    async for batch in _batches(cursor):
+        for rsvp in batch:
+            sheet.append(_export_row(rsvp))
+
+    spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    # Zipping the workbook is CPU-bound, keep it off the event loop
+    await asyncio.to_thread(workbook.save, spool)
+
+    async for chunk in _stream_spooled_file(spool):
+        yield chunk
+
+
+def _parquet_table(batch: List[dict]) -> pa.Table:
+    frame = pd.DataFrame({
+        'guest_name': [rsvp.get('guest_name', '') for rsvp in batch],
+        'guest_phone': [rsvp.get('guest_phone', '') for rsvp in batch],
+        'status': [rsvp.get('status', '') for rsvp in batch],
+        'guest_count': [rsvp.get('guest_count', 1) for rsvp in batch],
+        'message': [rsvp.get('message') for rsvp in batch],
+        'submitted_at': pd.to_datetime([_submitted_at(rsvp) for rsvp in batch], utc=True)
+    })
+    return pa.Table.from_pandas(frame, schema=PARQUET_SCHEMA, preserve_index=False)
+
+
+async def stream_rsvps_parquet(cursor) -> AsyncIterator[bytes]:
+    """Stream a Parquet file written one row group per cursor batch"""
+    spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    writer = pq.ParquetWriter(spool, PARQUET_SCHEMA, compression='snappy')
+    try:
+        async for batch in _batches(cursor):
+            writer.write_table(_parquet_table(batch))
+    finally:
+        writer.close()
+
+    async for chunk in _stream_spooled_file(spool):
+        yield chunk
+
+
+EXPORT_STREAMERS = {
+    'csv': stream_rsvps_csv,
+    'xlsx': stream_rsvps_xlsx,
+    'parquet': stream_rsvps_parquet
+}
+
+
+def stream_rsvp_export(cursor, fmt: str) -> AsyncIterator[bytes]:
+    """Byte stream of the export in the requested format"""
+    if fmt not in EXPORT_STREAMERS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    return EXPORT_STREAMERS[fmt](cursor)
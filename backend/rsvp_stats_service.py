@@ -0,0 +1,232 @@
+"""
+RSVP Statistics Counters
+Per-profile RSVP counters maintained with atomic $inc on every RSVP write
+
+One rsvp_stats document per profile holds:
+    total, status.<status>, guests.<status> (sum of guest_count),
+    with_message, without_message, hours.<YYYY-MM-DD_HH> (submissions per hour)
+and the same counters per event under events.<event_id> ("unknown" for RSVPs
+without an event). Stats endpoints become a single document read.
+
+A periodic reconciliation rebuilds every document from the rsvps collection
+with one aggregation, correcting drift from failed or concurrent writes.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from pymongo import ReplaceOne
+
+
+RSVP_STATS_RECONCILE_SECONDS = 3600
+UNKNOWN_EVENT_KEY = "unknown"
+
+
+def _submitted_hour(created_at) -> Optional[str]:
+    """Hour bucket key for a submission time (ISO string or datetime)"""
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    if not isinstance(created_at, datetime):
+        return None
+    return created_at.strftime("%Y-%m-%d_%H")
+
+
+def _has_message(rsvp: dict) -> bool:
+    message = rsvp.get('message')
+    return bool(message and message.strip())
+
+
+def rsvp_contributions(rsvp: dict) -> Dict[str, int]:
+    """Counter increments one RSVP contributes, at profile and event level"""
+    status = rsvp.get('status') or 'pending'
+    guest_count = rsvp.get('guest_count', 1)
+    message_key = 'with_message' if _has_message(rsvp) else 'without_message'
+    hour = _submitted_hour(rsvp.get('created_at'))
+    event_key = rsvp.get('event_id') or UNKNOWN_EVENT_KEY
+
+    contributions = {}
+    for prefix in ("", f"events.{event_key}."):
+        contributions[f"{prefix}total"] = 1
+        contributions[f"{prefix}status.{status}"] = 1
+        contributions[f"{prefix}guests.{status}"] = guest_count
+        contributions[f"{prefix}{message_key}"] = 1
+        if hour:
+            contributions[f"{prefix}hours.{hour}"] = 1
+    return contributions
+
+
+def rsvp_delta(before: Optional[dict], after: Optional[dict]) -> Dict[str, int]:
+    """Counter changes for an RSVP going from before to after (None = absent)"""
+    delta = defaultdict(int)
+    if after:
+        for key, value in rsvp_contributions(after).items():
+            delta[key] += value
+    if before:
+        for key, value in rsvp_contributions(before).items():
+            delta[key] -= value
+    return {key: value for key, value in delta.items() if value}
+
+
+def _empty_counters() -> dict:
+    return {
+        "total": 0,
+        "status": {},
+        "guests": {},
+        "with_message": 0,
+        "without_message": 0,
+        "hours": {}
+    }
+
+
+def _add_contributions(counters: dict, status: str, guest_count: int, has_message: bool, hour: Optional[str], count: int = 1):
+    counters["total"] += count
+    counters["status"][status] = counters["status"].get(status, 0) + count
+    counters["guests"][status] = counters["guests"].get(status, 0) + guest_count
+    counters["with_message" if has_message else "without_message"] += count
+    if hour:
+        counters["hours"][hour] = counters["hours"].get(hour, 0) + count
+
+
+class RSVPStatsService:
+    """Atomic RSVP counters with periodic reconciliation"""
+
+    def __init__(self, db):
+        self.collection = db['rsvp_stats']
+        self.rsvps_collection = db['rsvps']
+        self._reconciler: Optional[asyncio.Task] = None
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("profile_id", unique=True, name="profile_id_unique")
+
+    async def record_change(self, profile_id: str, before: Optional[dict], after: Optional[dict]):
+        """
+        Apply the counter delta for one RSVP write
+
+        Pass before=None for a new RSVP and after=None for a deleted one.
+        """
+        await self._apply_delta(profile_id, rsvp_delta(before, after))
+
+    async def record_bulk_insert(self, profile_id: str, rsvps: list):
+        """Apply counters for many new RSVPs of one profile in one update"""
+        delta = defaultdict(int)
+        for rsvp in rsvps:
+            for key, value in rsvp_contributions(rsvp).items():
+                delta[key] += value
+        await self._apply_delta(profile_id, dict(delta))
+
+    async def _apply_delta(self, profile_id: str, delta: Dict[str, int]):
+        """$inc the counters; failures are logged, reconciliation repairs the drift"""
+        if not delta:
+            return
+
+        try:
+            await self.collection.update_one(
+                {"profile_id": profile_id},
+                {
+                    "$inc": delta,
+                    "$set": {"updated_at": datetime.now(timezone.utc).isoformat()}
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logging.error(f"Failed to update RSVP stats for profile {profile_id}: {e}")
+
+    async def get_stats(self, profile_id: str) -> dict:
+        """Counters for a profile (zeros when it has no RSVPs yet)"""
+        stats = await self.collection.find_one({"profile_id": profile_id}, {"_id": 0})
+        if not stats:
+            stats = {"profile_id": profile_id, **_empty_counters(), "events": {}}
+        return stats
+
+    async def reconcile(self) -> int:
+        """
+        Rebuild every stats document from the rsvps collection
+
+        Increments that land while the aggregation runs can be overwritten;
+        the next run corrects them. Returns the number of profiles written.
+        """
+        started_at = datetime.now(timezone.utc).isoformat()
+        pipeline = [
+            {"$project": {
+                "_id": 0,
+                "profile_id": 1,
+                "event_id": {"$ifNull": ["$event_id", UNKNOWN_EVENT_KEY]},
+                "status": {"$ifNull": ["$status", "pending"]},
+                "guest_count": {"$ifNull": ["$guest_count", 1]},
+                "has_message": {"$gt": [
+                    {"$strLenCP": {"$trim": {"input": {"$ifNull": ["$message", ""]}}}},
+                    0
+                ]},
+                "hour": {"$cond": [
+                    {"$eq": [{"$type": "$created_at"}, "date"]},
+                    {"$dateToString": {"format": "%Y-%m-%d_%H", "date": "$created_at"}},
+                    {"$concat": [
+                        {"$substrCP": [{"$ifNull": ["$created_at", ""]}, 0, 10]},
+                        "_",
+                        {"$substrCP": [{"$ifNull": ["$created_at", ""]}, 11, 2]}
+                    ]}
+                ]}
+            }},
+            {"$group": {
+                "_id": {
+                    "profile_id": "$profile_id",
+                    "event_id": "$event_id",
+                    "status": "$status",
+                    "has_message": "$has_message",
+                    "hour": "$hour"
+                },
+                "count": {"$sum": 1},
+                "guests": {"$sum": "$guest_count"}
+            }}
+        ]
+
+        profiles: Dict[str, dict] = {}
+        async for group in self.rsvps_collection.aggregate(pipeline, allowDiskUse=True):
+            key = group['_id']
+            hour = key['hour'] if key['hour'] and key['hour'] != "_" else None
+            stats = profiles.setdefault(key['profile_id'], {**_empty_counters(), "events": {}})
+            event_stats = stats["events"].setdefault(key['event_id'], _empty_counters())
+            for counters in (stats, event_stats):
+                _add_contributions(counters, key['status'], group['guests'], key['has_message'], hour, group['count'])
+
+        now = datetime.now(timezone.utc).isoformat()
+        operations = [
+            ReplaceOne(
+                {"profile_id": profile_id},
+                {"profile_id": profile_id, **stats, "updated_at": now, "reconciled_at": now},
+                upsert=True
+            )
+            for profile_id, stats in profiles.items()
+        ]
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+        # Profiles whose RSVPs are all gone (and not incremented since the run began)
+        await self.collection.delete_many({
+            "reconciled_at": {"$ne": now},
+            "updated_at": {"$lt": started_at}
+        })
+
+        return len(operations)
+
+    async def _reconcile_loop(self):
+        while True:
+            try:
+                count = await self.reconcile()
+                logging.info(f"Reconciled RSVP stats for {count} profiles")
+            except Exception as e:
+                logging.error(f"RSVP stats reconciliation failed: {e}")
+            await asyncio.sleep(RSVP_STATS_RECONCILE_SECONDS)
+
+    def start(self):
+        """Start the periodic reconciliation job (first run is immediate)"""
+        if self._reconciler is None:
+            self._reconciler = asyncio.ensure_future(self._reconcile_loop())
+
+    def stop(self):
+        if self._reconciler is not None:
+            self._reconciler.cancel()
+            self._reconciler = None
@@ -1,9 +1,11 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Form, Request, Header
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Form, Request, Header, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse, Response
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
 import os
 import logging
 from pathlib import Path
@@ -26,13 +28,15 @@ from reportlab.lib import colors as rl_colors
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 import urllib.request
+import urllib.parse
+import csv
 from PIL import Image as PILImage
 import qrcode
-from icalendar import Calendar, Event as ICalEvent
 from io import BytesIO
 import razorpay
 import hmac
 import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
 
 
 from models import (
@@ -48,7 +52,7 @@ from models import (
     RSVP, RSVPCreate, RSVPResponse, RSVPStats,
     Analytics, ViewSession, DailyView, ViewTrackingRequest, InteractionTrackingRequest, 
     LanguageTrackingRequest, AnalyticsResponse, AnalyticsSummary,
-    RateLimit, AuditLog, AuditLogResponse,
+    RateLimit, AuditLog, AuditLogResponse, AuditLogPage,
     DesignConfig, DesignConfigResponse, UpdateEventBackgroundRequest,
     LordLibrary, LordLibraryResponse, UpdateEventLordSettingsRequest,
     GuestWish, GuestWishCreate, GuestWishResponse,
@@ -94,7 +98,10 @@ from models import (
     CreatorProfileUpdate, CreatorProfileResponse, CreatorStatus, TemplatePurchase,
     TemplatePurchaseRequest, TemplatePurchaseResponse, TemplateReview, TemplateReviewRequest,
     AdminTemplateReviewRequest, AdminCreatorActionRequest, TemplateEarnings,
-    TemplateStats, MarketplaceFilters
+    TemplateStats, MarketplaceFilters,
+    BulkPDFExportRequest,
+    Guest, GuestImportResponse,
+    GreetingPage, GuestWishPage, BulkModerationRequest, BulkModerationResponse
 )
 from auth import (
     get_password_hash, verify_password, 
@@ -149,6 +156,41 @@ from template_validator import (
 )
 # PHASE 35: Credit Management Service
 from credit_service import CreditService
+# QR code rendering with LRU + disk cache
+from qr_service import get_qr_code, qr_response_etag, QR_FORMATS
+# Cached .ics calendar generation
+from calendar_service import (
+    CALENDAR_PROFILE_PROJECTION,
+    get_invitation_calendar,
+    calendar_last_modified
+)
+# Streaming RSVP exports
+from rsvp_export import (
+    EXPORT_FORMATS,
+    EXPORT_BATCH_SIZE,
+    EXPORT_PROJECTION,
+    build_rsvp_export_query,
+    stream_rsvp_export
+)
+# Guest list spreadsheet import
+from guest_import_service import GuestImportService, MAX_GUEST_IMPORT_BYTES
+# Live dashboard feed (Server-Sent Events)
+from live_feed import live_feed_hub, profile_topic, publish_profile_event
+# Profanity filter and shared plain-text sanitizer for guest input
+from content_filter import content_filter
+# Event-day wish wall (WebSocket broadcast)
+from wish_wall import WishWallHub, WISH_WALL_PROJECTION
+# PDF rendering (worker-process safe)
+from pdf_service import (
+    LANGUAGE_TEMPLATES,
+    MAX_BULK_PDF_PROFILES,
+    MAX_GUEST_QR_SHEET_GUESTS,
+    render_invitation_pdf,
+    build_pdf_filename,
+    stream_invitation_pdf_zip,
+    generate_guest_qr_sheet,
+    shutdown_pdf_executor
+)
 import hashlib
 
 
@@ -164,6 +206,58 @@ db = client[os.environ['DB_NAME']]
 # PHASE 35: Initialize Credit Service
 credit_service = CreditService(db)
 
+# PHASE 26: Two-tier (memory + MongoDB) translation cache
+from translation_cache import TranslationCacheService
+translation_cache_service = TranslationCacheService(db)
+
+# PHASE 26: Publish-time batched pre-translation
+from pretranslation_service import PretranslationService
+pretranslation_service = PretranslationService(db, ai_service, translation_cache_service)
+
+# PHASE 26: Aggregated RSVP stats with fingerprint-cached AI insights
+from guest_insights_service import GuestInsightsService
+guest_insights_service = GuestInsightsService(db, ai_service)
+
+# Bulk guest list import
+guest_import_service = GuestImportService(db)
+
+# Event-day wish wall shared by all viewers of a profile
+wish_wall_hub = WishWallHub(db)
+
+# PHASE 29E: Delta-compressed profile version history
+from profile_version_service import ProfileVersionService
+profile_version_service = ProfileVersionService(db)
+
+# Batched background audit logging with TTL retention
+from audit_log_service import (
+    AuditLogPipeline,
+    AuditLogQuery,
+    AUDIT_LOG_PAGE_SIZE,
+    MAX_AUDIT_LOG_PAGE_SIZE
+)
+audit_log_pipeline = AuditLogPipeline(db)
+audit_log_query = AuditLogQuery(db)
+
+# Paged moderation queues and bulk moderation of greetings and wishes
+from moderation_service import ModerationService, MODERATION_PAGE_SIZE
+moderation_service = ModerationService(db)
+
+# Per-device guest reactions with per-event counters
+from reaction_service import ReactionService
+reaction_service = ReactionService(db)
+
+# PHASE 35: Atomic profile credit wallets with a batched transaction log
+from credit_wallet_service import CreditWalletService
+credit_wallet_service = CreditWalletService(db)
+
+# Incrementally maintained RSVP counters
+from rsvp_stats_service import RSVPStatsService
+rsvp_stats_service = RSVPStatsService(db)
+
+# PHASE 26: Precomputed RSVP suggestion pools (refreshed in the background)
+from suggestion_pool_service import SuggestionPoolService
+suggestion_pool_service = SuggestionPoolService(db, ai_service)
+
 # PHASE 37: Initialize Wedding Lifecycle Service
 from wedding_lifecycle_service import WeddingLifecycleService
 wedding_lifecycle_service = WeddingLifecycleService(db, credit_service)
@@ -302,6 +396,7 @@ def calculate_invitation_expires_at(event_date: datetime, expires_at: Optional[d
 
 async def check_profile_active(profile: dict) -> bool:
     """Check if profile is active and not expired"""
+    return await check_profile_active_old(profile)
 
 
 # PHASE 35: Data Isolation Helper
@@ -437,6 +532,60 @@ def generate_event_links(slug: str, events: List) -> Dict[str, str]:
     return event_links
 
 
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate conditional GET headers
+    
+    If-None-Match takes precedence over If-Modified-Since (RFC 7232).
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison: W/"abc" matches "abc"
+        return any(tag.removeprefix("W/") == etag for tag in candidates)
+    
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    
+    return False
+
+
+def conditional_response(
+    request: Request,
+    content: bytes,
+    media_type: str,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    max_age: int = 3600,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Build a cacheable response with ETag/Last-Modified, or a 304 when the client copy is current
+    """
+    cache_headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}"
+    }
+    if last_modified:
+        cache_headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=cache_headers)
+    
+    if headers:
+        cache_headers.update(headers)
+    return Response(content=content, media_type=media_type, headers=cache_headers)
+
+
 async def log_audit_action(
     action: str, 
     admin_id: str, 
@@ -446,7 +595,7 @@ async def log_audit_action(
 ):
     """
     Log admin action to audit log
-    Automatically maintains last 1000 logs
+    Queued for a batched background write; old logs expire via TTL
     
     Args:
         action: Action type (profile_create, profile_update, profile_delete, profile_duplicate, template_save)
@@ -468,18 +617,8 @@ async def log_audit_action(
         doc = audit_log.model_dump()
         doc['timestamp'] = doc['timestamp'].isoformat()
         
-        # Insert log
-        await db.audit_logs.insert_one(doc)
-        
-        # Maintain only last 1000 logs
-        total_logs = await db.audit_logs.count_documents({})
-        if total_logs > 1000:
-            # Get the 1000th oldest log timestamp
-            logs_to_keep = await db.audit_logs.find({}, {"_id": 0, "timestamp": 1}).sort("timestamp", -1).skip(999).limit(1).to_list(1)
-            if logs_to_keep:
-                cutoff_timestamp = logs_to_keep[0]['timestamp']
-                # Delete all logs older than cutoff
-                await db.audit_logs.delete_many({"timestamp": {"$lt": cutoff_timestamp}})
+        # Written in the background; retention is a TTL index
+        audit_log_pipeline.enqueue(doc)
     
     except Exception as e:
         # Log error but don't fail the main operation
@@ -558,19 +697,10 @@ async def convert_to_webp(file: UploadFile, quality: int = 85) -> tuple[bytes, i
         raise HTTPException(status_code=400, detail=f"Invalid image file: {str(e)}")
 
 
-# PHASE 25: Basic Profanity Filter
-PROFANITY_WORDS = [
-    'damn', 'hell', 'shit', 'fuck', 'ass', 'bitch', 'bastard', 'crap',
-    'dick', 'piss', 'slut', 'whore', 'idiot', 'stupid', 'dumb'
-]
-
+# PHASE 25: Profanity filter (Aho-Corasick, word-boundary aware)
 def contains_profanity(text: str) -> bool:
-    """Basic profanity filter check"""
-    text_lower = text.lower()
-    for word in PROFANITY_WORDS:
-        if word in text_lower:
-            return True
-    return False
+    """Check guest text against the shared content filter"""
+    return content_filter.contains_profanity(text)
 
 
 # ==================== AUTH ROUTES ====================
@@ -1981,7 +2111,7 @@ async def create_event(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "event_created",
         "resource_type": "event",
@@ -2079,7 +2209,7 @@ async def update_event(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "event_updated",
         "resource_type": "event",
@@ -2168,7 +2298,7 @@ async def delete_event(
         message = "Event disabled successfully"
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": action,
         "resource_type": "event",
@@ -2265,7 +2395,7 @@ async def upload_event_music(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "event_music_uploaded",
         "resource_type": "event",
@@ -2339,7 +2469,7 @@ async def delete_event_music(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "event_music_deleted",
         "resource_type": "event",
@@ -2397,7 +2527,7 @@ async def toggle_event_music(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": f"event_music_{'enabled' if music_enabled else 'disabled'}",
         "resource_type": "event",
@@ -2582,7 +2712,7 @@ async def upload_event_gallery_images(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "event_gallery_images_uploaded",
         "resource_type": "event",
@@ -2673,7 +2803,7 @@ async def delete_event_gallery_image(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "event_gallery_image_deleted",
         "resource_type": "event",
@@ -2762,7 +2892,7 @@ async def reorder_event_gallery(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "event_gallery_reordered",
         "resource_type": "event",
@@ -2823,7 +2953,7 @@ async def toggle_event_gallery(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": f"event_gallery_{'enabled' if gallery_enabled else 'disabled'}",
         "resource_type": "event",
@@ -2844,20 +2974,86 @@ async def toggle_event_gallery(
 
 # ==================== ADMIN - AUDIT LOG ROUTES ====================
 
-@api_router.get("/admin/audit-logs", response_model=List[AuditLogResponse])
-async def get_audit_logs(admin_id: str = Depends(get_current_admin)):
-    """
-    Get audit logs for admin actions
-    Returns last 1000 logs in reverse chronological order (newest first)
-    """
-    logs = await db.audit_logs.find({}, {"_id": 0}).sort("timestamp", -1).limit(1000).to_list(1000)
+async def query_audit_logs(
+    admin_data: dict,
+    admin_id: Optional[str],
+    profile_id: Optional[str],
+    action: Optional[str],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    cursor: Optional[str],
+    limit: int
+):
+    """Run an audit log query, scoped to the caller unless Super Admin"""
+    # PHASE 35: Regular admins only see their own activity
+    if admin_data['role'] != 'super_admin':
+        admin_id = admin_data['admin_id']
+    
+    try:
+        logs, next_cursor = await audit_log_query.find_page(
+            admin_id=admin_id,
+            profile_id=profile_id,
+            action=action,
+            date_from=date_from,
+            date_to=date_to,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Convert timestamp strings back to datetime
     for log in logs:
         if isinstance(log.get('timestamp'), str):
             log['timestamp'] = datetime.fromisoformat(log['timestamp'])
     
-    return [AuditLogResponse(**log) for log in logs]
+    return [AuditLogResponse(**log) for log in logs], next_cursor
+
+
+@api_router.get("/admin/audit-logs", response_model=List[AuditLogResponse])
+async def get_audit_logs(
+    admin_id: Optional[str] = None,
+    profile_id: Optional[str] = None,
+    action: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    limit: int = MAX_AUDIT_LOG_PAGE_SIZE,
+    admin_data: dict = Depends(require_admin)
+):
+    """
+    Get audit logs for admin actions (newest first, up to 1000)
+    
+    Super Admins see every admin's logs and may filter by admin_id;
+    regular admins only see their own. Use /admin/audit-logs/page to
+    page further back.
+    """
+    logs, _ = await query_audit_logs(
+        admin_data, admin_id, profile_id, action, date_from, date_to, None, limit
+    )
+    return logs
+
+
+@api_router.get("/admin/audit-logs/page", response_model=AuditLogPage)
+async def get_audit_log_page(
+    admin_id: Optional[str] = None,
+    profile_id: Optional[str] = None,
+    action: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = AUDIT_LOG_PAGE_SIZE,
+    admin_data: dict = Depends(require_admin)
+):
+    """
+    Keyset-paginated audit logs with filters
+    
+    Pages are ordered by (timestamp, id), newest first; pass next_cursor
+    back as ?cursor= with the same filters to continue.
+    """
+    logs, next_cursor = await query_audit_logs(
+        admin_data, admin_id, profile_id, action, date_from, date_to, cursor, limit
+    )
+    return AuditLogPage(items=logs, next_cursor=next_cursor)
 
 # ==================== ADMIN - MEDIA ROUTES ====================
 
@@ -3127,6 +3323,7 @@ async def get_invitation(slug: str):
         whatsapp_bride=profile.get('whatsapp_bride'),
         enabled_languages=profile.get('enabled_languages', ['english']),
         custom_text=profile.get('custom_text', {}),
+        translations=profile.get('translations', {}),
         about_couple=profile.get('about_couple'),
         family_details=profile.get('family_details'),
         love_story=profile.get('love_story'),
@@ -3270,6 +3467,7 @@ async def get_event_invitation(slug: str, event_type: str):
         whatsapp_bride=profile.get('whatsapp_bride'),
         enabled_languages=profile.get('enabled_languages', ['english']),
         custom_text=profile.get('custom_text', {}),
+        translations=profile.get('translations', {}),
         about_couple=profile.get('about_couple'),
         family_details=profile.get('family_details'),
         love_story=profile.get('love_story'),
@@ -3392,6 +3590,7 @@ async def get_event_by_slug(slug: str, event_slug: str):
         whatsapp_bride=profile.get('whatsapp_bride'),
         enabled_languages=enabled_languages,  # PHASE 17: Event-specific languages
         custom_text=profile.get('custom_text', {}),
+        translations=profile.get('translations', {}),
         about_couple=profile.get('about_couple'),
         family_details=profile.get('family_details'),
         love_story=profile.get('love_story'),
@@ -3510,10 +3709,9 @@ async def submit_greeting(
         if datetime.now(timezone.utc) > expires_at:
             raise HTTPException(status_code=403, detail="This invitation has expired. Submitting wishes is no longer available.")
     
-    # Sanitize input using bleach
-    import bleach
-    sanitized_name = bleach.clean(greeting_data.guest_name, tags=[], strip=True)
-    sanitized_message = bleach.clean(greeting_data.message, tags=[], strip=True)
+    # Strip HTML with the shared sanitizer
+    sanitized_name = content_filter.clean_text(greeting_data.guest_name)
+    sanitized_message = content_filter.clean_text(greeting_data.message)
     
     greeting = Greeting(
         profile_id=profile['id'],
@@ -3530,13 +3728,16 @@ async def submit_greeting(
     # PHASE 32: Track successful submission (resets CAPTCHA requirement)
     await track_submission_attempt(slug, client_ip, device_id, "wishes", True, captcha_check["requires_captcha"])
     
-    return GreetingResponse(
+    greeting_response = GreetingResponse(
         id=greeting.id,
         guest_name=greeting.guest_name,
         message=greeting.message,
         approval_status=greeting.approval_status,
         created_at=greeting.created_at
     )
+    publish_profile_event(profile['id'], "greeting.created", greeting_response.model_dump())
+    
+    return greeting_response
 
 
 @api_router.get("/admin/profiles/{profile_id}/greetings", response_model=List[GreetingResponse])
@@ -3571,42 +3772,228 @@ async def get_profile_greetings(
 @api_router.put("/admin/greetings/{greeting_id}/approve")
 async def approve_greeting(greeting_id: str, admin_id: str = Depends(get_current_admin)):
     """PHASE 11: Approve a greeting"""
-    result = await db.greetings.update_one(
+    greeting = await db.greetings.find_one_and_update(
         {"id": greeting_id},
-        {"$set": {"approval_status": "approved"}}
+        {"$set": {"approval_status": "approved"}},
+        projection={**WISH_WALL_PROJECTION, "profile_id": 1}
     )
     
-    if result.matched_count == 0:
+    if not greeting:
         raise HTTPException(status_code=404, detail="Greeting not found")
     
+    publish_profile_event(greeting['profile_id'], "greeting.status", {"id": greeting_id, "approval_status": "approved"})
+    # The write already returned the greeting, so the wall needs no extra read
+    wish_wall_hub.publish_added(greeting['profile_id'], greeting)
+    
     return {"message": "Greeting approved successfully"}
 
 
 @api_router.put("/admin/greetings/{greeting_id}/reject")
 async def reject_greeting(greeting_id: str, admin_id: str = Depends(get_current_admin)):
     """PHASE 11: Reject a greeting"""
-    result = await db.greetings.update_one(
+    greeting = await db.greetings.find_one_and_update(
         {"id": greeting_id},
-        {"$set": {"approval_status": "rejected"}}
+        {"$set": {"approval_status": "rejected"}},
+        projection={"_id": 0, "id": 1, "profile_id": 1}
     )
     
-    if result.matched_count == 0:
+    if not greeting:
         raise HTTPException(status_code=404, detail="Greeting not found")
     
+    publish_profile_event(greeting['profile_id'], "greeting.status", {"id": greeting_id, "approval_status": "rejected"})
+    wish_wall_hub.publish_removed(greeting['profile_id'], greeting_id)
+    
     return {"message": "Greeting rejected successfully"}
 
 
 @api_router.delete("/admin/greetings/{greeting_id}")
 async def delete_greeting(greeting_id: str, admin_id: str = Depends(get_current_admin)):
     """PHASE 11: Delete a greeting"""
-    result = await db.greetings.delete_one({"id": greeting_id})
+    greeting = await db.greetings.find_one_and_delete(
+        {"id": greeting_id},
+        projection={"_id": 0, "id": 1, "profile_id": 1}
+    )
     
-    if result.deleted_count == 0:
+    if not greeting:
         raise HTTPException(status_code=404, detail="Greeting not found")
     
+    publish_profile_event(greeting['profile_id'], "greeting.deleted", {"id": greeting_id})
+    wish_wall_hub.publish_removed(greeting['profile_id'], greeting_id)
+    
     return {"message": "Greeting deleted successfully"}
 
 
+@api_router.get("/admin/profiles/{profile_id}/moderation/greetings", response_model=GreetingPage)
+async def list_greetings_for_moderation(
+    profile_id: str,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = MODERATION_PAGE_SIZE,
+    admin_data: dict = Depends(require_admin)
+):
+    """
+    Keyset-paginated greetings, newest first
+    
+    Pass next_cursor from the previous page as ?cursor= to continue.
+    """
+    await check_profile_ownership(profile_id, admin_data, db)
+    
+    if status and status not in ['pending', 'approved', 'rejected']:
+        raise HTTPException(status_code=400, detail="status must be one of: pending, approved, rejected")
+    
+    try:
+        items, next_cursor = await moderation_service.list_page(
+            "greetings", profile_id, status=status, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return GreetingPage(items=[GreetingResponse(**g) for g in items], next_cursor=next_cursor)
+
+
+@api_router.get("/admin/profiles/{profile_id}/moderation/wishes", response_model=GuestWishPage)
+async def list_wishes_for_moderation(
+    profile_id: str,
+    event_id: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = MODERATION_PAGE_SIZE,
+    admin_data: dict = Depends(require_admin)
+):
+    """Keyset-paginated guest wishes of a profile (optionally one event), newest first"""
+    await check_profile_ownership(profile_id, admin_data, db)
+    
+    if status and status not in ['pending', 'approved', 'rejected']:
+        raise HTTPException(status_code=400, detail="status must be one of: pending, approved, rejected")
+    
+    try:
+        items, next_cursor = await moderation_service.list_page(
+            "wishes", profile_id, status=status, event_id=event_id, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return GuestWishPage(items=[GuestWishResponse(**w) for w in items], next_cursor=next_cursor)
+
+
+@api_router.post("/admin/profiles/{profile_id}/moderation/greetings/bulk", response_model=BulkModerationResponse)
+async def bulk_moderate_greetings(
+    profile_id: str,
+    request_data: BulkModerationRequest,
+    admin_data: dict = Depends(require_admin)
+):
+    """Approve, reject or delete up to 500 greetings in one request"""
+    await check_profile_ownership(profile_id, admin_data, db)
+    
+    results, changed = await moderation_service.bulk_moderate(
+        "greetings", profile_id, request_data.ids, request_data.action
+    )
+    
+    if changed:
+        publish_profile_event(profile_id, "greeting.bulk", {
+            "action": request_data.action,
+            "ids": [item['id'] for item in changed]
+        })
+        # One reload refreshes the public wall for the whole batch
+        wish_wall_hub.publish_reload(profile_id)
+    
+    return BulkModerationResponse(
+        action=request_data.action,
+        requested=len(request_data.ids),
+        changed=len(changed),
+        results=results
+    )
+
+
+@api_router.post("/admin/profiles/{profile_id}/moderation/wishes/bulk", response_model=BulkModerationResponse)
+async def bulk_moderate_wishes(
+    profile_id: str,
+    request_data: BulkModerationRequest,
+    admin_data: dict = Depends(require_admin)
+):
+    """Approve, reject or delete up to 500 guest wishes in one request"""
+    await check_profile_ownership(profile_id, admin_data, db)
+    
+    results, changed = await moderation_service.bulk_moderate(
+        "wishes", profile_id, request_data.ids, request_data.action
+    )
+    
+    if changed:
+        publish_profile_event(profile_id, "wish.bulk", {
+            "action": request_data.action,
+            "items": changed
+        })
+        # Wishes only show on their own event's wall
+        wish_wall_hub.publish_reload(profile_id, {item['event_id'] for item in changed})
+    
+    return BulkModerationResponse(
+        action=request_data.action,
+        requested=len(request_data.ids),
+        changed=len(changed),
+        results=results
+    )
+
+
+@api_router.get("/admin/profiles/{profile_id}/live")
+async def stream_profile_live_feed(
+    profile_id: str,
+    request: Request,
+    admin_data: dict = Depends(require_admin)
+):
+    """
+    Live feed of RSVP, greeting, wish and reaction changes (Server-Sent Events)
+    
+    Events: ready, rsvp.created, rsvp.updated, greeting.created,
+    greeting.status, greeting.deleted, greeting.bulk, wish.created,
+    wish.deleted, wish.bulk, reaction.created, reaction.updated, and resync (client fell behind and
+    should refetch lists). Clients load the lists once, then apply deltas.
+    """
+    await check_profile_ownership(profile_id, admin_data, db)
+    
+    return StreamingResponse(
+        live_feed_hub.stream(profile_topic(profile_id), request.is_disconnected),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Disable proxy buffering (nginx)
+        }
+    )
+
+
+@api_router.websocket("/events/{event_id}/wish-wall")
+async def event_wish_wall(websocket: WebSocket, event_id: str):
+    """
+    Public event-day wish wall (WebSocket)
+    
+    Sends {"type": "snapshot", "entries": [...]} with the latest approved
+    greetings of the profile and approved guest wishes of this event on
+    connect, then {"type": "entry", "entry": {...}} for each newly approved
+    greeting, {"type": "remove", "id": ...} when a greeting is rejected or a
+    greeting or wish is deleted, and a fresh snapshot after bulk moderation.
+    Entries carry "kind": "greeting" or "wish". All viewers of an event
+    share one in-memory wall.
+    """
+    profile_id = await wish_wall_hub.resolve_profile(event_id)
+    if not profile_id:
+        await websocket.close(code=4404)
+        return
+    
+    await websocket.accept()
+    wall = None
+    try:
+        wall = await wish_wall_hub.connect(profile_id, event_id, websocket)
+        # Viewers only listen; reading keeps the socket open and detects disconnects
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logging.warning(f"Wish wall connection for event {event_id} ended: {e}")
+    finally:
+        if wall is not None:
+            wish_wall_hub.disconnect(wall, websocket)
+
+
 # ==================== RSVP ROUTES ====================
 
 @api_router.post("/rsvp", response_model=RSVPResponse)
@@ -3711,73 +4098,85 @@ async def submit_rsvp(
         if datetime.now(timezone.utc) > expires_at:
             raise HTTPException(status_code=403, detail="This invitation has expired. RSVP submissions are no longer available.")
     
-    # Check for duplicate RSVP (profile_id + guest_phone)
-    existing_rsvp = await db.rsvps.find_one({
+    # Single atomic upsert keyed by the unique (profile_id, guest_phone) index.
+    # The filter only matches an RSVP still inside its 48-hour edit window, so
+    # an older RSVP makes the upsert collide with the index instead.
+    now = datetime.now(timezone.utc)
+    edit_cutoff = now - timedelta(hours=48)
+    rsvp_id = str(uuid.uuid4())
+    rsvp_filter = {
         "profile_id": profile['id'],
-        "guest_phone": rsvp_data.guest_phone
-    }, {"_id": 0})
+        "guest_phone": rsvp_data.guest_phone,
+        "$or": [
+            {"created_at": {"$gte": edit_cutoff.isoformat()}},
+            {"created_at": {"$gte": edit_cutoff}}
+        ]
+    }
+    rsvp_update = {
+        "$set": {
+            "guest_name": content_filter.clean_text(rsvp_data.guest_name),
+            "status": rsvp_data.status,
+            "guest_count": rsvp_data.guest_count,
+            "message": content_filter.clean_text(rsvp_data.message)
+        },
+        "$setOnInsert": {
+            "id": rsvp_id,
+            "created_at": now.isoformat()
+        }
+    }
     
-    if existing_rsvp:
-        # PHASE 11: Check if within 48 hours - allow update instead
-        if isinstance(existing_rsvp.get('created_at'), str):
-            created_at = datetime.fromisoformat(existing_rsvp['created_at'])
-        else:
-            created_at = existing_rsvp['created_at']
-        
-        time_since_creation = datetime.now(timezone.utc) - created_at
-        if time_since_creation <= timedelta(hours=48):
-            # Update existing RSVP
-            update_doc = {
-                "guest_name": rsvp_data.guest_name,
-                "status": rsvp_data.status,
-                "guest_count": rsvp_data.guest_count,
-                "message": rsvp_data.message
-            }
-            
-            await db.rsvps.update_one(
-                {"id": existing_rsvp['id']},
-                {"$set": update_doc}
-            )
-            
-            # Fetch updated RSVP
-            updated_rsvp = await db.rsvps.find_one({"id": existing_rsvp['id']}, {"_id": 0})
-            if isinstance(updated_rsvp.get('created_at'), str):
-                updated_rsvp['created_at'] = datetime.fromisoformat(updated_rsvp['created_at'])
-            
-            return RSVPResponse(**updated_rsvp)
-        else:
+    # The previous version is returned so stats counters can apply the delta
+    try:
+        previous_rsvp = await db.rsvps.find_one_and_update(
+            rsvp_filter,
+            rsvp_update,
+            projection={"_id": 0},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+    except DuplicateKeyError:
+        # Either the existing RSVP is past its edit window, or a concurrent
+        # submission inserted it first - in which case this becomes an edit
+        update_only = {"$set": rsvp_update["$set"]}
+        previous_rsvp = await db.rsvps.find_one_and_update(
+            rsvp_filter,
+            update_only,
+            projection={"_id": 0},
+            return_document=ReturnDocument.BEFORE
+        )
+        if not previous_rsvp:
             raise HTTPException(
                 status_code=400,
                 detail="You have already submitted an RSVP. Edits are only allowed within 48 hours of submission."
             )
     
-    # Create RSVP
-    rsvp = RSVP(
-        profile_id=profile['id'],
-        guest_name=rsvp_data.guest_name,
-        guest_phone=rsvp_data.guest_phone,
-        status=rsvp_data.status,
-        guest_count=rsvp_data.guest_count,
-        message=rsvp_data.message
-    )
+    if previous_rsvp:
+        saved_rsvp = {**previous_rsvp, **rsvp_update["$set"]}
+    else:
+        saved_rsvp = {
+            "profile_id": profile['id'],
+            "guest_phone": rsvp_data.guest_phone,
+            **rsvp_update["$set"],
+            **rsvp_update["$setOnInsert"]
+        }
     
-    doc = rsvp.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
+    await rsvp_stats_service.record_change(profile['id'], previous_rsvp, saved_rsvp)
     
-    await db.rsvps.insert_one(doc)
+    if not previous_rsvp:
+        # PHASE 32: Track successful submission (resets CAPTCHA requirement)
+        await track_submission_attempt(slug, client_ip, device_id, "rsvp", True, captcha_check["requires_captcha"])
     
-    # PHASE 32: Track successful submission (resets CAPTCHA requirement)
-    await track_submission_attempt(slug, client_ip, device_id, "rsvp", True, captcha_check["requires_captcha"])
-    
-    return RSVPResponse(
-        id=rsvp.id,
-        guest_name=rsvp.guest_name,
-        guest_phone=rsvp.guest_phone,
-        status=rsvp.status,
-        guest_count=rsvp.guest_count,
-        message=rsvp.message,
-        created_at=rsvp.created_at
+    if isinstance(saved_rsvp.get('created_at'), str):
+        saved_rsvp['created_at'] = datetime.fromisoformat(saved_rsvp['created_at'])
+    
+    rsvp_response = RSVPResponse(**saved_rsvp)
+    publish_profile_event(
+        profile['id'],
+        "rsvp.updated" if previous_rsvp else "rsvp.created",
+        rsvp_response.model_dump()
     )
+    
+    return rsvp_response
 
 
 @api_router.get("/invite/{slug}/rsvp/check")
@@ -3885,10 +4284,10 @@ async def update_rsvp(rsvp_id: str, rsvp_data: RSVPCreate):
     
     # Update RSVP
     update_doc = {
-        "guest_name": rsvp_data.guest_name,
+        "guest_name": content_filter.clean_text(rsvp_data.guest_name),
         "status": rsvp_data.status,
         "guest_count": rsvp_data.guest_count,
-        "message": rsvp_data.message
+        "message": content_filter.clean_text(rsvp_data.message)
     }
     
     result = await db.rsvps.update_one(
@@ -3899,6 +4298,12 @@ async def update_rsvp(rsvp_id: str, rsvp_data: RSVPCreate):
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="RSVP not found or no changes made")
     
+    await rsvp_stats_service.record_change(
+        existing_rsvp['profile_id'],
+        existing_rsvp,
+        {**existing_rsvp, **update_doc}
+    )
+    
     # Fetch updated RSVP
     updated_rsvp = await db.rsvps.find_one({"id": rsvp_id}, {"_id": 0})
     
@@ -3906,7 +4311,10 @@ async def update_rsvp(rsvp_id: str, rsvp_data: RSVPCreate):
     if isinstance(updated_rsvp.get('created_at'), str):
         updated_rsvp['created_at'] = datetime.fromisoformat(updated_rsvp['created_at'])
     
-    return RSVPResponse(**updated_rsvp)
+    rsvp_response = RSVPResponse(**updated_rsvp)
+    publish_profile_event(existing_rsvp['profile_id'], "rsvp.updated", rsvp_response.model_dump())
+    
+    return rsvp_response
 
 
 @api_router.get("/admin/profiles/{profile_id}/rsvps", response_model=List[RSVPResponse])
@@ -3937,72 +4345,55 @@ async def get_profile_rsvps(
 
 @api_router.get("/admin/profiles/{profile_id}/rsvps/stats", response_model=RSVPStats)
 async def get_rsvp_stats(profile_id: str, admin_id: str = Depends(get_current_admin)):
-    """Get RSVP statistics for a profile"""
-    # Get all RSVPs for the profile
-    rsvps = await db.rsvps.find(
-        {"profile_id": profile_id},
-        {"_id": 0}
-    ).to_list(500)
-    
-    # Calculate statistics
-    total_rsvps = len(rsvps)
-    attending_count = sum(1 for r in rsvps if r['status'] == 'yes')
-    not_attending_count = sum(1 for r in rsvps if r['status'] == 'no')
-    maybe_count = sum(1 for r in rsvps if r['status'] == 'maybe')
-    total_guest_count = sum(r.get('guest_count', 1) for r in rsvps if r['status'] == 'yes')
+    """Get RSVP statistics for a profile (single read of the maintained counters)"""
+    stats = await rsvp_stats_service.get_stats(profile_id)
     
     return RSVPStats(
-        total_rsvps=total_rsvps,
-        attending_count=attending_count,
-        not_attending_count=not_attending_count,
-        maybe_count=maybe_count,
-        total_guest_count=total_guest_count
+        total_rsvps=stats['total'],
+        attending_count=stats['status'].get('yes', 0),
+        not_attending_count=stats['status'].get('no', 0),
+        maybe_count=stats['status'].get('maybe', 0),
+        total_guest_count=stats['guests'].get('yes', 0)
     )
 
 
 @api_router.get("/admin/profiles/{profile_id}/rsvps/export")
-async def export_rsvps_csv(profile_id: str, admin_id: str = Depends(get_current_admin)):
-    """Export RSVPs as CSV"""
-    from fastapi.responses import StreamingResponse
-    import io
-    import csv
-    
-    # Fetch all RSVPs
-    rsvps = await db.rsvps.find(
-        {"profile_id": profile_id},
-        {"_id": 0}
-    ).sort("created_at", -1).to_list(500)
-    
-    # Convert to CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
+async def export_rsvps(
+    profile_id: str,
+    format: str = "csv",
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    admin_id: str = Depends(get_current_admin)
+):
+    """
+    Export RSVPs as CSV, XLSX or Parquet
     
-    # Write header
-    writer.writerow(['Guest Name', 'Phone', 'Status', 'Guest Count', 'Message', 'Submitted At'])
+    Streams every matching RSVP straight from a MongoDB cursor (no row cap).
+    Optional filters: status (comma-separated yes/no/maybe) and submission
+    date range (date_from / date_to, ISO 8601).
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+        )
     
-    # Write data
-    for rsvp in rsvps:
-        created_at = rsvp.get('created_at')
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at)
-        
-        writer.writerow([
-            rsvp.get('guest_name', ''),
-            rsvp.get('guest_phone', ''),
-            rsvp.get('status', ''),
-            rsvp.get('guest_count', 1),
-            rsvp.get('message', ''),
-            created_at.strftime('%Y-%m-%d %H:%M:%S') if created_at else ''
-        ])
+    statuses = None
+    if status:
+        statuses = [s.strip() for s in status.split(',') if s.strip()]
+        invalid = [s for s in statuses if s not in ['yes', 'no', 'maybe']]
+        if invalid:
+            raise HTTPException(status_code=400, detail="status must be one of: yes, no, maybe")
     
-    # Prepare response
-    output.seek(0)
+    query = build_rsvp_export_query(profile_id, statuses, date_from, date_to)
+    cursor = db.rsvps.find(query, EXPORT_PROJECTION).sort("created_at", -1).batch_size(EXPORT_BATCH_SIZE)
     
     return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
+        stream_rsvp_export(cursor, format),
+        media_type=EXPORT_FORMATS[format],
         headers={
-            "Content-Disposition": f"attachment; filename=rsvps_{profile_id}.csv"
+            "Content-Disposition": f"attachment; filename=rsvps_{profile_id}.{format}"
         }
     )
 
@@ -4314,333 +4705,9 @@ async def get_analytics_summary(profile_id: str, date_range: str = "7d", admin_i
 
 # ==================== PDF GENERATION ====================
 
-# Design theme color mappings for PDF
-THEME_COLORS = {
-    'temple_divine': {'primary': (139, 115, 85), 'secondary': (212, 175, 55), 'text': (74, 55, 40), 'bg': (255, 248, 231)},
-    'royal_classic': {'primary': (139, 0, 0), 'secondary': (255, 215, 0), 'text': (74, 26, 26), 'bg': (255, 245, 230)},
-    'floral_soft': {'primary': (255, 182, 193), 'secondary': (255, 218, 185), 'text': (107, 78, 113), 'bg': (255, 240, 245)},
-    'cinematic_luxury': {'primary': (26, 26, 26), 'secondary': (212, 175, 55), 'text': (245, 245, 245), 'bg': (44, 44, 44)},
-    'heritage_scroll': {'primary': (139, 90, 43), 'secondary': (205, 133, 63), 'text': (74, 48, 23), 'bg': (250, 240, 230)},
-    'minimal_elegant': {'primary': (128, 128, 128), 'secondary': (169, 169, 169), 'text': (64, 64, 64), 'bg': (255, 255, 255)},
-    'modern_premium': {'primary': (47, 79, 79), 'secondary': (72, 209, 204), 'text': (245, 245, 245), 'bg': (32, 32, 32)},
-    'artistic_handcrafted': {'primary': (160, 82, 45), 'secondary': (210, 180, 140), 'text': (101, 67, 33), 'bg': (255, 250, 240)}
-}
-
-# Language templates for PDF
-LANGUAGE_TEMPLATES = {
-    'english': {
-        'opening_title': 'Wedding Invitation',
-        'couple_label': 'Join us in celebrating the union of',
-        'events_title': 'Event Schedule',
-        'date_label': 'Date',
-        'time_label': 'Time',
-        'venue_label': 'Venue',
-        'contact_title': 'Contact Information',
-        'groom_label': 'Groom',
-        'bride_label': 'Bride'
-    },
-    'telugu': {
-        'opening_title': 'వివాహ ఆహ్వానం',
-        'couple_label': 'మా వివాహ వేడుకలో పాల్గొనండి',
-        'events_title': 'కార్యక్రమ షెడ్యూల్',
-        'date_label': 'తేదీ',
-        'time_label': 'సమయం',
-        'venue_label': 'స్థలం',
-        'contact_title': 'సంప్రదించండి',
-        'groom_label': 'వరుడు',
-        'bride_label': 'వధువు'
-    },
-    'hindi': {
-        'opening_title': 'विवाह निमंत्रण',
-        'couple_label': 'हमारे विवाह समारोह में शामिल हों',
-        'events_title': 'कार्यक्रम कार्यक्रम',
-        'date_label': 'तारीख',
-        'time_label': 'समय',
-        'venue_label': 'स्थान',
-        'contact_title': 'संपर्क जानकारी',
-        'groom_label': 'वर',
-        'bride_label': 'वधू'
-    },
-    'tamil': {
-        'opening_title': 'திருமண அழைப்பிதழ்',
-        'couple_label': 'எங்கள் திருமண நிகழ்வில் சேரவும்',
-        'events_title': 'நிகழ்வு அட்டவணை',
-        'date_label': 'தேதி',
-        'time_label': 'நேரம்',
-        'venue_label': 'இடம்',
-        'contact_title': 'தொடர்பு தகவல்',
-        'groom_label': 'மணமகன்',
-        'bride_label': 'மணமகள்'
-    },
-    'kannada': {
-        'opening_title': 'ಮದುವೆ ಆಮಂತ್ರಣ',
-        'couple_label': 'ನಮ್ಮ ಮದುವೆ ಸಮಾರಂಭದಲ್ಲಿ ಸೇರಿ',
-        'events_title': 'ಕಾರ್ಯಕ್ರಮದ ವೇಳಾಪಟ್ಟಿ',
-        'date_label': 'ದಿನಾಂಕ',
-        'time_label': 'ಸಮಯ',
-        'venue_label': 'ಸ್ಥಳ',
-        'contact_title': 'ಸಂಪರ್ಕ ಮಾಹಿತಿ',
-        'groom_label': 'ವರ',
-        'bride_label': 'ವಧು'
-    },
-    'malayalam': {
-        'opening_title': 'വിവാഹ ക്ഷണം',
-        'couple_label': 'ഞങ്ങളുടെ വിവാഹ ചടങ്ങിൽ പങ്കെടുക്കൂ',
-        'events_title': 'പരിപാടി ഷെഡ്യൂൾ',
-        'date_label': 'തീയതി',
-        'time_label': 'സമയം',
-        'venue_label': 'സ്ഥലം',
-        'contact_title': 'ബന്ധപ്പെടുക',
-        'groom_label': 'വരൻ',
-        'bride_label': 'വധു'
-    }
-}
-
-
-def get_theme_colors(design_id: str):
-    """Get theme colors for PDF generation"""
-    return THEME_COLORS.get(design_id, THEME_COLORS['royal_classic'])
-
-
-def get_language_text(language: str):
-    """Get language-specific text for PDF"""
-    return LANGUAGE_TEMPLATES.get(language, LANGUAGE_TEMPLATES['english'])
-
-
-def rgb_to_reportlab_color(rgb_tuple):
-    """Convert RGB tuple to ReportLab color"""
-    r, g, b = rgb_tuple
-    return rl_colors.Color(r/255.0, g/255.0, b/255.0)
-
-
 async def generate_invitation_pdf(profile: dict, language: str = 'english'):
     """Generate PDF invitation from profile data"""
-    buffer = io.BytesIO()
-    
-    # Get theme colors and language text
-    theme = get_theme_colors(profile.get('design_id', 'royal_classic'))
-    lang_text = get_language_text(language)
-    
-    # Convert colors
-    primary_color = rgb_to_reportlab_color(theme['primary'])
-    secondary_color = rgb_to_reportlab_color(theme['secondary'])
-    text_color = rgb_to_reportlab_color(theme['text'])
-    
-    # Get deity background path if present
-    deity_id = profile.get('deity_id')
-    deity_bg_path = None
-    if deity_id and deity_id != 'none':
-        # Map deity IDs to local file paths
-        deity_file_map = {
-            'ganesha': '/app/frontend/public/assets/deities/ganesha_desktop.jpg',
-            'venkateswara_padmavati': '/app/frontend/public/assets/deities/venkateswara_padmavati_desktop.jpg',
-            'shiva_parvati': '/app/frontend/public/assets/deities/shiva_parvati_desktop.jpg',
-            'lakshmi_vishnu': '/app/frontend/public/assets/deities/lakshmi_vishnu_desktop.jpg'
-        }
-        deity_bg_path = deity_file_map.get(deity_id)
-    
-    # Create PDF document
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=0.75*inch,
-        leftMargin=0.75*inch,
-        topMargin=0.75*inch,
-        bottomMargin=0.75*inch
-    )
-    
-    # Container for PDF elements
-    story = []
-    
-    # Define styles
-    styles = getSampleStyleSheet()
-    
-    # Title style
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=28,
-        textColor=primary_color,
-        spaceAfter=20,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    # Heading style
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=18,
-        textColor=secondary_color,
-        spaceAfter=12,
-        spaceBefore=20,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    # Subheading style
-    subheading_style = ParagraphStyle(
-        'CustomSubHeading',
-        parent=styles['Heading3'],
-        fontSize=14,
-        textColor=primary_color,
-        spaceAfter=8,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    # Body style
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=text_color,
-        spaceAfter=6,
-        alignment=TA_LEFT,
-        fontName='Helvetica'
-    )
-    
-    # Center body style
-    center_body_style = ParagraphStyle(
-        'CustomCenterBody',
-        parent=body_style,
-        alignment=TA_CENTER
-    )
-    
-    # Add title
-    story.append(Paragraph(lang_text['opening_title'], title_style))
-    story.append(Spacer(1, 0.3*inch))
-    
-    # Add couple names
-    story.append(Paragraph(lang_text['couple_label'], center_body_style))
-    story.append(Spacer(1, 0.2*inch))
-    
-    couple_text = f"<b>{profile['groom_name']}</b> & <b>{profile['bride_name']}</b>"
-    story.append(Paragraph(couple_text, heading_style))
-    story.append(Spacer(1, 0.4*inch))
-    
-    # Add events section
-    events = profile.get('events', [])
-    visible_events = [e for e in events if e.get('visible', True)]
-    
-    if visible_events:
-        story.append(Paragraph(lang_text['events_title'], heading_style))
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Sort events by date
-        sorted_events = sorted(visible_events, key=lambda x: x.get('date', ''))
-        
-        for event in sorted_events:
-            # Event name
-            event_name_style = ParagraphStyle(
-                'EventName',
-                parent=subheading_style,
-                fontSize=14,
-                textColor=primary_color,
-                alignment=TA_LEFT
-            )
-            story.append(Paragraph(f"<b>{event['name']}</b>", event_name_style))
-            story.append(Spacer(1, 0.1*inch))
-            
-            # Event details
-            date_str = event.get('date', '')
-            time_str = event.get('start_time', '')
-            if event.get('end_time'):
-                time_str += f" - {event['end_time']}"
-            
-            story.append(Paragraph(f"<b>{lang_text['date_label']}:</b> {date_str}", body_style))
-            story.append(Paragraph(f"<b>{lang_text['time_label']}:</b> {time_str}", body_style))
-            story.append(Paragraph(f"<b>{lang_text['venue_label']}:</b> {event.get('venue_name', '')}", body_style))
-            story.append(Paragraph(f"{event.get('venue_address', '')}", body_style))
-            
-            if event.get('description'):
-                story.append(Spacer(1, 0.05*inch))
-                story.append(Paragraph(event['description'], body_style))
-            
-            story.append(Spacer(1, 0.25*inch))
-    
-    # Add contact information
-    if profile.get('whatsapp_groom') or profile.get('whatsapp_bride'):
-        story.append(Spacer(1, 0.3*inch))
-        story.append(Paragraph(lang_text['contact_title'], heading_style))
-        story.append(Spacer(1, 0.15*inch))
-        
-        if profile.get('whatsapp_groom'):
-            story.append(Paragraph(
-                f"<b>{lang_text['groom_label']}:</b> {profile['whatsapp_groom']}", 
-                body_style
-            ))
-        
-        if profile.get('whatsapp_bride'):
-            story.append(Paragraph(
-                f"<b>{lang_text['bride_label']}:</b> {profile['whatsapp_bride']}", 
-                body_style
-            ))
-    
-    # Build PDF with deity background if present
-    if deity_bg_path and os.path.exists(deity_bg_path):
-        def add_deity_background(canvas_obj, doc_obj):
-            """Add deity background with very light opacity"""
-            canvas_obj.saveState()
-            try:
-                # Load and compress deity image
-                img = PILImage.open(deity_bg_path)
-                
-                # Resize to optimize file size (max 800px width)
-                max_width = 800
-                if img.width > max_width:
-                    ratio = max_width / img.width
-                    new_height = int(img.height * ratio)
-                    img = img.resize((max_width, new_height), PILImage.Resampling.LANCZOS)
-                
-                # Convert to RGB if needed
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Save compressed image to buffer
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format='JPEG', quality=70, optimize=True)
-                img_buffer.seek(0)
-                
-                # Create ReportLab Image
-                img_reader = ImageReader(img_buffer)
-                
-                # Calculate centered position
-                page_width, page_height = A4
-                img_width, img_height = img.size
-                
-                # Scale to fit page while maintaining aspect ratio
-                scale = min(page_width / img_width, page_height / img_height)
-                scaled_width = img_width * scale
-                scaled_height = img_height * scale
-                
-                # Center on page
-                x = (page_width - scaled_width) / 2
-                y = (page_height - scaled_height) / 2
-                
-                # Draw with very light opacity (0.12)
-                canvas_obj.setFillAlpha(0.12)
-                canvas_obj.drawImage(
-                    img_reader, 
-                    x, y, 
-                    width=scaled_width, 
-                    height=scaled_height,
-                    preserveAspectRatio=True,
-                    mask='auto'
-                )
-            except Exception as e:
-                # If deity image fails, continue without it
-                logging.warning(f"Failed to add deity background: {e}")
-            finally:
-                canvas_obj.restoreState()
-        
-        doc.build(story, onFirstPage=add_deity_background, onLaterPages=add_deity_background)
-    else:
-        doc.build(story)
-    
-    # Get PDF data
-    buffer.seek(0)
-    return buffer
+    return io.BytesIO(render_invitation_pdf(profile, language))
 
 
 @api_router.get("/admin/profiles/{profile_id}/download-pdf")
@@ -4660,9 +4727,7 @@ async def download_invitation_pdf(
     pdf_buffer = await generate_invitation_pdf(profile, language)
     
     # Create filename
-    groom_name = re.sub(r'[^a-zA-Z]', '', profile['groom_name'].split()[0].lower())
-    bride_name = re.sub(r'[^a-zA-Z]', '', profile['bride_name'].split()[0].lower())
-    filename = f"wedding-invitation-{groom_name}-{bride_name}.pdf"
+    filename = build_pdf_filename(profile)
     
     # Return PDF as download
     return StreamingResponse(
@@ -4674,6 +4739,54 @@ async def download_invitation_pdf(
     )
 
 
+@api_router.post("/admin/profiles/download-pdf-bundle")
+async def download_invitation_pdf_bundle(
+    bundle_request: BulkPDFExportRequest,
+    admin_data: dict = Depends(require_admin)
+):
+    """
+    Render invitation PDFs for several profiles and languages as one ZIP (admin only)
+    
+    Renders run in parallel worker processes and finished PDFs are streamed
+    into the archive while the rest are still rendering.
+    """
+    languages = bundle_request.languages or list(LANGUAGE_TEMPLATES.keys())
+    invalid_languages = [lang for lang in languages if lang not in LANGUAGE_TEMPLATES]
+    if invalid_languages:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported languages: {', '.join(invalid_languages)}"
+        )
+    
+    profile_ids = list(dict.fromkeys(bundle_request.profile_ids))
+    if len(profile_ids) > MAX_BULK_PDF_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {MAX_BULK_PDF_PROFILES} profiles per bundle"
+        )
+    
+    # PHASE 35: Only profiles owned by this admin (Super Admin sees all)
+    query = build_isolation_query({"id": {"$in": profile_ids}}, admin_data)
+    profiles = await db.profiles.find(query, {"_id": 0}).to_list(len(profile_ids))
+    
+    if not profiles:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    jobs = []
+    for profile in profiles:
+        folder = profile.get('slug') or profile['id']
+        for language in languages:
+            jobs.append((f"{folder}/{build_pdf_filename(profile, language)}", profile, language))
+    
+    return StreamingResponse(
+        stream_invitation_pdf_zip(jobs),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": "attachment; filename=wedding-invitations.zip"
+        }
+    )
+
+
 # ==================== CONFIGURATION ROUTES ====================
 
 @api_router.get("/config/designs")
@@ -4791,9 +4904,17 @@ async def get_languages():
 # ==================== PHASE 11: QR CODE & CALENDAR ROUTES ====================
 
 @api_router.get("/invite/{slug}/qr")
-async def generate_qr_code(slug: str):
-    """PHASE 11: Generate QR code for invitation link"""
-    profile = await db.profiles.find_one({"slug": slug}, {"_id": 0})
+async def generate_qr_code(slug: str, request: Request, format: str = "png"):
+    """
+    PHASE 11: Generate QR code for invitation link
+    
+    Images are cached by encoded URL and served with an ETag,
+    so repeat downloads get a 304. format=svg returns a vector image for print.
+    """
+    if format not in QR_FORMATS:
+        raise HTTPException(status_code=400, detail="Format must be png or svg")
+    
+    profile = await db.profiles.find_one({"slug": slug}, {"_id": 1})
     
     if not profile:
         raise HTTPException(status_code=404, detail="Invitation not found")
@@ -4801,30 +4922,132 @@ async def generate_qr_code(slug: str):
     # Build invitation URL
     invitation_url = f"https://wedding-mate-1.preview.emergentagent.com/invite/{slug}"
     
-    # Create QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
+    image_data, etag, media_type = get_qr_code(invitation_url, error_correction='L', fmt=format)
+    
+    return conditional_response(request, image_data, media_type, etag, max_age=86400)
+
+
+@api_router.post("/admin/profiles/{profile_id}/guest-qr-sheet")
+async def download_guest_qr_sheet(
+    profile_id: str,
+    file: Optional[UploadFile] = File(None),
+    admin_data: dict = Depends(require_admin)
+):
+    """
+    Generate a print-ready PDF of personalized guest QR codes (admin only)
+    
+    Guests come from an uploaded CSV (column guest_name or name) or, when no
+    file is sent, from the profile's existing RSVPs. Each card encodes the
+    invitation link with the guest's name; QR codes render in worker processes.
+    """
+    profile = await check_profile_ownership(profile_id, admin_data, db)
+    
+    guest_names = []
+    if file:
+        try:
+            content = (await file.read()).decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="Guest list must be a UTF-8 CSV file")
+        
+        reader = csv.DictReader(io.StringIO(content))
+        fieldnames = [name.strip().lower() for name in (reader.fieldnames or [])]
+        if 'guest_name' not in fieldnames and 'name' not in fieldnames:
+            raise HTTPException(status_code=400, detail="CSV must have a guest_name or name column")
+        
+        for row in reader:
+            row = {(key or '').strip().lower(): (value or '').strip() for key, value in row.items()}
+            name = row.get('guest_name') or row.get('name')
+            if name:
+                guest_names.append(name)
+    else:
+        async for rsvp in db.rsvps.find({"profile_id": profile_id}, {"_id": 0, "guest_name": 1}).sort("created_at", 1):
+            guest_names.append(rsvp['guest_name'])
+    
+    if not guest_names:
+        raise HTTPException(status_code=400, detail="No guests found")
+    
+    if len(guest_names) > MAX_GUEST_QR_SHEET_GUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {MAX_GUEST_QR_SHEET_GUESTS} guests per QR sheet"
+        )
+    
+    base_url = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
+    invitation_url = f"{base_url}/invite/{profile['slug']}"
+    guests = [
+        (name, f"{invitation_url}?guest={urllib.parse.quote(name)}")
+        for name in guest_names
+    ]
+    
+    title = f"{profile['groom_name']} & {profile['bride_name']}"
+    pdf_data = await generate_guest_qr_sheet(title, guests)
+    
+    filename = build_pdf_filename(profile).replace("wedding-invitation-", "guest-qr-cards-")
+    
+    return StreamingResponse(
+        io.BytesIO(pdf_data),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        }
     )
-    qr.add_data(invitation_url)
-    qr.make(fit=True)
+
+
+@api_router.post("/admin/profiles/{profile_id}/guests/import", response_model=GuestImportResponse)
+async def import_guest_list(
+    profile_id: str,
+    file: UploadFile = File(...),
+    admin_data: dict = Depends(require_admin)
+):
+    """
+    Import a guest list spreadsheet (.csv or .xlsx, admin only)
+    
+    Needs a name and a phone column; guest_count and group are optional.
+    Phone numbers are normalized to E.164 (local numbers default to +91).
+    Rows that are invalid, repeated in the file, already on the guest list or
+    already RSVPed are skipped and listed in the returned report.
+    """
+    await check_profile_ownership(profile_id, admin_data, db)
     
-    img = qr.make_image(fill_color="black", back_color="white")
+    content = await file.read(MAX_GUEST_IMPORT_BYTES + 1)
+    if len(content) > MAX_GUEST_IMPORT_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Guest list file must be under {MAX_GUEST_IMPORT_BYTES // (1024 * 1024)}MB"
+        )
     
-    # Convert to bytes
-    img_bytes = BytesIO()
-    img.save(img_bytes, format='PNG')
-    img_bytes.seek(0)
+    try:
+        result = await guest_import_service.import_guests(profile_id, content, file.filename or "")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Guest list CSV must be UTF-8 encoded")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return StreamingResponse(img_bytes, media_type="image/png")
+    return GuestImportResponse(profile_id=profile_id, **result)
+
+
+@api_router.get("/admin/profiles/{profile_id}/guests", response_model=List[Guest])
+async def get_guest_list(
+    profile_id: str,
+    skip: int = 0,
+    limit: int = 500,
+    admin_data: dict = Depends(require_admin)
+):
+    """Get a profile's imported guest list (admin only)"""
+    await check_profile_ownership(profile_id, admin_data, db)
+    
+    guests = await db.guests.find(
+        {"profile_id": profile_id},
+        {"_id": 0}
+    ).sort("created_at", 1).skip(max(skip, 0)).limit(min(max(limit, 1), 1000)).to_list(None)
+    
+    return [Guest(**guest) for guest in guests]
 
 
 @api_router.get("/invite/{slug}/calendar")
-async def download_calendar(slug: str):
+async def download_calendar(slug: str, request: Request):
     """PHASE 11: Generate .ics calendar file for wedding events"""
-    profile = await db.profiles.find_one({"slug": slug}, {"_id": 0})
+    profile = await db.profiles.find_one({"slug": slug}, CALENDAR_PROFILE_PROJECTION)
     
     if not profile:
         raise HTTPException(status_code=404, detail="Invitation not found")
@@ -4832,99 +5055,72 @@ async def download_calendar(slug: str):
     if not await check_profile_active(profile):
         raise HTTPException(status_code=410, detail="This invitation link has expired")
     
-    # Convert date string if needed
-    if isinstance(profile.get('event_date'), str):
-        profile['event_date'] = datetime.fromisoformat(profile['event_date'])
+    ics_content, etag = get_invitation_calendar(profile)
     
-    # Get events
-    events = profile.get('events', [])
+    # Return as downloadable file
+    filename = f"wedding-{profile['groom_name']}-{profile['bride_name']}.ics".replace(" ", "-").lower()
     
-    # Build .ics file content
-    ics_lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//Wedding Invitation//EN",
-        "CALSCALE:GREGORIAN",
-        "METHOD:PUBLISH"
-    ]
+    return conditional_response(
+        request,
+        ics_content,
+        "text/calendar",
+        etag,
+        last_modified=calendar_last_modified(profile),
+        max_age=300,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        }
+    )
+
+
+@api_router.get("/calendar/{slug}.ics")
+async def get_calendar_feed(slug: str, request: Request):
+    """
+    Subscribable calendar feed for a wedding (webcal://)
     
-    # If events exist, use those; otherwise use main event_date
-    if events and len(events) > 0:
-        for event in events:
-            if not event.get('visible', True):
-                continue
-            
-            # Parse event date and time
-            event_date = datetime.strptime(event['date'], '%Y-%m-%d')
-            start_time_parts = event['start_time'].split(':')
-            event_datetime = event_date.replace(
-                hour=int(start_time_parts[0]),
-                minute=int(start_time_parts[1])
-            )
-            
-            # End time (default to 2 hours later if not specified)
-            if event.get('end_time'):
-                end_time_parts = event['end_time'].split(':')
-                end_datetime = event_date.replace(
-                    hour=int(end_time_parts[0]),
-                    minute=int(end_time_parts[1])
-                )
-            else:
-                end_datetime = event_datetime + timedelta(hours=2)
-            
-            # Format dates for .ics
-            dtstart = event_datetime.strftime('%Y%m%dT%H%M%S')
-            dtend = end_datetime.strftime('%Y%m%dT%H%M%S')
-            
-            ics_lines.extend([
-                "BEGIN:VEVENT",
-                f"UID:{event.get('event_id', str(uuid.uuid4()))}@wedding-invitation",
-                f"DTSTAMP:{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}",
-                f"DTSTART:{dtstart}",
-                f"DTEND:{dtend}",
-                f"SUMMARY:{event['name']} - {profile['groom_name']} & {profile['bride_name']}",
-                f"LOCATION:{event['venue_name']}, {event['venue_address']}",
-                f"DESCRIPTION:{event.get('description', '')}",
-                "STATUS:CONFIRMED",
-                "END:VEVENT"
-            ])
-    else:
-        # Use main event_date
-        event_datetime = profile['event_date']
-        end_datetime = event_datetime + timedelta(hours=4)
-        
-        dtstart = event_datetime.strftime('%Y%m%dT%H%M%S')
-        dtend = end_datetime.strftime('%Y%m%dT%H%M%S')
-        
-        ics_lines.extend([
-            "BEGIN:VEVENT",
-            f"UID:{profile['id']}@wedding-invitation",
-            f"DTSTAMP:{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}",
-            f"DTSTART:{dtstart}",
-            f"DTEND:{dtend}",
-            f"SUMMARY:{profile['event_type'].title()} - {profile['groom_name']} & {profile['bride_name']}",
-            f"LOCATION:{profile['venue']}, {profile.get('city', '')}",
-            f"DESCRIPTION:Join us for our {profile['event_type']}",
-            "STATUS:CONFIRMED",
-            "END:VEVENT"
-        ])
-    
-    ics_lines.append("END:VCALENDAR")
-    ics_content = "\r\n".join(ics_lines)
+    Calendar apps poll this URL; unchanged schedules are answered with 304
+    via ETag/Last-Modified, and the .ics is only rebuilt after event edits.
+    """
+    profile = await db.profiles.find_one({"slug": slug}, CALENDAR_PROFILE_PROJECTION)
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Invitation not found")
     
-    # Return as downloadable file
-    from fastapi.responses import Response
-    filename = f"wedding-{profile['groom_name']}-{profile['bride_name']}.ics".replace(" ", "-").lower()
+    if not await check_profile_active(profile):
+        raise HTTPException(status_code=410, detail="This invitation link has expired")
     
-    return Response(
-        content=ics_content,
-        media_type="text/calendar",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"'
-        }
+    ics_content, etag = get_invitation_calendar(profile)
+    
+    return conditional_response(
+        request,
+        ics_content,
+        "text/calendar; charset=utf-8",
+        etag,
+        last_modified=calendar_last_modified(profile),
+        max_age=300
     )
 
 
+@api_router.get("/calendar/{slug}/subscribe")
+async def get_calendar_subscription(slug: str, request: Request):
+    """Get webcal:// subscription link for a wedding's calendar feed"""
+    profile = await db.profiles.find_one({"slug": slug}, {"_id": 0, "is_active": 1, "link_expiry_date": 1})
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Invitation not found")
+    
+    if not await check_profile_active(profile):
+        raise HTTPException(status_code=410, detail="This invitation link has expired")
+    
+    feed_url = str(request.url_for("get_calendar_feed", slug=slug))
+    webcal_url = re.sub(r'^https?://', 'webcal://', feed_url)
+    
+    return {
+        "feed_url": feed_url,
+        "webcal_url": webcal_url
+    }
+
+
 # ============================================================================
 # PHASE 22: EVENT-WISE BACKGROUND & DESIGN ENGINE API ENDPOINTS
 # ============================================================================
@@ -5086,7 +5282,7 @@ async def update_event_background(
             raise HTTPException(status_code=500, detail="Failed to update event background")
         
         # Create audit log
-        await db.audit_logs.insert_one({
+        audit_log_pipeline.enqueue({
             "id": str(uuid.uuid4()),
             "admin_id": admin.admin_id,
             "action": "update_event_background",
@@ -5343,7 +5539,7 @@ async def update_event_lord_settings(
             raise HTTPException(status_code=500, detail="Failed to update event lord settings")
         
         # Create audit log
-        await db.audit_logs.insert_one({
+        audit_log_pipeline.enqueue({
             "id": str(uuid.uuid4()),
             "admin_id": admin.admin_id,
             "action": "update_event_lord_settings",
@@ -5563,7 +5759,7 @@ async def upload_hero_video(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "hero_video_uploaded",
         "resource_type": "event",
@@ -5686,7 +5882,7 @@ async def upload_message_video(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "message_video_uploaded",
         "resource_type": "event",
@@ -5802,7 +5998,7 @@ async def upload_background_music(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "background_music_uploaded",
         "resource_type": "event",
@@ -5885,7 +6081,7 @@ async def delete_hero_video(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "hero_video_deleted",
         "resource_type": "event",
@@ -5952,7 +6148,7 @@ async def delete_message_video(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "message_video_deleted",
         "resource_type": "event",
@@ -6019,7 +6215,7 @@ async def delete_background_music(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "background_music_deleted",
         "resource_type": "event",
@@ -6071,7 +6267,7 @@ async def toggle_hero_video(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "hero_video_toggled",
         "resource_type": "event",
@@ -6123,7 +6319,7 @@ async def toggle_message_video(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "message_video_toggled",
         "resource_type": "event",
@@ -6175,7 +6371,7 @@ async def toggle_background_music(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "background_music_toggled",
         "resource_type": "event",
@@ -6249,8 +6445,8 @@ async def create_guest_wish(
     guest_wish = GuestWish(
         event_id=event_id,
         profile_id=profile['id'],
-        guest_name=wish_data.guest_name,
-        message=wish_data.message,
+        guest_name=content_filter.clean_text(wish_data.guest_name),
+        message=content_filter.clean_text(wish_data.message),
         emoji=wish_data.emoji,
         ip_address=ip_address
     )
@@ -6272,9 +6468,12 @@ async def create_guest_wish(
         upsert=False
     )
     
+    wish_response = GuestWishResponse(**guest_wish.model_dump())
+    publish_profile_event(profile['id'], "wish.created", wish_response.model_dump())
+    
     return {
         "message": "Wish created successfully",
-        "wish": GuestWishResponse(**guest_wish.model_dump())
+        "wish": wish_response
     }
 
 
@@ -6290,13 +6489,15 @@ async def get_event_wishes(
     SECURITY FIX: Changed to admin-only endpoint
     Guests should not be able to view all wishes - only approved ones show on public invitation
     """
+    # Only approved wishes; ones stored before moderation existed count as approved
     wishes = await db.guest_wishes.find(
-        {"event_id": event_id},
+        {"event_id": event_id, "approval_status": {"$in": ["approved", None]}},
         {"_id": 0}
     ).sort("created_at", -1).limit(limit).to_list(limit)
     
     # Convert datetime strings
     for wish in wishes:
+        wish.setdefault('approval_status', 'approved')
         if isinstance(wish.get('created_at'), str):
             wish['created_at'] = datetime.fromisoformat(wish['created_at'])
     
@@ -6314,11 +6515,17 @@ async def delete_guest_wish(
     """
     PHASE 25: Admin delete a guest wish
     """
-    result = await db.guest_wishes.delete_one({"id": wish_id})
+    wish = await db.guest_wishes.find_one_and_delete(
+        {"id": wish_id},
+        projection={"_id": 0, "id": 1, "event_id": 1, "profile_id": 1}
+    )
     
-    if result.deleted_count == 0:
+    if not wish:
         raise HTTPException(status_code=404, detail="Wish not found")
     
+    publish_profile_event(wish['profile_id'], "wish.deleted", {"id": wish_id, "event_id": wish['event_id']})
+    wish_wall_hub.publish_removed(wish['profile_id'], wish_id)
+    
     return {"message": "Wish deleted successfully"}
 
 
@@ -6361,45 +6568,30 @@ async def create_guest_reaction(
             detail="Reactions are disabled for this event"
         )
     
-    # Check if IP already reacted today
-    existing_reaction = await db.guest_reactions.find_one({
-        "event_id": event_id,
-        "ip_address": ip_address
-    })
+    previous_type = await reaction_service.react(
+        event_id, profile['id'], ip_address, reaction_data.reaction_type
+    )
     
-    if existing_reaction:
-        # Update existing reaction
-        await db.guest_reactions.update_one(
-            {"id": existing_reaction['id']},
-            {
-                "$set": {
-                    "reaction_type": reaction_data.reaction_type,
-                    "created_at": datetime.now(timezone.utc).isoformat()
-                }
-            }
-        )
+    if previous_type:
+        publish_profile_event(profile['id'], "reaction.updated", {
+            "event_id": event_id,
+            "reaction_type": reaction_data.reaction_type,
+            "previous_reaction_type": previous_type
+        })
         return {
             "message": "Reaction updated successfully",
             "reaction_type": reaction_data.reaction_type
         }
-    else:
-        # Create new reaction
-        guest_reaction = GuestReaction(
-            event_id=event_id,
-            profile_id=profile['id'],
-            reaction_type=reaction_data.reaction_type,
-            ip_address=ip_address
-        )
-        
-        doc = guest_reaction.model_dump()
-        doc['created_at'] = doc['created_at'].isoformat()
-        
-        await db.guest_reactions.insert_one(doc)
-        
-        return {
-            "message": "Reaction created successfully",
-            "reaction_type": reaction_data.reaction_type
-        }
+    
+    publish_profile_event(profile['id'], "reaction.created", {
+        "event_id": event_id,
+        "reaction_type": reaction_data.reaction_type
+    })
+    
+    return {
+        "message": "Reaction created successfully",
+        "reaction_type": reaction_data.reaction_type
+    }
 
 
 @api_router.get("/events/{event_id}/reactions")
@@ -6407,25 +6599,9 @@ async def get_event_reactions(event_id: str):
     """
     PHASE 25: Get reaction statistics for an event
     
-    Public endpoint - returns aggregate counts only
+    Public endpoint - returns aggregate counts only (one counter document read)
     """
-    reactions = await db.guest_reactions.find(
-        {"event_id": event_id},
-        {"_id": 0, "reaction_type": 1}
-    ).to_list(1000)
-    
-    # Count reactions by type
-    love_count = sum(1 for r in reactions if r.get('reaction_type') == 'love')
-    blessings_count = sum(1 for r in reactions if r.get('reaction_type') == 'blessings')
-    excited_count = sum(1 for r in reactions if r.get('reaction_type') == 'excited')
-    
-    return GuestReactionStats(
-        event_id=event_id,
-        love_count=love_count,
-        blessings_count=blessings_count,
-        excited_count=excited_count,
-        total_reactions=len(reactions)
-    )
+    return GuestReactionStats(**await reaction_service.get_stats(event_id))
 
 
 @api_router.patch("/admin/events/{event_id}/engagement-settings")
@@ -6480,7 +6656,7 @@ async def update_event_engagement_settings(
     )
     
     # Create audit log
-    await db.audit_logs.insert_one({
+    audit_log_pipeline.enqueue({
         "id": str(uuid.uuid4()),
         "action": "event_engagement_settings_updated",
         "resource_type": "event",
@@ -6528,25 +6704,16 @@ async def translate_content(
             detail="Translation rate limit exceeded. Please try again in a minute."
         )
     
-    # Generate content hash for cache lookup
-    content_hash = hashlib.md5(
-        f"{request_data.content}_{request_data.target_language}".encode()
-    ).hexdigest()
-    
-    # Check cache first
-    cached_translation = await db.translation_cache.find_one(
-        {
-            "content_hash": content_hash,
-            "target_language": request_data.target_language,
-            "expires_at": {"$gt": datetime.now(timezone.utc).isoformat()}
-        },
-        {"_id": 0}
+    # Check cache first (in-process LRU, then MongoDB)
+    cached_translation = await translation_cache_service.get(
+        request_data.content,
+        request_data.target_language
     )
     
-    if cached_translation:
+    if cached_translation is not None:
         return TranslationResponse(
             original_content=request_data.content,
-            translated_content=cached_translation['translated_content'],
+            translated_content=cached_translation,
             source_language="en",
             target_language=request_data.target_language,
             cached=True
@@ -6560,19 +6727,14 @@ async def translate_content(
             context=request_data.context
         )
         
-        # Cache the translation (expires in 7 days)
-        cache_entry = {
-            "id": str(uuid.uuid4()),
-            "content_hash": content_hash,
-            "original_language": "en",
-            "target_language": request_data.target_language,
-            "original_content": request_data.content,
-            "translated_content": translated_text,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "expires_at": (datetime.now(timezone.utc) + timedelta(days=7)).isoformat()
-        }
-        
-        await db.translation_cache.insert_one(cache_entry)
+        # Cache the translation (expires in 7 days); text that came back
+        # unchanged is not a translation and must be retried next time
+        if translated_text.strip() != request_data.content.strip():
+            await translation_cache_service.set(
+                request_data.content,
+                request_data.target_language,
+                translated_text
+            )
         
         return TranslationResponse(
             original_content=request_data.content,
@@ -6594,6 +6756,46 @@ async def translate_content(
         )
 
 
+@api_router.get("/admin/translation-cache/stats")
+async def get_translation_cache_stats(admin_id: str = Depends(require_super_admin)):
+    """PHASE 26: Translation cache hit/miss/size metrics (Super Admin only)"""
+    return translation_cache_service.stats()
+
+
+@api_router.get("/admin/ai/stats")
+async def get_ai_client_stats(admin_id: str = Depends(require_super_admin)):
+    """PHASE 26: AI client call/timeout/circuit breaker metrics (Super Admin only)"""
+    return {
+        **ai_service.stats(),
+        'suggestion_pools': suggestion_pool_service.stats()
+    }
+
+
+@api_router.post("/admin/profiles/{profile_id}/pretranslate")
+async def pretranslate_profile(
+    profile_id: str,
+    admin_data: dict = Depends(require_admin)
+):
+    """
+    PHASE 26: Pre-translate profile content into all enabled languages
+
+    Runs the same batched translation as publish, e.g. after editing content.
+    Cached segments are reused, so only changed text reaches the LLM.
+    """
+    await check_profile_ownership(profile_id, admin_data, db)
+
+    try:
+        counts = await pretranslation_service.pretranslate_profile(profile_id)
+    except Exception as e:
+        logger.error(f"Pre-translation error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to pre-translate profile")
+
+    return {
+        "profile_id": profile_id,
+        "translated_segments": counts
+    }
+
+
 @api_router.post("/admin/generate-event-description", response_model=GenerateDescriptionResponse)
 async def generate_event_description(
     request_data: GenerateDescriptionRequest,
@@ -6621,7 +6823,7 @@ async def generate_event_description(
         )
         
         # Create audit log
-        await db.audit_logs.insert_one({
+        audit_log_pipeline.enqueue({
             "id": str(uuid.uuid4()),
             "action": "ai_description_generated",
             "resource_type": "event",
@@ -6651,32 +6853,19 @@ async def generate_event_description(
 @api_router.get("/rsvp-suggestions", response_model=RSVPSuggestionsResponse)
 async def get_rsvp_suggestions(
     event_type: str = "marriage",
-    guest_name: Optional[str] = None
+    guest_name: Optional[str] = None,
+    language: str = "en"
 ):
     """
     PHASE 26: Get AI-generated RSVP message suggestions
     
     Guest endpoint - No authentication required
-    Returns 3 contextual message suggestions
+    Returns 3 contextual message suggestions sampled from the precomputed
+    pool for the event type and language (no LLM call per request)
     """
-    try:
-        suggestions = await ai_service.generate_rsvp_suggestions(
-            event_type=event_type,
-            guest_name=guest_name
-        )
-        
-        return RSVPSuggestionsResponse(suggestions=suggestions)
-    
-    except Exception as e:
-        logger.error(f"RSVP suggestions error: {e}")
-        # Return fallback suggestions
-        return RSVPSuggestionsResponse(
-            suggestions=[
-                "Can't wait to celebrate with you! 🎉",
-                "Blessings to the beautiful couple ❤️",
-                "Excited for your special day! 💐"
-            ]
-        )
+    return RSVPSuggestionsResponse(
+        suggestions=suggestion_pool_service.sample(event_type, language)
+    )
 
 
 @api_router.get("/admin/guest-insights/{profile_id}", response_model=GuestInsightsResponse)
@@ -6690,81 +6879,44 @@ async def get_guest_insights(
     Admin endpoint - Analyzes RSVP data and provides insights
     """
     # Get profile
-    profile = await db.profiles.find_one({"id": profile_id}, {"_id": 0})
+    profile = await db.profiles.find_one({"id": profile_id}, {"_id": 0, "created_at": 1})
     
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
-    # Get all RSVPs for this profile
-    rsvps = await db.rsvps.find({"profile_id": profile_id}, {"_id": 0}).to_list(length=None)
-    
-    # Calculate statistics
-    total_rsvps = len(rsvps)
-    confirmed = sum(1 for r in rsvps if r.get('status') == 'confirmed')
-    declined = sum(1 for r in rsvps if r.get('status') == 'declined')
-    pending = sum(1 for r in rsvps if r.get('status') == 'pending')
-    with_messages = sum(1 for r in rsvps if r.get('message') and len(r.get('message', '').strip()) > 0)
-    
-    # Calculate early and late responses
-    # Get the profile creation date as reference
-    profile_created = datetime.fromisoformat(profile.get('created_at', datetime.now(timezone.utc).isoformat()))
-    early_responses = 0
-    late_responses = 0
-    
-    for rsvp in rsvps:
-        rsvp_time = datetime.fromisoformat(rsvp.get('created_at', datetime.now(timezone.utc).isoformat()))
-        time_diff = (rsvp_time - profile_created).total_seconds() / 3600  # hours
-        
-        if time_diff <= 24:
-            early_responses += 1
-        elif time_diff > 72:
-            late_responses += 1
-    
-    # Prepare data for AI insights
-    rsvp_data = {
-        'total': total_rsvps,
-        'confirmed': confirmed,
-        'declined': declined,
-        'pending': pending,
-        'early_responses': early_responses,
-        'late_responses': late_responses,
-        'with_messages': with_messages
-    }
-    
-    # Generate insights using AI
-    try:
-        insights_text = await ai_service.generate_guest_insights(rsvp_data)
-    except Exception as e:
-        logger.error(f"Guest insights generation error: {e}")
-        # Fallback insights
-        confirmed_rate = (confirmed / max(total_rsvps, 1)) * 100
-        insights_text = f"You have received {total_rsvps} RSVPs so far, with {confirmed_rate:.0f}% confirming attendance."
+    # Stats come from an aggregation pipeline; the LLM is only called when they changed
+    stats, insights_text, generated_at, cached = await guest_insights_service.get_insights(
+        profile_id,
+        profile.get('created_at')
+    )
     
     # Create audit log
-    await db.audit_logs.insert_one({
-        "id": str(uuid.uuid4()),
-        "action": "guest_insights_generated",
-        "resource_type": "profile",
-        "resource_id": profile_id,
-        "admin_id": admin_id,
-        "details": {
-            "total_rsvps": total_rsvps,
-            "confirmed": confirmed
-        },
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    })
+    if not cached:
+        audit_log_pipeline.enqueue({
+            "id": str(uuid.uuid4()),
+            "action": "guest_insights_generated",
+            "resource_type": "profile",
+            "resource_id": profile_id,
+            "admin_id": admin_id,
+            "details": {
+                "total_rsvps": stats['total'],
+                "confirmed": stats['confirmed']
+            },
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        })
     
     return GuestInsightsResponse(
         profile_id=profile_id,
-        total_rsvps=total_rsvps,
-        confirmed=confirmed,
-        declined=declined,
-        pending=pending,
-        early_responses=early_responses,
-        late_responses=late_responses,
-        with_messages=with_messages,
+        total_rsvps=stats['total'],
+        confirmed=stats['confirmed'],
+        declined=stats['declined'],
+        pending=stats['pending'],
+        early_responses=stats['early_responses'],
+        late_responses=stats['late_responses'],
+        with_messages=stats['with_messages'],
         insights_text=insights_text,
-        generated_at=datetime.now(timezone.utc)
+        generated_at=generated_at,
+        cached=cached
     )
 
 
@@ -6856,7 +7008,7 @@ async def create_or_update_thank_you_message(
             thank_you_id = thank_you.id
         
         # Create audit log
-        await audit_logs_collection.insert_one(
+        audit_log_pipeline.enqueue(
             AuditLog(
                 action="thank_you_message_update",
                 admin_id=admin["id"],
@@ -7075,7 +7227,7 @@ async def upload_wedding_album_media(
             uploaded_media.append(media.model_dump())
         
         # Create audit log
-        await audit_logs_collection.insert_one(
+        audit_log_pipeline.enqueue(
             AuditLog(
                 action="wedding_album_upload",
                 admin_id=admin["id"],
@@ -7202,7 +7354,7 @@ async def delete_album_media(
         
         # Create audit log
         profile = await profiles_collection.find_one({"id": profile_id})
-        await audit_logs_collection.insert_one(
+        audit_log_pipeline.enqueue(
             AuditLog(
                 action="wedding_album_delete",
                 admin_id=admin["id"],
@@ -7457,13 +7609,17 @@ async def get_event_share_metadata(event_id: str):
 @api_router.get("/profiles/{slug_url}/qr-code", response_model=QRCodeResponse)
 async def generate_profile_qr_code(
     slug_url: str,
-    size: int = 300
+    request: Request,
+    response: Response,
+    size: int = 300,
+    format: str = "png"
 ):
     """
     PHASE 28: Generate QR code for full wedding invitation
     
     Creates a QR code that guests can scan to view the full invitation.
-    Returns base64 encoded PNG image.
+    Returns base64 encoded PNG (or SVG with format=svg) image.
+    Rendered images are cached and the response carries an ETag for conditional GET.
     
     Public endpoint - no authentication required (for guest convenience).
     Admins can use this to download QR codes for print materials.
@@ -7471,14 +7627,20 @@ async def generate_profile_qr_code(
     Args:
         slug_url: Profile slug URL
         size: QR code size in pixels (100-1000, default 300)
+        format: png or svg
     """
     try:
         # Validate size
         if size < 100 or size > 1000:
             raise HTTPException(status_code=400, detail="Size must be between 100 and 1000")
+        if format not in QR_FORMATS:
+            raise HTTPException(status_code=400, detail="Format must be png or svg")
         
         # Verify profile exists
-        profile = await db.profiles.find_one({"slug_url": slug_url})
+        profile = await db.profiles.find_one(
+            {"slug_url": slug_url},
+            {"_id": 0, "bride_name": 1, "groom_name": 1}
+        )
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         
@@ -7486,36 +7648,28 @@ async def generate_profile_qr_code(
         base_url = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
         full_url = f"{base_url}/invitation/{slug_url}"
         
-        # Generate QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,  # High error correction
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(full_url)
-        qr.make(fit=True)
-        
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Resize to requested size
-        img = img.resize((size, size), PILImage.Resampling.LANCZOS)
-        
-        # Convert to base64
-        buffered = BytesIO()
-        img.save(buffered, format="PNG")
-        img_base64 = base64.b64encode(buffered.getvalue()).decode()
-        
         # Create filename
         bride_name = profile.get('bride_name', 'bride').replace(' ', '_').lower()
         groom_name = profile.get('groom_name', 'groom').replace(' ', '_').lower()
-        filename = f"wedding_qr_{bride_name}_{groom_name}.png"
+        filename = f"wedding_qr_{bride_name}_{groom_name}.{format}"
+        
+        # Generate QR code (high error correction), cached by URL/size/format
+        image_data, image_etag, media_type = get_qr_code(full_url, error_correction='H', size=size, fmt=format)
+        
+        # The body also carries the filename, so a rename must change the ETag
+        etag = qr_response_etag(image_etag, filename)
+        if is_not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "public, max-age=3600"
+        
+        img_base64 = base64.b64encode(image_data).decode()
         
         return QRCodeResponse(
             qr_code_base64=img_base64,
             download_filename=filename,
-            url=full_url
+            url=full_url,
+            media_type=media_type
         )
         
     except HTTPException:
@@ -7528,29 +7682,36 @@ async def generate_profile_qr_code(
 @api_router.get("/events/{event_id}/qr-code", response_model=QRCodeResponse)
 async def generate_event_qr_code(
     event_id: str,
-    size: int = 300
+    request: Request,
+    response: Response,
+    size: int = 300,
+    format: str = "png"
 ):
     """
     PHASE 28: Generate QR code for specific event
     
     Creates a QR code for individual event that links directly to that event
-    on the invitation page.
+    on the invitation page. Cached and ETag-aware like the profile QR code.
     
     Public endpoint - no authentication required.
     
     Args:
         event_id: Event ID
         size: QR code size in pixels (100-1000, default 300)
+        format: png or svg
     """
     try:
         # Validate size
         if size < 100 or size > 1000:
             raise HTTPException(status_code=400, detail="Size must be between 100 and 1000")
+        if format not in QR_FORMATS:
+            raise HTTPException(status_code=400, detail="Format must be png or svg")
         
         # Find profile with this event
-        profile = await db.profiles.find_one({
-            "events.event_id": event_id
-        })
+        profile = await db.profiles.find_one(
+            {"events.event_id": event_id},
+            {"_id": 0, "slug_url": 1, "bride_name": 1, "groom_name": 1, "events.event_id": 1, "events.event_type": 1}
+        )
         
         if not profile:
             raise HTTPException(status_code=404, detail="Event not found")
@@ -7569,37 +7730,29 @@ async def generate_event_qr_code(
         base_url = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
         full_url = f"{base_url}/invitation/{profile['slug_url']}?event={event_id}"
         
-        # Generate QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(full_url)
-        qr.make(fit=True)
-        
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Resize to requested size
-        img = img.resize((size, size), PILImage.Resampling.LANCZOS)
-        
-        # Convert to base64
-        buffered = BytesIO()
-        img.save(buffered, format="PNG")
-        img_base64 = base64.b64encode(buffered.getvalue()).decode()
-        
         # Create filename
         event_type = event.get('event_type', 'event').lower()
         bride_name = profile.get('bride_name', 'bride').replace(' ', '_').lower()
         groom_name = profile.get('groom_name', 'groom').replace(' ', '_').lower()
-        filename = f"wedding_qr_{event_type}_{bride_name}_{groom_name}.png"
+        filename = f"wedding_qr_{event_type}_{bride_name}_{groom_name}.{format}"
+        
+        # Generate QR code (high error correction), cached by URL/size/format
+        image_data, image_etag, media_type = get_qr_code(full_url, error_correction='H', size=size, fmt=format)
+        
+        # The body also carries the filename, so a rename must change the ETag
+        etag = qr_response_etag(image_etag, filename)
+        if is_not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "public, max-age=3600"
+        
+        img_base64 = base64.b64encode(image_data).decode()
         
         return QRCodeResponse(
             qr_code_base64=img_base64,
             download_filename=filename,
-            url=full_url
+            url=full_url,
+            media_type=media_type
         )
         
     except HTTPException:
@@ -7615,47 +7768,11 @@ async def save_profile_version(profile_id: str, admin_id: str, version_type: str
     """
     PHASE 29E: Save a profile version snapshot
     
-    Creates a snapshot of the current profile state for rollback capability.
-    Maintains only the last 5 versions per profile.
+    Stored as a compressed diff against the previous version (with periodic
+    full keyframes); the last 50 versions per profile are kept.
     """
     try:
-        # Get current profile data
-        profile = await db.profiles.find_one({"id": profile_id}, {"_id": 0})
-        if not profile:
-            return None
-        
-        # Get current version count
-        version_count = await db.profile_versions.count_documents({"profile_id": profile_id})
-        next_version = version_count + 1
-        
-        # Create version snapshot
-        version = ProfileVersion(
-            profile_id=profile_id,
-            version_number=next_version,
-            snapshot_data=profile,
-            admin_id=admin_id,
-            version_type=version_type
-        )
-        
-        # Convert to dict and serialize dates
-        version_dict = version.model_dump()
-        version_dict['created_at'] = version_dict['created_at'].isoformat()
-        
-        # Insert version
-        await db.profile_versions.insert_one(version_dict)
-        
-        # Keep only last 5 versions - delete older ones
-        versions = await db.profile_versions.find(
-            {"profile_id": profile_id}
-        ).sort("version_number", -1).to_list(length=100)
-        
-        if len(versions) > 5:
-            # Delete versions beyond the last 5
-            old_version_ids = [v['id'] for v in versions[5:]]
-            await db.profile_versions.delete_many({"id": {"$in": old_version_ids}})
-        
-        return version_dict
-        
+        return await profile_version_service.save(profile_id, admin_id, version_type)
     except Exception as e:
         logger.error(f"Error saving profile version: {str(e)}")
         return None
@@ -7695,29 +7812,24 @@ async def get_profile_versions(
     """
     PHASE 29E: Get version history for a profile
     
-    Returns list of all saved versions (up to last 5) for the profile.
+    Returns list of all saved versions (up to last 50) for the profile.
     Used to show version history UI and enable rollback.
     """
     try:
         # Verify profile exists
-        profile = await db.profiles.find_one({"id": profile_id}, {"_id": 0})
+        profile = await db.profiles.find_one({"id": profile_id}, {"_id": 0, "id": 1})
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         
-        # Get versions sorted by version number (newest first)
-        versions_cursor = db.profile_versions.find(
-            {"profile_id": profile_id}
-        ).sort("version_number", -1)
-        
-        versions_list = await versions_cursor.to_list(length=5)
+        # Newest first, metadata only (payloads stay compressed in the DB)
+        versions_list = await profile_version_service.list_versions(profile_id)
         
         # Convert dates
         for v in versions_list:
             if isinstance(v.get('created_at'), str):
                 v['created_at'] = datetime.fromisoformat(v['created_at'])
         
-        # Get current version number
-        current_version = len(versions_list)
+        current_version = versions_list[0]['version_number'] if versions_list else 0
         
         return ProfileVersionListResponse(
             versions=[ProfileVersionResponse(**v) for v in versions_list],
@@ -7745,20 +7857,17 @@ async def restore_profile_version(
     Creates a new version before restoring (for undo capability).
     """
     try:
-        # Get the version to restore
-        version = await db.profile_versions.find_one(
-            {"id": restore_request.version_id, "profile_id": profile_id},
-            {"_id": 0}
-        )
+        # Rebuild the version from its keyframe and diffs
+        restored = await profile_version_service.get_snapshot(profile_id, restore_request.version_id)
         
-        if not version:
+        if not restored:
             raise HTTPException(status_code=404, detail="Version not found")
+        version, snapshot_data = restored
         
         # Save current state before restoring (for undo)
         await save_profile_version(profile_id, admin_id, "auto_save")
         
         # Restore the snapshot data
-        snapshot_data = version['snapshot_data']
         snapshot_data['updated_at'] = datetime.now(timezone.utc).isoformat()
         
         # Update profile with snapshot data
@@ -8043,48 +8152,43 @@ async def get_analytics_summary(
         )
         
         # === RSVP ANALYTICS ===
-        rsvp_filter = {"profile_id": profile_id}
+        # Read from the maintained counters instead of recounting RSVPs
+        rsvp_stats = await rsvp_stats_service.get_stats(profile_id)
+        event_stats = rsvp_stats.get('events', {})
         if event_id:
-            rsvp_filter["event_id"] = event_id
-        
-        rsvps = list(await db.rsvps.find(rsvp_filter).to_list(length=10000))
+            rsvp_counters = event_stats.get(event_id, {})
+            event_stats = {event_id: rsvp_counters} if rsvp_counters else {}
+        else:
+            rsvp_counters = rsvp_stats
         
-        total_rsvps = len(rsvps)
+        total_rsvps = rsvp_counters.get('total', 0)
         conversion_rate = (total_rsvps / total_views * 100) if total_views > 0 else 0
         
-        accepted_count = len([r for r in rsvps if r.get("status") == "accepted"])
-        declined_count = len([r for r in rsvps if r.get("status") == "declined"])
-        pending_count = len([r for r in rsvps if r.get("status") == "pending"])
-        
-        # RSVP by event
-        event_rsvp_counts = defaultdict(lambda: {"accepted": 0, "declined": 0, "pending": 0})
-        for r in rsvps:
-            event_id_key = r.get("event_id", "unknown")
-            status = r.get("status", "pending")
-            event_rsvp_counts[event_id_key][status] += 1
+        accepted_count = rsvp_counters.get('status', {}).get("accepted", 0)
+        declined_count = rsvp_counters.get('status', {}).get("declined", 0)
+        pending_count = rsvp_counters.get('status', {}).get("pending", 0)
         
         # Get event names
         rsvp_by_event = []
-        for eid, counts in event_rsvp_counts.items():
+        for eid, counters in event_stats.items():
+            if not counters.get('total'):
+                continue
             event = await db.event_invitations.find_one({"id": eid})
             event_name = event.get("event_name", "Unknown Event") if event else "Unknown Event"
             rsvp_by_event.append({
                 "event_id": eid,
                 "event_name": event_name,
-                "accepted": counts["accepted"],
-                "declined": counts["declined"],
-                "pending": counts["pending"]
+                "accepted": counters.get('status', {}).get("accepted", 0),
+                "declined": counters.get('status', {}).get("declined", 0),
+                "pending": counters.get('status', {}).get("pending", 0)
             })
         
         # Peak RSVP time
-        rsvp_time_counts = defaultdict(int)
-        for r in rsvps:
-            if r.get("created_at"):
-                dt = r["created_at"]
-                date_str = dt.strftime("%Y-%m-%d")
-                hour = dt.hour
-                key = f"{date_str}_{hour}"
-                rsvp_time_counts[key] += 1
+        rsvp_time_counts = {
+            key: count
+            for key, count in rsvp_counters.get('hours', {}).items()
+            if count > 0
+        }
         
         peak_rsvp_time = None
         if rsvp_time_counts:
@@ -8632,7 +8736,7 @@ async def update_profile_plan(
         )
         
         # Log admin action
-        await db.audit_logs.insert_one({
+        audit_log_pipeline.enqueue({
             "id": str(uuid.uuid4()),
             "admin_id": admin_id,
             "profile_id": profile_id,
@@ -8826,7 +8930,7 @@ async def create_payment_order(
         await db.payments.insert_one(payment_data)
         
         # Log audit trail
-        await db.audit_logs.insert_one({
+        audit_log_pipeline.enqueue({
             "admin_id": current_admin.get("admin_id"),
             "action": "payment_order_created",
             "resource_type": "payment",
@@ -8978,7 +9082,7 @@ async def verify_payment(
         )
         
         # Log audit trail
-        await db.audit_logs.insert_one({
+        audit_log_pipeline.enqueue({
             "admin_id": payment.get("admin_id"),
             "action": "plan_activated_via_payment",
             "resource_type": "profile",
@@ -9164,47 +9268,13 @@ async def check_referral_abuse(referrer_profile_id: str, user_ip: str, device_fi
 async def award_referral_credits(referrer_profile_id: str, referral_id: str, credits: int):
     """Award credits to referrer"""
     try:
-        # Get or create credit wallet
-        wallet = await db.credit_wallets.find_one({"profile_id": referrer_profile_id})
-        
-        if not wallet:
-            # Create new wallet
-            wallet = {
-                "profile_id": referrer_profile_id,
-                "balance": credits,
-                "earned_total": credits,
-                "spent_total": 0,
-                "expired_total": 0,
-                "last_updated": datetime.now(timezone.utc)
-            }
-            await db.credit_wallets.insert_one(wallet)
-        else:
-            # Update existing wallet
-            await db.credit_wallets.update_one(
-                {"profile_id": referrer_profile_id},
-                {
-                    "$inc": {
-                        "balance": credits,
-                        "earned_total": credits
-                    },
-                    "$set": {
-                        "last_updated": datetime.now(timezone.utc)
-                    }
-                }
-            )
-        
-        # Create transaction record
-        transaction = {
-            "transaction_id": f"txn_{uuid.uuid4().hex[:16]}",
-            "profile_id": referrer_profile_id,
-            "type": "referral_reward",
-            "amount": credits,
-            "balance_after": wallet.get("balance", 0) + credits,
-            "description": f"Referral reward for referral {referral_id}",
-            "metadata": {"referral_id": referral_id},
-            "created_at": datetime.now(timezone.utc)
-        }
-        await db.credit_transactions.insert_one(transaction)
+        await credit_wallet_service.credit(
+            referrer_profile_id,
+            credits,
+            CreditTransactionType.REFERRAL_REWARD,
+            f"Referral reward for referral {referral_id}",
+            metadata={"referral_id": referral_id}
+        )
         
         logger.info(f"✅ Awarded {credits} credits to profile {referrer_profile_id}")
         
@@ -9459,20 +9529,8 @@ async def get_credit_wallet(
     PHASE 35: Get credit wallet balance and history
     """
     try:
-        # Get wallet
-        wallet = await db.credit_wallets.find_one({"profile_id": profile_id})
-        
-        if not wallet:
-            # Create empty wallet
-            wallet = {
-                "profile_id": profile_id,
-                "balance": 0,
-                "earned_total": 0,
-                "spent_total": 0,
-                "expired_total": 0,
-                "last_updated": datetime.now(timezone.utc)
-            }
-            await db.credit_wallets.insert_one(wallet)
+        # Get wallet (created empty on first access)
+        wallet = await credit_wallet_service.get_wallet(profile_id)
         
         # Get recent transactions
         transactions_cursor = db.credit_transactions.find({
@@ -9512,12 +9570,6 @@ async def spend_credits(
     PHASE 35: Spend credits to unlock features or extend plan
     """
     try:
-        # Get wallet
-        wallet = await db.credit_wallets.find_one({"profile_id": profile_id})
-        
-        if not wallet or wallet.get("balance", 0) <= 0:
-            raise ErrorResponse.bad_request("Insufficient credits")
-        
         credits_to_spend = 0
         benefit_description = ""
         benefit_expires_at = None
@@ -9535,42 +9587,23 @@ async def spend_credits(
             benefit_expires_at = datetime.now(timezone.utc) + timedelta(days=days)
             benefit_description = f"Extended plan by {days} day(s)"
         
-        # Check sufficient balance
-        if wallet.get("balance", 0) < credits_to_spend:
-            raise ErrorResponse.bad_request(
-                f"Insufficient credits. Need {credits_to_spend}, have {wallet.get('balance', 0)}"
-            )
-        
-        # Deduct credits
-        new_balance = wallet["balance"] - credits_to_spend
-        await db.credit_wallets.update_one(
-            {"profile_id": profile_id},
-            {
-                "$inc": {
-                    "spent_total": credits_to_spend
-                },
-                "$set": {
-                    "balance": new_balance,
-                    "last_updated": datetime.now(timezone.utc)
-                }
-            }
-        )
-        
-        # Create transaction
-        transaction = {
-            "transaction_id": f"txn_{uuid.uuid4().hex[:16]}",
-            "profile_id": profile_id,
-            "type": request.spend_type,
-            "amount": -credits_to_spend,
-            "balance_after": new_balance,
-            "description": benefit_description,
-            "metadata": {
+        # Deduct credits (only succeeds while the balance covers them)
+        wallet = await credit_wallet_service.debit(
+            profile_id,
+            credits_to_spend,
+            CreditTransactionType(request.spend_type),
+            benefit_description,
+            metadata={
                 "feature_name": request.feature_name,
                 "extension_days": request.extension_days
-            },
-            "created_at": datetime.now(timezone.utc)
-        }
-        await db.credit_transactions.insert_one(transaction)
+            }
+        )
+        if wallet is None:
+            balance = await credit_wallet_service.get_balance(profile_id)
+            raise ErrorResponse.bad_request(
+                f"Insufficient credits. Need {credits_to_spend}, have {balance}"
+            )
+        new_balance = wallet["balance"]
         
         # Apply benefit
         if request.spend_type == "plan_extension":
@@ -9686,18 +9719,17 @@ async def admin_referral_override(
             if not request.credits_amount:
                 raise ErrorResponse.bad_request("credits_amount required")
             
-            await db.credit_wallets.update_one(
-                {"profile_id": referral["referrer_profile_id"]},
-                {
-                    "$inc": {
-                        "balance": -request.credits_amount,
-                        "spent_total": request.credits_amount
-                    }
-                }
+            await credit_wallet_service.debit(
+                referral["referrer_profile_id"],
+                request.credits_amount,
+                CreditTransactionType.ADMIN_DEDUCT,
+                f"Credits revoked for referral {request.referral_id}",
+                metadata={"referral_id": request.referral_id},
+                allow_negative=True
             )
         
         # Log audit
-        await db.audit_logs.insert_one({
+        audit_log_pipeline.enqueue({
             "admin_id": current_admin.get("admin_id"),
             "action": f"referral_override_{request.action}",
             "resource_type": "referral",
@@ -9971,7 +10003,7 @@ async def update_profile_theme(
         updated_theme_settings = updated_profile.get("theme_settings", {})
         
         # Audit log
-        await db.audit_logs.insert_one({
+        audit_log_pipeline.enqueue({
             "log_id": f"audit_{uuid.uuid4().hex[:16]}",
             "admin_id": current_admin.get("admin_id"),
             "profile_id": profile_id,
@@ -10336,27 +10368,16 @@ async def purchase_template(
         
         # If fully paid with credits
         if remaining_amount <= 0:
-            # Deduct credits
-            await db.credit_wallets.update_one(
-                {"profile_id": profile_id},
-                {
-                    "$inc": {
-                        "balance": -credits_to_use,
-                        "spent_total": credits_to_use
-                    },
-                    "$push": {
-                        "transactions": {
-                            "transaction_id": str(uuid.uuid4()),
-                            "type": CreditTransactionType.SPENT.value,
-                            "amount": -credits_to_use,
-                            "balance_after": wallet['balance'] - credits_to_use,
-                            "description": f"Template purchase: {template['name']}",
-                            "metadata": {"template_id": template_id},
-                            "created_at": datetime.now(timezone.utc).isoformat()
-                        }
-                    }
-                }
+            # Deduct credits (the balance may have changed since the check above)
+            wallet = await credit_wallet_service.debit(
+                profile_id,
+                credits_to_use,
+                CreditTransactionType.TEMPLATE_PURCHASE,
+                f"Template purchase: {template['name']}",
+                metadata={"template_id": template_id}
             )
+            if wallet is None:
+                raise HTTPException(status_code=400, detail="Insufficient credits")
             
             # Calculate creator earnings
             creator_percentage = 70  # Default 70% to creator
@@ -10996,7 +11017,7 @@ async def admin_review_template(
             },
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
-        await db.audit_logs.insert_one(audit_log)
+        audit_log_pipeline.enqueue(audit_log)
         
         return {
             "success": True,
@@ -11104,7 +11125,7 @@ async def admin_manage_creator(
             },
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
-        await db.audit_logs.insert_one(audit_log)
+        audit_log_pipeline.enqueue(audit_log)
         
         return {
             "success": True,
@@ -11404,11 +11425,14 @@ async def update_wedding_status(
 @api_router.post("/api/weddings/{wedding_id}/publish")
 async def publish_wedding(
     wedding_id: str,
+    background_tasks: BackgroundTasks,
     current_admin: dict = Depends(get_current_admin)
 ):
     """
     Publish a wedding - deducts credits atomically
     This is the main publish endpoint
+    
+    Content is pre-translated into enabled languages after the response is sent.
     """
     try:
         admin_id = current_admin['id']
@@ -11418,6 +11442,8 @@ async def publish_wedding(
             admin_id
         )
         
+        background_tasks.add_task(pretranslation_service.pretranslate_profile_safely, wedding_id)
+        
         return result
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -11568,6 +11594,129 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_indexes():
+    """Create MongoDB indexes the request paths rely on"""
+    try:
+        await translation_cache_service.ensure_indexes()
+        await guest_insights_service.ensure_indexes()
+        await rsvp_stats_service.ensure_indexes()
+        await guest_import_service.ensure_indexes()
+        await reaction_service.ensure_indexes()
+        await moderation_service.ensure_indexes()
+        await audit_log_pipeline.ensure_indexes()
+        await profile_version_service.ensure_indexes()
+        await credit_wallet_service.ensure_indexes()
+        await db.rsvps.create_index(
+            [("profile_id", 1), ("created_at", -1)],
+            name="profile_id_created_at"
+        )
+    except Exception as e:
+        logger.error(f"Failed to create indexes: {e}")
+
+
+async def create_rsvp_phone_index():
+    # Also serves profile_id-only RSVP queries (index prefix)
+    await db.rsvps.create_index(
+        [("profile_id", 1), ("guest_phone", 1)],
+        unique=True,
+        name="profile_id_guest_phone_unique"
+    )
+
+
+async def merge_duplicate_rsvps() -> int:
+    """
+    Collapse RSVPs that older find-then-insert writes duplicated per
+    (profile_id, guest_phone) into one: the latest answer is kept with the
+    earliest created_at, so the 48-hour edit window still starts at the
+    guest's first submission. Returns the number of RSVPs removed.
+    """
+    pipeline = [
+        # _id order is insertion order (created_at mixes strings and dates)
+        {"$sort": {"_id": -1}},
+        {"$group": {
+            "_id": {"profile_id": "$profile_id", "guest_phone": "$guest_phone"},
+            "ids": {"$push": "$_id"},
+            "first_created_at": {"$last": "$created_at"},
+            "count": {"$sum": 1}
+        }},
+        {"$match": {"count": {"$gt": 1}}}
+    ]
+    removed = 0
+    async for group in db.rsvps.aggregate(pipeline, allowDiskUse=True):
+        await db.rsvps.update_one(
+            {"_id": group['ids'][0]},
+            {"$set": {"created_at": group['first_created_at']}}
+        )
+        result = await db.rsvps.delete_many({"_id": {"$in": group['ids'][1:]}})
+        removed += result.deleted_count
+    return removed
+
+
+@app.on_event("startup")
+async def create_rsvp_indexes():
+    """
+    Build the unique (profile_id, guest_phone) index submit_rsvp's upsert
+    depends on. Without it a resubmission after the edit window inserts a
+    second RSVP, so startup fails if it can't be built.
+    """
+    try:
+        try:
+            await create_rsvp_phone_index()
+        except (DuplicateKeyError, OperationFailure) as e:
+            # Older find-then-insert writes could race into duplicates
+            logger.warning(f"Merging duplicate RSVPs before indexing: {e}")
+            removed = await merge_duplicate_rsvps()
+            logger.info(f"Merged {removed} duplicate RSVPs")
+            await create_rsvp_phone_index()
+    except Exception as e:
+        logger.critical(f"Failed to create unique RSVP index: {e}")
+        raise RuntimeError("Unique (profile_id, guest_phone) RSVP index could not be created") from e
+
+
+@app.on_event("startup")
+async def start_audit_log_pipeline():
+    """Start the background audit log writer"""
+    audit_log_pipeline.start()
+
+
+@app.on_event("startup")
+async def start_credit_transaction_log():
+    """Start the background credit transaction writer"""
+    credit_wallet_service.start()
+
+
+@app.on_event("startup")
+async def start_rsvp_stats_reconciliation():
+    """Reconcile RSVP counters now and periodically"""
+    rsvp_stats_service.start()
+
+
+@app.on_event("startup")
+async def rebuild_reaction_counts():
+    """Rebuild per-event reaction counters from stored reactions"""
+    try:
+        count = await reaction_service.rebuild()
+        logger.info(f"Rebuilt reaction counts for {count} events")
+    except Exception as e:
+        logger.error(f"Failed to rebuild reaction counts: {e}")
+
+
+@app.on_event("startup")
+async def start_suggestion_pools():
+    """Load RSVP suggestion pools and start the background refresher"""
+    try:
+        await suggestion_pool_service.start()
+    except Exception as e:
+        logger.error(f"Failed to start suggestion pools: {e}")
+
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    suggestion_pool_service.stop()
+    rsvp_stats_service.stop()
+    # Drain queued audit logs before the client closes
+    await audit_log_pipeline.stop()
+    await credit_wallet_service.stop()
+    shutdown_pdf_executor()
     client.close()
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+PHASE 26: RSVP Suggestion Pools
+Precomputed pools of RSVP message suggestions per event type and language
+
+The suggestion prompt only depends on event type and language, so a pool
+is generated in the background, persisted in MongoDB and served to guests
+as random samples from memory. Guest requests never wait on the LLM, and
+LLM cost depends on the refresh interval rather than traffic.
+"""
+
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from ai_service import SUPPORTED_LANGUAGES
+
+
+SUGGESTION_EVENT_TYPES = ['engagement', 'haldi', 'mehendi', 'marriage', 'reception']
+DEFAULT_SUGGESTION_EVENT_TYPE = 'marriage'
+
+# Suggestions kept per pool, and added per refresh (older ones rotate out)
+SUGGESTION_POOL_SIZE = 40
+SUGGESTION_POOL_BATCH = 20
+SUGGESTION_POOL_REFRESH_INTERVAL = timedelta(hours=24)
+# Refresher wakes up this often to look for stale or missing pools
+SUGGESTION_POOL_CHECK_SECONDS = 600
+
+FALLBACK_SUGGESTIONS = [
+    "Can't wait to celebrate with you! 🎉",
+    "Blessings to the beautiful couple ❤️",
+    "Excited for your special day! 💐"
+]
+
+
+class SuggestionPoolService:
+    """In-memory suggestion pools backed by MongoDB and refreshed in the background"""
+
+    def __init__(self, db, ai_service):
+        self.collection = db['rsvp_suggestion_pools']
+        self.ai_service = ai_service
+        # (event_type, language) -> (suggestions, refreshed_at)
+        self._pools: Dict[Tuple[str, str], Tuple[List[str], datetime]] = {}
+        self._refreshing: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._refresher: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def pool_key(event_type: Optional[str], language: Optional[str]) -> Tuple[str, str]:
+        """Normalize request parameters to a pool key"""
+        if event_type not in SUGGESTION_EVENT_TYPES:
+            event_type = DEFAULT_SUGGESTION_EVENT_TYPE
+        if language not in SUPPORTED_LANGUAGES:
+            language = 'en'
+        return event_type, language
+
+    def sample(self, event_type: Optional[str], language: Optional[str], count: int = 3) -> List[str]:
+        """
+        Random suggestions from the in-memory pool
+
+        An empty pool returns the fallback messages and schedules a refresh
+        for that pool; the request itself never calls the LLM.
+        """
+        key = self.pool_key(event_type, language)
+        pool = self._pools.get(key)
+
+        if not pool or not pool[0]:
+            self._schedule_refresh(key)
+            return list(FALLBACK_SUGGESTIONS[:count])
+
+        suggestions = pool[0]
+        if len(suggestions) <= count:
+            return list(suggestions)
+        return random.sample(suggestions, count)
+
+    async def load(self):
+        """Load persisted pools into memory"""
+        async for doc in self.collection.find({}, {"_id": 0}):
+            refreshed_at = doc['refreshed_at']
+            if refreshed_at.tzinfo is None:
+                refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+            self._pools[(doc['event_type'], doc['language'])] = (doc['suggestions'], refreshed_at)
+
+    async def refresh_pool(self, key: Tuple[str, str]):
+        """Generate a new batch for one pool and rotate out the oldest suggestions"""
+        event_type, language = key
+        new_suggestions = await self.ai_service.generate_rsvp_suggestion_pool(
+            event_type,
+            language,
+            SUGGESTION_POOL_BATCH
+        )
+        if not new_suggestions:
+            return
+
+        existing = self._pools.get(key, ([], None))[0]
+        merged = new_suggestions + [s for s in existing if s not in new_suggestions]
+        suggestions = merged[:SUGGESTION_POOL_SIZE]
+        refreshed_at = datetime.now(timezone.utc)
+
+        self._pools[key] = (suggestions, refreshed_at)
+        await self.collection.update_one(
+            {"event_type": event_type, "language": language},
+            {"$set": {"suggestions": suggestions, "refreshed_at": refreshed_at}},
+            upsert=True
+        )
+
+    def _schedule_refresh(self, key: Tuple[str, str]):
+        """Refresh one pool in the background, at most once at a time"""
+        task = self._refreshing.get(key)
+        if task is not None and not task.done():
+            return
+
+        async def run():
+            try:
+                await self.refresh_pool(key)
+            except Exception as e:
+                logging.error(f"Suggestion pool refresh failed for {key}: {e}")
+
+        self._refreshing[key] = asyncio.ensure_future(run())
+
+    async def refresh_stale_pools(self):
+        """Refresh every pool that is missing or older than the refresh interval"""
+        now = datetime.now(timezone.utc)
+        for event_type in SUGGESTION_EVENT_TYPES:
+            for language in SUPPORTED_LANGUAGES:
+                key = (event_type, language)
+                pool = self._pools.get(key)
+                if pool and now - pool[1] < SUGGESTION_POOL_REFRESH_INTERVAL:
+                    continue
+                try:
+                    await self.refresh_pool(key)
+                except Exception as e:
+                    logging.error(f"Suggestion pool refresh failed for {key}: {e}")
+
+    async def _refresh_loop(self):
+        while True:
+            await self.refresh_stale_pools()
+            await asyncio.sleep(SUGGESTION_POOL_CHECK_SECONDS)
+
+    async def start(self):
+        """Load pools and start the background refresher"""
+        await self.collection.create_index(
+            [("event_type", 1), ("language", 1)],
+            unique=True,
+            name="event_type_language_unique"
+        )
+        await self.load()
+        if self._refresher is None:
+            self._refresher = asyncio.ensure_future(self._refresh_loop())
+
+    def stop(self):
+        """Cancel background refresh tasks"""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            self._refresher = None
+        for task in self._refreshing.values():
+            task.cancel()
+        self._refreshing.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            f"{event_type}:{language}": len(suggestions)
+            for (event_type, language), (suggestions, _) in self._pools.items()
+        }
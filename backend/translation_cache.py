@@ -0,0 +1,202 @@
+"""
+PHASE 26: Two-Tier Translation Cache
+In-process LRU in front of the MongoDB translation_cache collection
+
+Guests toggling languages on the same invitation hit memory; other workers
+and restarts fall back to MongoDB; only true misses reach the LLM.
+MongoDB entries expire through a TTL index on a native datetime.
+"""
+
+import hashlib
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+
+TRANSLATION_CACHE_TTL = timedelta(days=7)
+TRANSLATION_MEMORY_CACHE_SIZE = 4096
+
+
+class TranslationCacheService:
+    """LRU + MongoDB cache for AI translations with hit/miss metrics"""
+
+    def __init__(self, db, max_memory_entries: int = TRANSLATION_MEMORY_CACHE_SIZE):
+        self.collection = db['translation_cache']
+        self.max_memory_entries = max_memory_entries
+        # (content_hash, target_language) -> (translated_content, expires_at)
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[str, datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {
+            'memory_hits': 0,
+            'db_hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+    @staticmethod
+    def content_hash(content: str, target_language: str) -> str:
+        """Hash used as the cache key (compatible with existing cache documents)"""
+        return hashlib.md5(f"{content}_{target_language}".encode()).hexdigest()
+
+    async def ensure_indexes(self):
+        """
+        Create lookup and TTL indexes
+
+        Legacy entries stored expires_at as an ISO string, which a TTL index
+        ignores, so they are dropped once; they are only cache entries.
+        The lookup index is unique, so concurrent misses for the same text
+        upsert a single document.
+        """
+        await self.collection.delete_many({"expires_at": {"$type": "string"}})
+        try:
+            # Replaced by the unique index (same keys, so it must go first)
+            await self.collection.drop_index("content_hash_target_language")
+        except OperationFailure:
+            pass
+        try:
+            await self._create_lookup_index()
+        except (DuplicateKeyError, OperationFailure) as e:
+            # Older find-then-insert writes could race into duplicates
+            logging.warning(f"Removing duplicate translation cache entries before indexing: {e}")
+            await self._remove_duplicate_entries()
+            await self._create_lookup_index()
+        await self.collection.create_index(
+            "expires_at",
+            expireAfterSeconds=0,
+            name="expires_at_ttl"
+        )
+
+    async def _create_lookup_index(self):
+        await self.collection.create_index(
+            [("content_hash", 1), ("target_language", 1)],
+            unique=True,
+            name="content_hash_target_language_unique"
+        )
+
+    async def _remove_duplicate_entries(self):
+        """Keep only the longest-lived entry per (content_hash, target_language)"""
+        pipeline = [
+            {"$sort": {"expires_at": -1}},
+            {"$group": {
+                "_id": {"content_hash": "$content_hash", "target_language": "$target_language"},
+                "ids": {"$push": "$_id"},
+                "count": {"$sum": 1}
+            }},
+            {"$match": {"count": {"$gt": 1}}}
+        ]
+        async for group in self.collection.aggregate(pipeline, allowDiskUse=True):
+            await self.collection.delete_many({"_id": {"$in": group['ids'][1:]}})
+
+    def _memory_get(self, key: Tuple[str, str], now: datetime) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            translated_content, expires_at = entry
+            if expires_at <= now:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            self._metrics['memory_hits'] += 1
+            return translated_content
+
+    def _memory_put(self, key: Tuple[str, str], translated_content: str, expires_at: datetime):
+        with self._lock:
+            self._memory[key] = (translated_content, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+                self._metrics['evictions'] += 1
+
+    async def get(self, content: str, target_language: str) -> Optional[str]:
+        """Look up a translation in memory, then MongoDB"""
+        now = datetime.now(timezone.utc)
+        content_hash = self.content_hash(content, target_language)
+        key = (content_hash, target_language)
+
+        translated_content = self._memory_get(key, now)
+        if translated_content is not None:
+            return translated_content
+
+        # The TTL monitor runs about once a minute, so filter on expiry as well
+        cached = await self.collection.find_one(
+            {
+                "content_hash": content_hash,
+                "target_language": target_language,
+                "expires_at": {"$gt": now}
+            },
+            {"_id": 0, "translated_content": 1, "expires_at": 1}
+        )
+
+        if cached:
+            expires_at = cached['expires_at']
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            self._memory_put(key, cached['translated_content'], expires_at)
+            with self._lock:
+                self._metrics['db_hits'] += 1
+            return cached['translated_content']
+
+        with self._lock:
+            self._metrics['misses'] += 1
+        return None
+
+    async def set(self, content: str, target_language: str, translated_content: str):
+        """
+        Store a translation in memory and MongoDB (one document per key)
+
+        A result equal to its source is an AI fallback, not a translation;
+        it is refused so the text is translated again next time.
+        """
+        if not translated_content or translated_content.strip() == content.strip():
+            logging.warning(f"Refusing to cache untranslated text for {target_language}")
+            return
+
+        now = datetime.now(timezone.utc)
+        expires_at = now + TRANSLATION_CACHE_TTL
+        content_hash = self.content_hash(content, target_language)
+
+        self._memory_put((content_hash, target_language), translated_content, expires_at)
+
+        entry_filter = {"content_hash": content_hash, "target_language": target_language}
+        changes = {
+            "original_content": content,
+            "translated_content": translated_content,
+            "expires_at": expires_at
+        }
+        try:
+            try:
+                await self.collection.update_one(
+                    entry_filter,
+                    {
+                        "$set": changes,
+                        "$setOnInsert": {
+                            "id": str(uuid.uuid4()),
+                            "original_language": "en",
+                            "created_at": now
+                        }
+                    },
+                    upsert=True
+                )
+            except DuplicateKeyError:
+                # A concurrent miss for the same text inserted first
+                await self.collection.update_one(entry_filter, {"$set": changes})
+        except Exception as e:
+            # Memory tier still serves this process
+            logging.error(f"Failed to persist translation cache entry: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        """Cache metrics for monitoring"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['memory_size'] = len(self._memory)
+            metrics['memory_capacity'] = self.max_memory_entries
+
+        lookups = metrics['memory_hits'] + metrics['db_hits'] + metrics['misses']
+        metrics['hit_rate'] = round((metrics['memory_hits'] + metrics['db_hits']) / lookups, 4) if lookups else 0.0
+        return metrics
@@ -0,0 +1,277 @@
+"""
+Wish Wall Broadcast Hub
+Event-day "wish wall" for projectors and phones over WebSockets
+
+Each event's wall keeps a bounded ring buffer of the latest approved
+greetings of its profile and approved guest wishes of that event in
+memory. The buffer is loaded with one query per collection when the first
+viewer connects, every viewer gets it as a snapshot on connect, and each
+newly approved greeting is serialized once and pushed to all viewers. The
+write path already holds the greeting, so fan-out costs no extra database
+reads no matter how many viewers are watching. Greetings belong to the
+profile, so they go to every open wall of its events; wishes are approved
+in bulk and reload only their own events' walls. A wall is dropped with
+its last viewer.
+
+Changes published while a wall is still loading are queued on it and
+replayed once the query returns (a bulk reload queries again), so nothing
+approved or removed during the load is lost.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import WebSocket
+
+
+WISH_WALL_BUFFER_SIZE = 50
+# A viewer that cannot take a message within this time is disconnected
+WISH_WALL_SEND_TIMEOUT_SECONDS = 5
+
+WISH_WALL_PROJECTION = {"_id": 0, "id": 1, "guest_name": 1, "message": 1, "created_at": 1}
+WISH_WALL_WISH_PROJECTION = {**WISH_WALL_PROJECTION, "emoji": 1}
+
+
+def _wall_entry(item: dict, kind: str = "greeting") -> dict:
+    created_at = item.get('created_at')
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    entry = {
+        "id": item['id'],
+        "kind": kind,
+        "guest_name": item.get('guest_name', ''),
+        "message": item.get('message', ''),
+        "created_at": created_at
+    }
+    if kind == "wish":
+        entry["emoji"] = item.get('emoji')
+    return entry
+
+
+class WishWall:
+    """Ring buffer and viewers of one event's wall"""
+
+    def __init__(self, profile_id: str, event_id: str, buffer_size: int):
+        self.profile_id = profile_id
+        self.event_id = event_id
+        self.entries: Deque[dict] = deque(maxlen=buffer_size)
+        self.viewers: Set[WebSocket] = set()
+        self.loaded = asyncio.Event()
+        # ("add", entry), ("remove", item_id) or ("reload", None) published before loaded
+        self.pending: List[Tuple[str, object]] = []
+
+
+class WishWallHub:
+    """Per-event wish walls; greetings are shared by every event of a profile"""
+
+    def __init__(self, db, buffer_size: int = WISH_WALL_BUFFER_SIZE):
+        self.db = db
+        self.buffer_size = buffer_size
+        self._walls: Dict[str, WishWall] = {}
+        # profile_id -> event_ids with an open wall
+        self._profile_walls: Dict[str, Set[str]] = {}
+        # event_id -> profile_id (events never move between profiles)
+        self._event_profiles: Dict[str, Optional[str]] = {}
+
+    async def resolve_profile(self, event_id: str) -> Optional[str]:
+        """Profile owning an event, cached after the first lookup"""
+        if event_id not in self._event_profiles:
+            profile = await self.db.profiles.find_one(
+                {"events.event_id": event_id},
+                {"_id": 0, "id": 1}
+            )
+            if not profile:
+                return None
+            self._event_profiles[event_id] = profile['id']
+        return self._event_profiles[event_id]
+
+    def _register(self, wall: WishWall):
+        self._walls[wall.event_id] = wall
+        self._profile_walls.setdefault(wall.profile_id, set()).add(wall.event_id)
+
+    def _unregister(self, wall: WishWall):
+        del self._walls[wall.event_id]
+        events = self._profile_walls.get(wall.profile_id)
+        if events is not None:
+            events.discard(wall.event_id)
+            if not events:
+                del self._profile_walls[wall.profile_id]
+
+    def _walls_of(self, profile_id: str, event_ids: Optional[Iterable[str]] = None) -> List[WishWall]:
+        """Open walls of a profile, optionally only those of some events"""
+        open_events = self._profile_walls.get(profile_id, set())
+        if event_ids is not None:
+            open_events = open_events.intersection(event_ids)
+        return [self._walls[event_id] for event_id in open_events if event_id in self._walls]
+
+    async def _fetch(self, wall: WishWall) -> List[dict]:
+        """Latest approved greetings and wishes as wall entries, oldest first"""
+        greetings = await self.db.greetings.find(
+            {"profile_id": wall.profile_id, "approval_status": "approved"},
+            WISH_WALL_PROJECTION
+        ).sort("created_at", -1).limit(self.buffer_size).to_list(self.buffer_size)
+        # Wishes stored before moderation existed count as approved
+        wishes = await self.db.guest_wishes.find(
+            {
+                "profile_id": wall.profile_id,
+                "event_id": wall.event_id,
+                "approval_status": {"$in": ["approved", None]}
+            },
+            WISH_WALL_WISH_PROJECTION
+        ).sort("created_at", -1).limit(self.buffer_size).to_list(self.buffer_size)
+
+        entries = [_wall_entry(g) for g in greetings] + [_wall_entry(w, "wish") for w in wishes]
+        entries.sort(key=lambda entry: str(entry['created_at'] or ''))
+        return entries[-self.buffer_size:]
+
+    async def _load(self, wall: WishWall):
+        try:
+            while True:
+                entries = await self._fetch(wall)
+                reloads = [i for i, (kind, _) in enumerate(wall.pending) if kind == "reload"]
+                if not reloads:
+                    break
+                # A bulk change landed during the query, which may predate it
+                del wall.pending[:reloads[-1] + 1]
+
+            wall.entries.extend(entries)
+            for kind, value in wall.pending:
+                if kind == "add":
+                    self._apply_add(wall, value)
+                else:
+                    self._apply_remove(wall, value)
+        finally:
+            wall.pending.clear()
+            wall.loaded.set()
+
+    async def connect(self, profile_id: str, event_id: str, websocket: WebSocket) -> WishWall:
+        """Register a viewer of an event's wall and send the current snapshot"""
+        while True:
+            wall = self._walls.get(event_id)
+            if wall is None:
+                wall = WishWall(profile_id, event_id, self.buffer_size)
+                self._register(wall)
+                asyncio.ensure_future(self._load(wall))
+
+            await wall.loaded.wait()
+            # If the wall was dropped during the load (its other viewers
+            # left), it no longer receives updates: use the current one
+            if self._walls.get(event_id) is wall:
+                break
+
+        # Snapshot and registration happen without yielding, so the viewer
+        # gets every later entry exactly once and never before its snapshot
+        snapshot = json.dumps({"type": "snapshot", "entries": list(wall.entries)}, ensure_ascii=False)
+        wall.viewers.add(websocket)
+        try:
+            await websocket.send_text(snapshot)
+        except Exception:
+            self.disconnect(wall, websocket)
+            raise
+        return wall
+
+    def disconnect(self, wall: WishWall, websocket: WebSocket):
+        wall.viewers.discard(websocket)
+        if not wall.viewers and self._walls.get(wall.event_id) is wall:
+            self._unregister(wall)
+
+    async def _broadcast(self, wall: WishWall, message: dict):
+        text = json.dumps(message, ensure_ascii=False)
+
+        async def send(websocket: WebSocket):
+            try:
+                await asyncio.wait_for(websocket.send_text(text), timeout=WISH_WALL_SEND_TIMEOUT_SECONDS)
+            except Exception:
+                # Slow or gone; its receive loop cleans up after the close
+                self.disconnect(wall, websocket)
+                try:
+                    await websocket.close()
+                except Exception:
+                    pass
+
+        await asyncio.gather(*[send(websocket) for websocket in list(wall.viewers)])
+
+    @staticmethod
+    def _apply_add(wall: WishWall, entry: dict) -> bool:
+        if any(existing['id'] == entry['id'] for existing in wall.entries):
+            return False
+        wall.entries.append(entry)
+        return True
+
+    @staticmethod
+    def _apply_remove(wall: WishWall, item_id: str) -> bool:
+        remaining = [entry for entry in wall.entries if entry['id'] != item_id]
+        if len(remaining) == len(wall.entries):
+            return False
+        wall.entries.clear()
+        wall.entries.extend(remaining)
+        return True
+
+    async def _add_to(self, wall: WishWall, entry: dict):
+        if not wall.loaded.is_set():
+            wall.pending.append(("add", entry))
+            return
+        if self._apply_add(wall, entry):
+            await self._broadcast(wall, {"type": "entry", "entry": entry})
+
+    async def add(self, profile_id: str, greeting: dict):
+        """Push a newly approved greeting to every open wall of the profile"""
+        entry = _wall_entry(greeting)
+        await asyncio.gather(*[self._add_to(wall, entry) for wall in self._walls_of(profile_id)])
+
+    async def _remove_from(self, wall: WishWall, item_id: str):
+        if not wall.loaded.is_set():
+            wall.pending.append(("remove", item_id))
+            return
+        if self._apply_remove(wall, item_id):
+            await self._broadcast(wall, {"type": "remove", "id": item_id})
+
+    async def remove(self, profile_id: str, item_id: str):
+        """Take a greeting or wish off the profile's walls (rejected or deleted)"""
+        await asyncio.gather(*[self._remove_from(wall, item_id) for wall in self._walls_of(profile_id)])
+
+    async def _reload_wall(self, wall: WishWall):
+        if not wall.loaded.is_set():
+            wall.pending.append(("reload", None))
+            return
+        entries = await self._fetch(wall)
+        wall.entries.clear()
+        wall.entries.extend(entries)
+        await self._broadcast(wall, {"type": "snapshot", "entries": list(wall.entries)})
+
+    async def reload(self, profile_id: str, event_ids: Optional[Iterable[str]] = None):
+        """Reload open walls with fresh queries and resend them as snapshots (after bulk moderation)"""
+        await asyncio.gather(*[self._reload_wall(wall) for wall in self._walls_of(profile_id, event_ids)])
+
+    def publish_added(self, profile_id: str, greeting: dict):
+        """Fire-and-forget add() for request handlers"""
+        if profile_id in self._profile_walls:
+            asyncio.ensure_future(self._safely(self.add(profile_id, greeting)))
+
+    def publish_removed(self, profile_id: str, item_id: str):
+        """Fire-and-forget remove() for request handlers"""
+        if profile_id in self._profile_walls:
+            asyncio.ensure_future(self._safely(self.remove(profile_id, item_id)))
+
+    def publish_reload(self, profile_id: str, event_ids: Optional[Iterable[str]] = None):
+        """Fire-and-forget reload() for request handlers"""
+        if profile_id in self._profile_walls:
+            event_ids = list(event_ids) if event_ids is not None else None
+            asyncio.ensure_future(self._safely(self.reload(profile_id, event_ids)))
+
+    @staticmethod
+    async def _safely(coroutine):
+        try:
+            await coroutine
+        except Exception as e:
+            logging.error(f"Wish wall broadcast failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "walls": len(self._walls),
+            "viewers": sum(len(wall.viewers) for wall in self._walls.values())
+        }